@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime, UTC
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from neo4j import GraphDatabase
 
@@ -107,6 +108,11 @@ config = {
             "username": os.getenv("NEO4J_USERNAME"),
             "password": os.getenv("NEO4J_PASSWORD"),
         },
+        # Samples graph size every 5 minutes; relations also expire once GRAPH_RELATION_TTL_DAYS is set.
+        "prune": {
+            "interval": 300,
+            "ttl_days": float(os.getenv("GRAPH_RELATION_TTL_DAYS")) if os.getenv("GRAPH_RELATION_TTL_DAYS") else None,
+        },
     },
     "vector_store": {
         "provider": "qdrant",
@@ -116,6 +122,15 @@ config = {
             "api_key": os.getenv("QDRANT_API_KEY"),
         },
     },
+    "lock": {
+        "provider": "local",
+    },
+    # BM25 + vector retrieval; run memory_tools/rebuildLexicalIndex.py once after enabling on existing memories.
+    "search": {
+        "hybrid": {"enabled": os.getenv("HYBRID_SEARCH", "false").lower() == "true"},
+        # Cross-encoder rescoring of the top 30 memories; the model loads and warms up at startup.
+        "rerank": {"enabled": os.getenv("SEARCH_RERANK", "false").lower() == "true"},
+    },
     "custom_prompt": custom_prompt,
     "version": "v1.1"
 }
@@ -136,12 +151,32 @@ class QueryRequest(BaseModel):
     run_id: Optional[str] = None
     user_id: Optional[str] = None
     limit: Optional[int] = 10
+    graph_search_mode: Optional[str] = None
+    graph_max_hops: Optional[int] = None
+    rerank: Optional[bool] = None
 
 class GetAllRequest(BaseModel):
     agent_id: Optional[str] = None
     run_id: Optional[str] = None
     user_id: Optional[str] = None
 
+class ExportRelationsRequest(BaseModel):
+    agent_id: Optional[str] = None
+    run_id: Optional[str] = None
+    user_id: Optional[str] = None
+    cursor: Optional[str] = None
+    batch_size: Optional[int] = 1000
+
+class HistoryQueryRequest(BaseModel):
+    agent_id: Optional[str] = None
+    run_id: Optional[str] = None
+    user_id: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    events: Optional[List[str]] = None
+    cursor: Optional[str] = None
+    limit: Optional[int] = 100
+
 @app.get("/ping")
 def ping():
     """A simple ping endpoint to verify that the server is running."""
@@ -202,7 +237,10 @@ def query_memory(req: QueryRequest, x_password: str = Depends(verify_password)):
       "agent_id": "quest_boo" (optional),
       "run_id": "general_knowledge" (optional),
       "user_id": "123" (optional),
-      "limit": 5 (optional)
+      "limit": 5 (optional),
+      "graph_search_mode": "llm" | "fast" (optional),
+      "graph_max_hops": 2 (optional),
+      "rerank": false (optional, skips cross-encoder reranking)
     }
     """
     try:
@@ -212,7 +250,10 @@ def query_memory(req: QueryRequest, x_password: str = Depends(verify_password)):
             "agent_id": req.agent_id,
             "run_id": req.run_id,
             "user_id": req.user_id,
-            "limit": req.limit
+            "limit": req.limit,
+            "graph_search_mode": req.graph_search_mode,
+            "graph_max_hops": req.graph_max_hops,
+            "rerank": req.rerank
         }
         logger.info(f"Incoming POST request to /query: {json.dumps(request_details, indent=2)}")
 
@@ -225,6 +266,12 @@ def query_memory(req: QueryRequest, x_password: str = Depends(verify_password)):
             kwargs["user_id"] = req.user_id
         if req.limit is not None:
             kwargs["limit"] = req.limit
+        if req.graph_search_mode is not None:
+            kwargs["graph_search_mode"] = req.graph_search_mode
+        if req.graph_max_hops is not None:
+            kwargs["graph_max_hops"] = req.graph_max_hops
+        if req.rerank is not None:
+            kwargs["rerank"] = req.rerank
 
         start_time = datetime.now()
         result = memory_instance.search(req.query, **kwargs)
@@ -285,6 +332,138 @@ def get_all_memories(req: GetAllRequest, x_password: str = Depends(verify_passwo
         logger.error(f"Error getting all memories: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/export_relations")
+def export_relations(req: ExportRelationsRequest, x_password: str = Depends(verify_password)):
+    """
+    Streams every graph relation of the scope as NDJSON, one {"id", "source", "relationship", "target",
+    "created", "last_seen", "mentions"} object per line, in id order. The scope is read by one streamed query and the
+    server holds one batch at a time, so large graphs can be exported without being materialised.
+
+    Expects:
+    {
+      "agent_id": "quest_boo" (optional),
+      "run_id": "self_knowledge" (optional),
+      "user_id": "123" (optional),
+      "cursor": "<id of the last relation received>" (optional, resumes an interrupted export),
+      "batch_size": 1000 (optional)
+    }
+    """
+    try:
+        request_details = {
+            "endpoint": "/export_relations",
+            "agent_id": req.agent_id,
+            "run_id": req.run_id,
+            "user_id": req.user_id,
+            "cursor": req.cursor,
+            "batch_size": req.batch_size
+        }
+        logger.info(f"Incoming POST request to /export_relations: {json.dumps(request_details, indent=2)}")
+
+        batches = memory_instance.export_relations(
+            user_id=req.user_id,
+            agent_id=req.agent_id,
+            run_id=req.run_id,
+            batch_size=req.batch_size or 1000,
+            cursor=req.cursor,
+        )
+    except ValueError as e:
+        logger.error(f"Invalid export request: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson():
+        start_time = datetime.now()
+        exported = 0
+        try:
+            for batch in batches:
+                exported += len(batch)
+                yield "".join(json.dumps(relation) + "\n" for relation in batch)
+        except Exception as e:
+            # Headers are already sent; a truncated stream is detectable by resuming from the last id.
+            logger.error(f"Error exporting relations after {exported}: {str(e)}", exc_info=True)
+            raise
+        execution_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Response from /export_relations: {exported} relations in {execution_time:.3f}s")
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@app.post("/history_query")
+def history_query(req: HistoryQueryRequest, x_password: str = Depends(verify_password)):
+    """
+    Expects:
+    {
+      "agent_id": "quest_boo" (optional),
+      "run_id": "self_knowledge" (optional),
+      "user_id": "123" (optional),
+      "since": "2024-11-01T00:00:00Z" (optional),
+      "until": "2024-12-01T00:00:00Z" (optional),
+      "events": ["ADD", "UPDATE", "DELETE"] (optional),
+      "cursor": "<next_cursor from the previous page>" (optional),
+      "limit": 100 (optional)
+    }
+    """
+    try:
+        request_details = {
+            "endpoint": "/history_query",
+            "agent_id": req.agent_id,
+            "run_id": req.run_id,
+            "user_id": req.user_id,
+            "since": req.since.isoformat() if req.since else None,
+            "until": req.until.isoformat() if req.until else None,
+            "events": req.events,
+            "cursor": req.cursor,
+            "limit": req.limit
+        }
+        logger.info(f"Incoming POST request to /history_query: {json.dumps(request_details, indent=2)}")
+
+        filters = {}
+        if req.agent_id:
+            filters["agent_id"] = req.agent_id
+        if req.run_id:
+            filters["run_id"] = req.run_id
+        if req.user_id:
+            filters["user_id"] = req.user_id
+
+        start_time = datetime.now()
+        result = memory_instance.history_query(
+            filters=filters,
+            since=req.since,
+            until=req.until,
+            events=req.events,
+            cursor=req.cursor,
+            limit=req.limit or 100,
+        )
+        execution_time = (datetime.now() - start_time).total_seconds()
+
+        response_details = {
+            "execution_time_seconds": execution_time,
+            "results_count": len(result["results"]),
+            "next_cursor": result["next_cursor"]
+        }
+        logger.info(f"Response from /history_query: {json.dumps(response_details, indent=2)}")
+
+        return {"status": "success", "results": result["results"], "next_cursor": result["next_cursor"]}
+    except ValueError as e:
+        logger.error(f"Invalid history query: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error querying history: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/lock_metrics")
+def lock_metrics(x_password: str = Depends(verify_password)):
+    """Contention and wait-time counters of the per-scope add locks (empty when no lock provider is configured)."""
+    return {"status": "success", "metrics": memory_instance.lock_metrics()}
+
+@app.get("/history_metrics")
+def history_metrics(x_password: str = Depends(verify_password)):
+    """Counters of the background history writer, including failed and pending writes."""
+    return {"status": "success", "metrics": memory_instance.history_metrics()}
+
+@app.get("/graph_metrics")
+def graph_metrics(x_password: str = Depends(verify_password)):
+    """Graph size samples recorded by the relation pruner, pruning totals and the current size."""
+    return {"status": "success", "metrics": memory_instance.graph_metrics()}
+
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Starting Memory API service - Process ID: {os.getpid()}")
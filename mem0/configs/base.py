@@ -5,8 +5,11 @@ from pydantic import BaseModel, Field
 
 from mem0.embeddings.configs import EmbedderConfig
 from mem0.graphs.configs import GraphStoreConfig
+from mem0.history_stores.configs import HistoryStoreConfig
 from mem0.llms.configs import LlmConfig
+from mem0.locks.configs import LockConfig
 from mem0.memory.setup import mem0_dir
+from mem0.search.configs import SearchConfig
 from mem0.vector_stores.configs import VectorStoreConfig
 
 
@@ -40,10 +43,22 @@ class MemoryConfig(BaseModel):
         description="Path to the history database",
         default=os.path.join(mem0_dir, "history.db"),
     )
+    history_store: HistoryStoreConfig = Field(
+        description="Configuration for the history store",
+        default_factory=HistoryStoreConfig,
+    )
     graph_store: GraphStoreConfig = Field(
         description="Configuration for the graph",
         default_factory=GraphStoreConfig,
     )
+    lock: LockConfig = Field(
+        description="Configuration for the per-scope write locks taken by add",
+        default_factory=LockConfig,
+    )
+    search: SearchConfig = Field(
+        description="Configuration for memory retrieval",
+        default_factory=SearchConfig,
+    )
     version: str = Field(
         description="The version of the API",
         default="v1.0",
@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class PostgresHistoryConfig(BaseModel):
+    dsn: Optional[str] = Field(None, description="libpq connection string; overrides the individual fields")
+    dbname: Optional[str] = Field("postgres", description="Database name")
+    user: Optional[str] = Field(None, description="Database user")
+    password: Optional[str] = Field(None, description="Database password")
+    host: Optional[str] = Field(None, description="Database host")
+    port: Optional[int] = Field(None, description="Database port")
+    table_name: str = Field("mem0_history", description="History table name")
+    min_connections: int = Field(1, description="Minimum pooled connections")
+    max_connections: int = Field(10, description="Maximum pooled connections")
+    pool_timeout: Optional[float] = Field(
+        30.0, description="Seconds to wait for a free pooled connection; waits forever if None"
+    )
+    batch_writes: bool = Field(False, description="Commit history rows in groups from a background thread")
+    batch_size: int = Field(500, description="Maximum rows per group commit")
+    flush_interval: float = Field(0.05, description="Seconds the writer waits to fill a group")
+    retention_days: Optional[int] = Field(None, description="Prune history rows older than this many days")
+
+    @model_validator(mode="before")
+    @classmethod
+    def check_connection(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        if not values.get("dsn") and not (values.get("user") and values.get("host")):
+            raise ValueError("Either 'dsn' or 'user' and 'host' must be provided.")
+        return values
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
@@ -0,0 +1,29 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class SQLiteHistoryConfig(BaseModel):
+    db_path: Optional[str] = Field(
+        None, description="Path to the SQLite history database. Defaults to MemoryConfig.history_db_path"
+    )
+    journal_mode: str = Field("WAL", description="SQLite journal mode")
+    synchronous: str = Field("NORMAL", description="SQLite synchronous level")
+    busy_timeout: int = Field(30000, description="Milliseconds to wait on a locked database")
+    batch_writes: bool = Field(False, description="Commit history rows in groups from a background thread")
+    batch_size: int = Field(500, description="Maximum rows per group commit")
+    flush_interval: float = Field(0.05, description="Seconds the writer waits to fill a group")
+    retention_days: Optional[int] = Field(None, description="Prune history rows older than this many days")
+    vacuum_interval: Optional[int] = Field(None, description="Seconds between retention/VACUUM maintenance runs")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
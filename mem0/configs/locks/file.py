@@ -0,0 +1,24 @@
+import os
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from mem0.memory.setup import mem0_dir
+
+
+class FileLockConfig(BaseModel):
+    lock_dir: str = Field(os.path.join(mem0_dir, "locks"), description="Directory holding the lock files")
+    timeout: Optional[float] = Field(None, description="Seconds to wait for a lock; waits forever if None")
+    poll_interval: float = Field(0.01, description="Seconds between attempts while waiting with a timeout")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
@@ -1,4 +1,4 @@
-from typing import Any, ClassVar, Dict, Optional
+from typing import Any, ClassVar, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -17,6 +17,12 @@ class QdrantConfig(BaseModel):
     url: Optional[str] = Field(None, description="Full URL for Qdrant server")
     api_key: Optional[str] = Field(None, description="API key for Qdrant server")
     on_disk: Optional[bool] = Field(False, description="Enables persistent storage")
+    sparse: bool = Field(
+        False,
+        description="Store named dense and BM25 sparse vectors and search both in one fused query (new collections)",
+    )
+    fusion: Literal["rrf", "dbsf"] = Field("rrf", description="Fusion of the dense and sparse results")
+    prefetch_limit: int = Field(50, description="Candidates each vector contributes to the fusion")
 
     @model_validator(mode="before")
     @classmethod
@@ -29,3 +29,15 @@ class EmbeddingBase(ABC):
             list: The embedding vector.
         """
         pass
+
+    def embed_batch(self, texts):
+        """
+        Get the embeddings for several texts.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        return [self.embed(text) for text in texts]
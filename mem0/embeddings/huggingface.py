@@ -27,3 +27,17 @@ class HuggingFaceEmbedding(EmbeddingBase):
             list: The embedding vector.
         """
         return self.model.encode(text, convert_to_numpy=True).tolist()
+
+    def embed_batch(self, texts):
+        """
+        Get the embeddings for several texts in one encoder pass.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        if not texts:
+            return []
+        return self.model.encode(texts, convert_to_numpy=True).tolist()
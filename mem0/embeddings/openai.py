@@ -30,3 +30,19 @@ class OpenAIEmbedding(EmbeddingBase):
         """
         text = text.replace("\n", " ")
         return self.client.embeddings.create(input=[text], model=self.config.model).data[0].embedding
+
+    def embed_batch(self, texts):
+        """
+        Get the embeddings for several texts with a single OpenAI request.
+
+        Args:
+            texts (list): The texts to embed.
+
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        if not texts:
+            return []
+        texts = [text.replace("\n", " ") for text in texts]
+        data = self.client.embeddings.create(input=texts, model=self.config.model).data
+        return [item.embedding for item in sorted(data, key=lambda item: item.index)]
@@ -1,14 +1,30 @@
-from typing import Optional
+import os
+from typing import Dict, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from mem0.llms.configs import LlmConfig
+from mem0.memory.setup import mem0_dir
 
 
 class Neo4jConfig(BaseModel):
     url: Optional[str] = Field(None, description="Host address for the graph database")
     username: Optional[str] = Field(None, description="Username for the graph database")
     password: Optional[str] = Field(None, description="Password for the graph database")
+    database: Optional[str] = Field(None, description="Database name, defaults to the server's default database")
+    max_connection_pool_size: int = Field(100, description="Maximum pooled connections per server")
+    connection_acquisition_timeout: float = Field(60.0, description="Seconds to wait for a free pooled connection")
+    max_connection_lifetime: int = Field(3600, description="Seconds before a pooled connection is recycled")
+    fetch_size: int = Field(1000, description="Records pulled per batch when streaming results")
+    vector_index: bool = Field(
+        True, description="Use a native vector index for entity similarity when the server supports it"
+    )
+    vector_index_name: str = Field("entity_embedding", description="Name of the entity embedding vector index")
+    vector_index_candidates: int = Field(
+        500,
+        description="Nearest neighbours fetched from the vector index before scope filtering; when all of them "
+        "clear the similarity threshold, the scope is scanned instead so other scopes cannot crowd it out",
+    )
 
     @model_validator(mode="before")
     def check_host_port_or_path(cls, values):
@@ -22,18 +38,142 @@ class Neo4jConfig(BaseModel):
         return values
 
 
+class EmbeddedGraphConfig(BaseModel):
+    path: str = Field(os.path.join(mem0_dir, "graph"), description="Directory holding the graph snapshot and log")
+    snapshot_every: int = Field(
+        10000, description="Log entries written before the log is folded into a new snapshot", ge=1
+    )
+    fsync: bool = Field(False, description="fsync the log after every write")
+
+
+class GraphRerankerConfig(BaseModel):
+    provider: Literal["fusion", "bm25"] = Field(
+        description="How graph search ranks candidate relations: 'fusion' combines similarity, lexical overlap "
+        "and recency, 'bm25' uses lexical overlap only",
+        default="fusion",
+    )
+    config: Optional[Dict] = Field(description="Arguments for the reranker (e.g. weights)", default=None)
+    candidates: int = Field(
+        description="Relations fetched from the graph for reranking, if more than the requested limit", default=100
+    )
+    min_score: Optional[float] = Field(description="Drop relations scored below this", default=None)
+
+
+class GraphEntityIndexConfig(BaseModel):
+    refresh_interval: float = Field(
+        description="Seconds between incremental refreshes of a scope, picking up entities other processes created",
+        default=30.0,
+        ge=0,
+    )
+    reload_interval: Optional[float] = Field(
+        description="Seconds between full reloads of a scope, dropping entities other processes deleted or merged; "
+        "None never reloads",
+        default=600.0,
+        gt=0,
+    )
+    max_scopes: Optional[int] = Field(
+        description="Scopes kept in memory, evicting the least recently used; None is unbounded", default=1000, ge=1
+    )
+    max_entities: Optional[int] = Field(
+        description="Most recently created entities kept per scope; None is unbounded", default=100000, ge=1
+    )
+
+
+class GraphPruneConfig(BaseModel):
+    ttl_days: Optional[float] = Field(
+        description="Delete relations not seen (created or re-extracted) for this many days", default=None, gt=0
+    )
+    min_score: Optional[float] = Field(
+        description="Delete relations whose decay score log2(1 + mentions) * 0.5 ^ (days since last seen / "
+        "half_life_days) falls below this",
+        default=None,
+        gt=0,
+    )
+    half_life_days: float = Field(
+        description="Days since last seen at which the decay score halves", default=30.0, gt=0
+    )
+    interval: Optional[int] = Field(
+        description="Seconds between background prune runs; None disables the background pruner", default=None, gt=0
+    )
+    batch_size: int = Field(description="Relations deleted per transaction", default=1000, ge=1)
+    max_batches: int = Field(
+        description="Most batches deleted per run, so one run never holds the graph long", default=100, ge=1
+    )
+    history: int = Field(description="Graph size samples kept for metrics", default=288, ge=1)
+
+
 class GraphStoreConfig(BaseModel):
-    provider: str = Field(description="Provider of the data store (e.g., 'neo4j')", default="neo4j")
-    config: Neo4jConfig = Field(description="Configuration for the specific data store", default=None)
+    provider: str = Field(
+        description="Provider of the data store: 'neo4j', or 'embedded' for an in-process graph", default="neo4j"
+    )
+    config: Union[EmbeddedGraphConfig, Neo4jConfig] = Field(
+        description="Configuration for the specific data store", default=None, union_mode="left_to_right"
+    )
     llm: Optional[LlmConfig] = Field(description="LLM configuration for querying the graph store", default=None)
     custom_prompt: Optional[str] = Field(
         description="Custom prompt to fetch entities from the given text", default=None
     )
+    search_mode: Literal["llm", "fast"] = Field(
+        description="How graph search finds the entities in a query: 'llm' asks the LLM to extract them, "
+        "'fast' matches the query against an in-process index of known entity names",
+        default="llm",
+    )
+    entity_index: GraphEntityIndexConfig = Field(
+        description="In-process entity name index used by 'fast' search", default_factory=GraphEntityIndexConfig
+    )
+    extraction_mode: Literal["multi_call", "single_call"] = Field(
+        description="How graph ingestion extracts entities and relations: 'multi_call' uses separate LLM calls, "
+        "'single_call' extracts both in one call while contradiction candidates are searched concurrently",
+        default="multi_call",
+    )
+    max_hops: int = Field(
+        description="Relations traversed from each matched entity by graph search; above 1, search returns "
+        "scored paths instead of single relations",
+        default=1,
+        ge=1,
+        le=4,
+    )
+    hop_fanout: int = Field(
+        description="Most recent relations followed per node at each hop, and matched entities traversal starts "
+        "from, when max_hops > 1",
+        default=10,
+        ge=1,
+    )
+    hop_decay: float = Field(
+        description="Path score multiplier per hop beyond the first, so shorter paths win ties", default=0.8
+    )
+    recency_weight: float = Field(
+        description="Share of the path score given to relation recency rather than entity similarity",
+        default=0.2,
+        ge=0.0,
+        le=1.0,
+    )
+    recency_half_life_days: float = Field(
+        description="Age in days at which a relation's recency score halves", default=30.0, gt=0
+    )
+    max_paths: int = Field(description="Most paths returned by a multi-hop search", default=10, ge=1)
+    reranker: GraphRerankerConfig = Field(
+        description="Ranking of single-hop graph search results", default_factory=GraphRerankerConfig
+    )
+    prune: GraphPruneConfig = Field(
+        description="Expiry of stale relations and graph size metrics", default_factory=GraphPruneConfig
+    )
 
-    @field_validator("config")
+    @field_validator("config", mode="before")
     def validate_config(cls, v, values):
         provider = values.data.get("provider")
+        if isinstance(v, BaseModel):
+            v = v.model_dump()
         if provider == "neo4j":
-            return Neo4jConfig(**v.model_dump())
+            return Neo4jConfig(**v)
+        elif provider == "embedded":
+            return EmbeddedGraphConfig(**(v or {}))
         else:
             raise ValueError(f"Unsupported graph store provider: {provider}")
+
+    @model_validator(mode="after")
+    def default_embedded_config(self):
+        # The embedded store needs no connection details, so selecting it is enough to enable the graph.
+        if self.provider == "embedded" and self.config is None:
+            self.config = EmbeddedGraphConfig()
+        return self
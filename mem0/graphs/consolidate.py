@@ -0,0 +1,286 @@
+"""
+Offline consolidation of near-duplicate graph entities.
+
+Entities are only merged at write time when a new name's embedding is very close to an existing node, so the
+graph slowly collects variants of the same entity ("alice", "alice_smith", "Alice") that each carry part of its
+relations. `consolidate_entities` finds those clusters per scope and folds every cluster into one node.
+
+Like the schema helpers, it takes a `query(cypher, params=None) -> list[dict]` callable, plus an optional
+`stream` callable with the same signature that yields records (e.g. Neo4jClient.stream) for loading embeddings.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from mem0.graphs.entity_index import normalize_name
+from mem0.graphs.schema import SCOPE_KEYS, quote_name
+
+logger = logging.getLogger(__name__)
+
+_LIST_SCOPES = """
+MATCH (n:Entity)
+WHERE n.embedding IS NOT NULL {filter_clause}
+RETURN n.user_id AS user_id, n.agent_id AS agent_id, n.run_id AS run_id, count(n) AS nodes
+"""
+
+_LOAD_SCOPE = """
+MATCH (n:Entity)
+WHERE n.user_id = $user_id AND n.agent_id = $agent_id AND n.run_id = $run_id AND n.embedding IS NOT NULL
+RETURN elementId(n) AS id, n.name AS name, n.embedding AS embedding, n.created AS created,
+       size([(n)--() | 1]) AS degree
+"""
+
+_RELATIONSHIP_TYPES = """
+UNWIND $ids AS id
+MATCH (n:Entity)-[r]-()
+WHERE elementId(n) = id
+RETURN DISTINCT type(r) AS relationship
+"""
+
+# Relations between members of one cluster would become self-loops on the kept node; they are dropped with
+# the duplicates instead of being rewired. When the kept node already has the relation, the duplicate's
+# mentions are added to it and the later last_seen wins, so the decay pruner sees the merged history.
+_REWIRE_OUTGOING = """
+UNWIND $rows AS row
+MATCH (keep:Entity) WHERE elementId(keep) = row.keep
+UNWIND row.drop AS drop_id
+MATCH (duplicate:Entity)-[r:{relationship}]->(other)
+WHERE elementId(duplicate) = drop_id
+WITH keep, r, CASE WHEN elementId(other) IN row.drop THEN keep ELSE other END AS target
+WHERE target <> keep
+MERGE (keep)-[merged:{relationship}]->(target)
+ON CREATE SET merged.created = r.created, merged.last_seen = r.last_seen, merged.mentions = r.mentions,
+    merged.uid = r.uid
+ON MATCH SET merged.mentions = coalesce(merged.mentions, 1) + coalesce(r.mentions, 1),
+    merged.last_seen = CASE
+        WHEN coalesce(r.last_seen, r.created) > coalesce(merged.last_seen, merged.created)
+        THEN coalesce(r.last_seen, r.created) ELSE merged.last_seen END
+RETURN count(r) AS rewired
+"""
+
+_REWIRE_INCOMING = """
+UNWIND $rows AS row
+MATCH (keep:Entity) WHERE elementId(keep) = row.keep
+UNWIND row.drop AS drop_id
+MATCH (other)-[r:{relationship}]->(duplicate:Entity)
+WHERE elementId(duplicate) = drop_id
+WITH keep, r, CASE WHEN elementId(other) IN row.drop THEN keep ELSE other END AS source
+WHERE source <> keep
+MERGE (source)-[merged:{relationship}]->(keep)
+ON CREATE SET merged.created = r.created, merged.last_seen = r.last_seen, merged.mentions = r.mentions,
+    merged.uid = r.uid
+ON MATCH SET merged.mentions = coalesce(merged.mentions, 1) + coalesce(r.mentions, 1),
+    merged.last_seen = CASE
+        WHEN coalesce(r.last_seen, r.created) > coalesce(merged.last_seen, merged.created)
+        THEN coalesce(r.last_seen, r.created) ELSE merged.last_seen END
+RETURN count(r) AS rewired
+"""
+
+_DELETE_DUPLICATES = """
+UNWIND $ids AS id
+MATCH (n:Entity)
+WHERE elementId(n) = id
+DETACH DELETE n
+RETURN count(*) AS deleted
+"""
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def find_duplicate_clusters(names, embeddings, threshold=0.93, block_size=1024):
+    """
+    Group entities whose embeddings are at least `threshold` cosine-similar, or whose names normalise to the
+    same string. Clusters are transitive (connected components of the similarity graph).
+
+    Similarities are computed in `block_size` x `block_size` tiles of the upper triangle, so memory stays at
+    one tile regardless of how many entities the scope has.
+
+    Args:
+        names (list): Entity names.
+        embeddings (np.ndarray): One row per name.
+        threshold (float): Minimum cosine similarity for two entities to be duplicates.
+        block_size (int): Tile edge length.
+
+    Returns:
+        tuple: (list of clusters as lists of row positions, number of pairs compared).
+    """
+    count = len(names)
+    union_find = _UnionFind(count)
+
+    by_name = {}
+    for position, name in enumerate(names):
+        first = by_name.setdefault(normalize_name(name), position)
+        if first != position:
+            union_find.union(first, position)
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    matrix = embeddings / np.where(norms == 0, 1.0, norms)
+    compared = 0
+    for row_start in range(0, count, block_size):
+        rows = matrix[row_start : row_start + block_size]
+        for column_start in range(row_start, count, block_size):
+            columns = matrix[column_start : column_start + block_size]
+            similarities = rows @ columns.T
+            if column_start == row_start:
+                similarities = np.triu(similarities, k=1)
+                compared += len(rows) * (len(rows) - 1) // 2
+            else:
+                compared += len(rows) * len(columns)
+            for row, column in zip(*np.nonzero(similarities >= threshold)):
+                union_find.union(row_start + row, column_start + column)
+
+    clusters = {}
+    for position in range(count):
+        clusters.setdefault(union_find.find(position), []).append(position)
+    return [members for members in clusters.values() if len(members) > 1], compared
+
+
+def consolidate_entities(
+    query,
+    stream=None,
+    filters=None,
+    threshold=0.93,
+    block_size=1024,
+    batch_size=500,
+    dry_run=False,
+    transaction=None,
+):
+    """
+    Merge near-duplicate entities within each scope.
+
+    For every cluster the node with the most relations (then the oldest) is kept; the others' relations are
+    rewired onto it with MERGE and the duplicates are deleted. Each batch of clusters is merged in one
+    transaction when `transaction` is given, so an interrupted run can simply be repeated. Without it every
+    rewire and delete query commits on its own, and a run interrupted mid-batch may count the mentions of
+    relations it had already rewired twice when repeated.
+
+    Running servers keep merged-away names in their fast-search entity index until its next full reload
+    (graph_store.entity_index.reload_interval); graph lookups for those names find nothing meanwhile.
+
+    Args:
+        query (callable): `query(cypher, params=None) -> list[dict]`.
+        stream (callable, optional): Like `query` but yielding records; used to load embeddings.
+        filters (dict, optional): Only consolidate scopes with these user_id/agent_id/run_id values.
+        threshold (float): Minimum cosine similarity for two entities to be merged.
+        block_size (int): Tile edge length for the similarity computation.
+        batch_size (int): Clusters merged per batch.
+        dry_run (bool): Only report the clusters that would be merged.
+        transaction (callable, optional): `transaction(work)` runs `work(query)` in one write transaction, with a
+            `query`-like callable bound to it; used to merge each batch atomically.
+
+    Returns:
+        dict: Totals, per-stage seconds, throughput and the clusters found (kept name, merged names, lowest
+            similarity to the kept node).
+    """
+    stream = stream or query
+    transaction = transaction or (lambda work: work(query))
+    filters = filters or {}
+    started = time.perf_counter()
+    report = {
+        "dry_run": dry_run,
+        "scopes": 0,
+        "nodes": 0,
+        "comparisons": 0,
+        "clusters": 0,
+        "merged_nodes": 0,
+        "rewired_relationships": 0,
+        "seconds": {"load": 0.0, "similarity": 0.0, "merge": 0.0},
+        "details": [],
+    }
+
+    filter_clause = "".join(f" AND n.{key} = ${key}" for key in SCOPE_KEYS if filters.get(key))
+    scopes = query(_LIST_SCOPES.format(filter_clause=filter_clause), params={k: v for k, v in filters.items() if v})
+
+    for scope in scopes:
+        scope_filters = {key: scope[key] for key in SCOPE_KEYS}
+        report["scopes"] += 1
+
+        stage = time.perf_counter()
+        nodes = list(stream(_LOAD_SCOPE, params=scope_filters))
+        report["seconds"]["load"] += time.perf_counter() - stage
+        report["nodes"] += len(nodes)
+        if len(nodes) < 2:
+            continue
+
+        stage = time.perf_counter()
+        embeddings = np.asarray([node["embedding"] for node in nodes], dtype=np.float32)
+        clusters, compared = find_duplicate_clusters(
+            [node["name"] for node in nodes], embeddings, threshold=threshold, block_size=block_size
+        )
+        report["seconds"]["similarity"] += time.perf_counter() - stage
+        report["comparisons"] += compared
+
+        merges = []
+        for members in clusters:
+            members.sort(key=lambda position: (-nodes[position]["degree"], nodes[position]["created"] or 0))
+            keep, duplicates = members[0], members[1:]
+            vectors = embeddings[members]
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            merges.append({"keep": nodes[keep]["id"], "drop": [nodes[position]["id"] for position in duplicates]})
+            report["details"].append(
+                {
+                    "scope": scope_filters,
+                    "keep": nodes[keep]["name"],
+                    "merge": [nodes[position]["name"] for position in duplicates],
+                    "min_similarity": round(float((vectors[1:] @ vectors[0]).min()), 4),
+                }
+            )
+        report["clusters"] += len(merges)
+
+        if dry_run or not merges:
+            report["merged_nodes"] += sum(len(merge["drop"]) for merge in merges)
+            continue
+
+        stage = time.perf_counter()
+        for batch_start in range(0, len(merges), batch_size):
+            batch = merges[batch_start : batch_start + batch_size]
+            merged, rewired = transaction(lambda run: _merge_batch(run, batch))
+            report["merged_nodes"] += merged
+            report["rewired_relationships"] += rewired
+        report["seconds"]["merge"] += time.perf_counter() - stage
+        logger.info(f"Consolidated scope {scope_filters}: {len(merges)} clusters")
+
+    total = time.perf_counter() - started
+    report["seconds"] = {stage: round(seconds, 3) for stage, seconds in report["seconds"].items()}
+    report["seconds"]["total"] = round(total, 3)
+    report["throughput"] = {
+        "nodes_per_second": round(report["nodes"] / total, 1) if total else 0.0,
+        "comparisons_per_second": round(report["comparisons"] / report["seconds"]["similarity"], 1)
+        if report["seconds"]["similarity"]
+        else 0.0,
+        "merged_nodes_per_second": round(report["merged_nodes"] / report["seconds"]["merge"], 1)
+        if report["seconds"]["merge"]
+        else 0.0,
+    }
+    return report
+
+
+def _merge_batch(query, merges):
+    """Rewire the duplicates' relations onto the kept nodes, then delete the duplicates."""
+    duplicate_ids = [node_id for merge in merges for node_id in merge["drop"]]
+    rewired = 0
+    for record in query(_RELATIONSHIP_TYPES, params={"ids": duplicate_ids}):
+        relationship = quote_name(record["relationship"])
+        for template in (_REWIRE_OUTGOING, _REWIRE_INCOMING):
+            result = query(template.format(relationship=relationship), params={"rows": merges})
+            rewired += result[0]["rewired"] if result else 0
+    deleted = query(_DELETE_DUPLICATES, params={"ids": duplicate_ids})
+    return (deleted[0]["deleted"] if deleted else 0), rewired
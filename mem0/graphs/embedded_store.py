@@ -0,0 +1,727 @@
+"""
+In-process graph storage for single-node deployments.
+
+Nodes are interned to dense integer ids keyed by (name, user_id, agent_id, run_id), with unit-normalised embeddings
+in one NumPy matrix so similarity over a scope is a single matrix product. Edges are columnar arrays (source,
+destination, relationship type, created, last_seen, mentions) indexed CSR-style by source and by destination;
+edges added since the last rebuild sit in small per-node overflow lists until they are folded in.
+
+Durability is a snapshot (`snapshot.npz`, numeric and string arrays only) plus an append-only JSON-lines log of
+every write since that snapshot. Log entries refer to nodes by key rather than id and every operation is
+idempotent, so replaying a log over a snapshot that already contains some of it is harmless.
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+
+import numpy as np
+
+from mem0.graphs.schema import SCOPE_KEYS
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT = "snapshot.npz"
+_LOG = "log.jsonl"
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _live(flags):
+    """Positions of the set bytes in an alive-flag bytearray."""
+    return np.flatnonzero(np.frombuffer(bytes(flags), dtype=np.uint8))
+
+
+class EmbeddedGraphStore:
+    def __init__(self, path, snapshot_every=10000, fsync=False):
+        """
+        Open (or create) a graph stored under `path`.
+
+        Args:
+            path (str): Directory holding the snapshot and log.
+            snapshot_every (int): Log entries after which the log is folded into a new snapshot.
+            fsync (bool): fsync the log after every write instead of leaving it to the OS.
+        """
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+
+        self._reset()
+        snapshot_path = os.path.join(path, _SNAPSHOT)
+        if os.path.exists(snapshot_path):
+            self._load_snapshot(snapshot_path)
+
+        log_path = os.path.join(path, _LOG)
+        self._log_entries = 0
+        self._unflushed = []
+        if os.path.exists(log_path):
+            with open(log_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write; everything before it is intact.
+                        logger.warning(f"Ignoring unreadable entry at the end of {log_path}")
+                        break
+                    self._replay(entry)
+                    self._log_entries += 1
+        self._log = open(log_path, "a", encoding="utf-8")
+        logger.info(
+            f"Opened embedded graph at {path}: {len(self._node_index)} nodes, {len(self._edge_index)} relations, "
+            f"{self._log_entries} log entries"
+        )
+
+    def _reset(self):
+        self._keys = []
+        self._types = []
+        self._node_created = array("q")
+        self._node_alive = bytearray()
+        self._node_index = {}
+        self._by_name = {}
+        self._scope_members = {}
+        self._matrix = None
+        self._rows = 0
+
+        self._relationships = []
+        self._relationship_ids = {}
+        self._edge_src = array("q")
+        self._edge_dst = array("q")
+        self._edge_type = array("q")
+        self._edge_created = array("q")
+        self._edge_last_seen = array("q")
+        self._edge_mentions = array("q")
+        self._edge_alive = bytearray()
+        self._edge_index = {}
+
+        self._csr_nodes = 0
+        self._out_offsets = np.zeros(1, dtype=np.int64)
+        self._out_edges = np.zeros(0, dtype=np.int64)
+        self._in_offsets = np.zeros(1, dtype=np.int64)
+        self._in_edges = np.zeros(0, dtype=np.int64)
+        self._pending_out = {}
+        self._pending_in = {}
+        self._pending = 0
+
+    # Writes
+
+    def merge_nodes(self, rows, scope):
+        """
+        Get or create one node per row on (name, scope).
+
+        Args:
+            rows (list): Dicts with "name", "type" and "embedding".
+            scope (dict): user_id/agent_id/run_id of the nodes; unset ids are stored as "".
+
+        Returns:
+            dict: Name -> node id.
+        """
+        scope_key = tuple(scope.get(key) or "" for key in SCOPE_KEYS)
+        node_ids = {}
+        with self._lock:
+            for row in rows:
+                key = (row["name"],) + scope_key
+                node_id, created = self._merge_node(key, row["type"], row["embedding"], _now_ms())
+                if created:
+                    self._write_log(
+                        {
+                            "op": "node",
+                            "key": list(key),
+                            "type": row["type"],
+                            # Base64 float32 is exact and an order of magnitude faster to encode than a JSON list.
+                            "embedding": base64.b64encode(self._matrix[node_id].tobytes()).decode("ascii"),
+                            "created": self._node_created[node_id],
+                        }
+                    )
+                node_ids[row["name"]] = node_id
+            self._commit()
+        return node_ids
+
+    def merge_edges(self, rows):
+        """
+        Get or create one relation per row. A relation that already exists is refreshed: its last_seen becomes
+        now and its mentions count goes up by one.
+
+        Args:
+            rows (list): Dicts with "index", "source_id", "destination_id", "relationship" and optionally "created"
+                (ms since epoch, only used when the relation is new).
+
+        Returns:
+            list: {"index", "source", "relationship", "destination"} per row.
+        """
+        records = []
+        with self._lock:
+            for row in rows:
+                source, destination = row["source_id"], row["destination_id"]
+                now = _now_ms()
+                edge_id, created = self._merge_edge(source, destination, row["relationship"], row.get("created") or now)
+                if not created:
+                    self._edge_last_seen[edge_id] = max(self._edge_last_seen[edge_id], now)
+                    self._edge_mentions[edge_id] += 1
+                # Entries carry the resulting last_seen and mentions rather than increments, so replay stays
+                # idempotent.
+                self._write_log(
+                    {
+                        "op": "edge",
+                        "source": list(self._keys[source]),
+                        "destination": list(self._keys[destination]),
+                        "relationship": row["relationship"],
+                        "created": self._edge_created[edge_id],
+                        "last_seen": self._edge_last_seen[edge_id],
+                        "mentions": self._edge_mentions[edge_id],
+                    }
+                )
+                records.append(
+                    {
+                        "index": row["index"],
+                        "source": self._keys[source][0],
+                        "relationship": row["relationship"],
+                        "destination": self._keys[destination][0],
+                    }
+                )
+            self._commit()
+        return records
+
+    def delete_edges(self, rows, filters):
+        """
+        Delete relations of a given type between nodes with the given names inside the scope.
+
+        Args:
+            rows (list): Dicts with "index", "source", "destination" and "relationship".
+            filters (dict): user_id/agent_id/run_id both endpoints must match.
+
+        Returns:
+            list: {"index", "source", "destination", "deleted_relationship"} per deleted relation.
+        """
+        records = []
+        with self._lock:
+            in_scope = self._scope_mask(filters)
+            for row in rows:
+                relationship = self._relationship_ids.get(row["relationship"])
+                if relationship is None:
+                    continue
+                for source in self._named(row["source"], in_scope):
+                    for edge_id in self._incident(source, outgoing=True):
+                        destination = self._edge_dst[edge_id]
+                        if (
+                            self._edge_type[edge_id] != relationship
+                            or not in_scope[destination]
+                            or self._keys[destination][0] != row["destination"]
+                        ):
+                            continue
+                        self._delete_edge(edge_id)
+                        self._write_log(
+                            {
+                                "op": "delete_edge",
+                                "source": list(self._keys[source]),
+                                "destination": list(self._keys[destination]),
+                                "relationship": row["relationship"],
+                            }
+                        )
+                        records.append(
+                            {
+                                "index": row["index"],
+                                "source": row["source"],
+                                "destination": row["destination"],
+                                "deleted_relationship": row["relationship"],
+                            }
+                        )
+            self._commit()
+        return records
+
+    def delete_scope(self, filters):
+        """Delete every node matching `filters` and its relations. Returns the number of deleted nodes."""
+        with self._lock:
+            deleted = self._delete_scope(filters)
+            if deleted:
+                scope = {key: filters[key] for key in SCOPE_KEYS if key in filters}
+                self._write_log({"op": "delete_scope", "filters": scope})
+                self._commit()
+        return deleted
+
+    def prune_edges(self, filters, ttl_ms, min_score, half_life_days, batch_size):
+        """
+        Delete up to `batch_size` relations between nodes matching `filters` that were last seen more than
+        `ttl_ms` ago or whose decay score log2(1 + mentions) * 0.5 ^ (days_since_last_seen / half_life_days) is
+        below `min_score`. Returns the number deleted.
+        """
+        with self._lock:
+            in_scope = self._scope_mask(filters)
+            sources = np.array(self._edge_src, dtype=np.int64)
+            destinations = np.array(self._edge_dst, dtype=np.int64)
+            ages = _now_ms() - np.array(self._edge_last_seen, dtype=np.int64)
+            expired = np.zeros(len(sources), dtype=bool)
+            if ttl_ms is not None:
+                expired |= ages > ttl_ms
+            if min_score is not None:
+                mentions = np.array(self._edge_mentions, dtype=np.float64)
+                expired |= np.log2(1 + mentions) * np.power(0.5, ages / 86400000.0 / half_life_days) < min_score
+            alive = np.frombuffer(bytes(self._edge_alive), dtype=np.uint8).astype(bool)
+            candidates = np.flatnonzero(alive & expired & in_scope[sources] & in_scope[destinations])[:batch_size]
+
+            for edge_id in candidates.tolist():
+                self._delete_edge(edge_id)
+                self._write_log(
+                    {
+                        "op": "delete_edge",
+                        "source": list(self._keys[self._edge_src[edge_id]]),
+                        "destination": list(self._keys[self._edge_dst[edge_id]]),
+                        "relationship": self._relationships[self._edge_type[edge_id]],
+                    }
+                )
+            self._commit()
+            return len(candidates)
+
+    def prune_nodes(self, filters, grace_ms, batch_size):
+        """Delete up to `batch_size` nodes matching `filters` with no relations, created over `grace_ms` ago."""
+        with self._lock:
+            live = _live(self._edge_alive)
+            degree = np.bincount(np.array(self._edge_src, dtype=np.int64)[live], minlength=len(self._keys))
+            degree += np.bincount(np.array(self._edge_dst, dtype=np.int64)[live], minlength=len(self._keys))
+            nodes = self._scoped_ids(filters)
+            created = np.array(self._node_created, dtype=np.int64)[nodes]
+            orphans = nodes[(degree[nodes] == 0) & (created < _now_ms() - grace_ms)][:batch_size]
+
+            for node in orphans.tolist():
+                self._write_log({"op": "delete_node", "key": list(self._keys[node])})
+                self._delete_node(node)
+            self._commit()
+            return len(orphans)
+
+    def stats(self):
+        """Number of live nodes and relations."""
+        with self._lock:
+            return {"nodes": len(self._node_index), "relations": len(self._edge_index)}
+
+    # Reads
+
+    def similar_nodes(self, embeddings, filters, threshold, top_k=None):
+        """
+        Nodes in scope whose cosine similarity to each embedding is at least `threshold`.
+
+        Args:
+            embeddings (list): Query embeddings.
+            filters (dict): user_id/agent_id/run_id the nodes must match.
+            threshold (float): Minimum cosine similarity.
+            top_k (int, optional): Keep only the best `top_k` per embedding.
+
+        Returns:
+            list: Per embedding, (node id, similarity) pairs, best first.
+        """
+        with self._lock:
+            ids = self._scoped_ids(filters)
+            if not len(ids) or not len(embeddings):
+                return [[] for _ in embeddings]
+            queries = np.asarray(embeddings, dtype=np.float32)
+            if queries.shape[1] != self._matrix.shape[1]:
+                raise ValueError(
+                    f"Embedding has {queries.shape[1]} dimensions, the graph stores {self._matrix.shape[1]}"
+                )
+            queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+            similarities = queries @ self._matrix[ids].T
+
+        results = []
+        for row in similarities:
+            hits = np.flatnonzero(row >= threshold)
+            hits = hits[np.argsort(-row[hits], kind="stable")]
+            if top_k is not None:
+                hits = hits[:top_k]
+            results.append([(int(ids[hit]), round(float(row[hit]), 4)) for hit in hits])
+        return results
+
+    def search_relations(self, embeddings, filters, threshold, limit):
+        """
+        Relations (in either direction) of the nodes similar to any of the embeddings, each once with its best
+        endpoint similarity, in the shape MemoryGraph._search_graph_db returns.
+        """
+        best = {}
+        with self._lock:
+            in_scope = self._scope_mask(filters)
+            for matches in self.similar_nodes(embeddings, filters, threshold):
+                for node, similarity in matches:
+                    for outgoing in (True, False):
+                        for edge_id in self._incident(node, outgoing=outgoing):
+                            other = self._edge_dst[edge_id] if outgoing else self._edge_src[edge_id]
+                            if in_scope[other] and similarity > best.get(edge_id, -2.0):
+                                best[edge_id] = similarity
+            ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [dict(self._relation(edge_id), similarity=similarity) for edge_id, similarity in ranked]
+
+    def search_paths(self, embeddings, filters, threshold, max_hops, fanout, limit, recency_weight, half_life_days,
+                     hop_decay):
+        """
+        Bounded multi-hop walks from the nodes most similar to the embeddings, scored like
+        MemoryGraph._search_graph_paths.
+        """
+        with self._lock:
+            in_scope = self._scope_mask(filters)
+            seeds = {}
+            for matches in self.similar_nodes(embeddings, filters, threshold):
+                for node, similarity in matches:
+                    seeds[node] = max(similarity, seeds.get(node, -2.0))
+            seeds = sorted(seeds.items(), key=lambda item: (-item[1], item[0]))[:fanout]
+
+            finished = []
+            live = [(similarity, node, (), frozenset([node])) for node, similarity in seeds]
+            for _ in range(max_hops):
+                extended = []
+                for similarity, tail, edges, visited in live:
+                    if edges:
+                        finished.append((similarity, edges))
+                    steps = []
+                    for outgoing in (True, False):
+                        for edge_id in self._incident(tail, outgoing=outgoing):
+                            other = self._edge_dst[edge_id] if outgoing else self._edge_src[edge_id]
+                            if in_scope[other] and other not in visited:
+                                steps.append((self._edge_created[edge_id], edge_id, other))
+                    steps.sort(key=lambda step: (-step[0], step[1]))
+                    for _, edge_id, other in steps[:fanout]:
+                        extended.append((similarity, other, edges + (edge_id,), visited | {other}))
+                live = extended
+            finished.extend((similarity, edges) for similarity, _, edges, _ in live)
+
+            now = _now_ms()
+            best = {}
+            for similarity, edges in finished:
+                ages = np.array([now - self._edge_created[edge_id] for edge_id in edges], dtype=np.float64)
+                recency = float(np.mean(np.power(0.5, np.maximum(ages, 0) / 86400000.0 / half_life_days)))
+                score = ((1 - recency_weight) * similarity + recency_weight * recency) * hop_decay ** (len(edges) - 1)
+                path_key = edges if edges[0] <= edges[-1] else edges[::-1]
+                if score > best.get(path_key, (-1.0,))[0]:
+                    best[path_key] = (score, edges)
+
+            ranked = sorted(best.values(), key=lambda item: -item[0])[:limit]
+            return [
+                {
+                    "path": [
+                        {
+                            "source": self._keys[self._edge_src[edge_id]][0],
+                            "relationship": self._relationships[self._edge_type[edge_id]],
+                            "target": self._keys[self._edge_dst[edge_id]][0],
+                        }
+                        for edge_id in edges
+                    ],
+                    "score": round(score, 4),
+                    "hops": len(edges),
+                }
+                for score, edges in ranked
+            ]
+
+    def relations(self, filters, limit, after=-1):
+        """
+        Up to `limit` relations whose endpoints both match `filters`, with ids greater than `after`, in id order.
+
+        Returns:
+            list: {"id", "source", "relationship", "target", "created", "last_seen", "mentions"} per relation.
+        """
+        with self._lock:
+            in_scope = self._scope_mask(filters)
+            start = after + 1
+            sources = np.array(self._edge_src[start:], dtype=np.int64)
+            destinations = np.array(self._edge_dst[start:], dtype=np.int64)
+            alive = np.frombuffer(bytes(self._edge_alive[start:]), dtype=np.uint8).astype(bool)
+            matches = np.flatnonzero(alive & in_scope[sources] & in_scope[destinations])[:limit] + start
+            return [
+                {
+                    "id": str(edge_id),
+                    "source": self._keys[self._edge_src[edge_id]][0],
+                    "relationship": self._relationships[self._edge_type[edge_id]],
+                    "target": self._keys[self._edge_dst[edge_id]][0],
+                    "created": self._edge_created[edge_id],
+                    "last_seen": self._edge_last_seen[edge_id],
+                    "mentions": self._edge_mentions[edge_id],
+                }
+                for edge_id in matches.tolist()
+            ]
+
+    def entities(self, filters, since=0):
+        """Name, embedding and created time of the scope's nodes created after `since` (ms since epoch)."""
+        with self._lock:
+            return [
+                {
+                    "name": self._keys[node][0],
+                    "embedding": self._matrix[node].tolist(),
+                    "created": self._node_created[node],
+                }
+                for node in self._scoped_ids(filters)
+                if self._node_created[node] > since
+            ]
+
+    # Persistence
+
+    def snapshot(self):
+        """
+        Write the live graph to a new snapshot and start an empty log.
+
+        Deleted nodes and relations are dropped from the snapshot only; ids handed out by this process stay valid
+        until the store is reopened.
+        """
+        with self._lock:
+            nodes = _live(self._node_alive)
+            edges = _live(self._edge_alive)
+            remap = np.full(len(self._keys), -1, dtype=np.int64)
+            remap[nodes] = np.arange(len(nodes))
+
+            keys = [self._keys[node] for node in nodes]
+            arrays = {
+                "names": np.array([key[0] for key in keys], dtype=str),
+                "types": np.array([self._types[node] for node in nodes], dtype=str),
+                "node_created": np.array(self._node_created, dtype=np.int64)[nodes],
+                "embeddings": self._matrix[nodes] if self._matrix is not None else np.zeros((0, 0), dtype=np.float32),
+                "relationships": np.array(self._relationships, dtype=str),
+                "edge_src": remap[np.array(self._edge_src, dtype=np.int64)[edges]],
+                "edge_dst": remap[np.array(self._edge_dst, dtype=np.int64)[edges]],
+                "edge_type": np.array(self._edge_type, dtype=np.int64)[edges],
+                "edge_created": np.array(self._edge_created, dtype=np.int64)[edges],
+                "edge_last_seen": np.array(self._edge_last_seen, dtype=np.int64)[edges],
+                "edge_mentions": np.array(self._edge_mentions, dtype=np.int64)[edges],
+            }
+            for position, name in enumerate(SCOPE_KEYS, start=1):
+                arrays[name] = np.array([key[position] for key in keys], dtype=str)
+
+            started = time.perf_counter()
+            temporary = os.path.join(self.path, _SNAPSHOT + ".tmp")
+            with open(temporary, "wb") as f:
+                np.savez(f, **arrays)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, os.path.join(self.path, _SNAPSHOT))
+
+            self._log.close()
+            self._log = open(os.path.join(self.path, _LOG), "w", encoding="utf-8")
+            self._log_entries = 0
+            logger.info(
+                f"Snapshotted embedded graph: {len(nodes)} nodes, {len(edges)} relations "
+                f"in {time.perf_counter() - started:.3f}s"
+            )
+
+    def close(self):
+        with self._lock:
+            self._log.close()
+
+    def _write_log(self, entry):
+        self._unflushed.append(json.dumps(entry))
+
+    def _commit(self):
+        """Append the operation's log entries in one write, then snapshot if the log has grown long enough."""
+        if self._unflushed:
+            self._log.write("\n".join(self._unflushed) + "\n")
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self._log_entries += len(self._unflushed)
+            self._unflushed = []
+        if self._log_entries >= self.snapshot_every:
+            self.snapshot()
+
+    def _load_snapshot(self, snapshot_path):
+        with np.load(snapshot_path, allow_pickle=False) as data:
+            self._load_arrays({name: data[name] for name in data.files})
+
+    def _load_arrays(self, arrays):
+        embeddings = arrays["embeddings"]
+        count = len(arrays["names"])
+        for node in range(count):
+            key = (str(arrays["names"][node]),) + tuple(str(arrays[name][node]) for name in SCOPE_KEYS)
+            self._add_node(key, str(arrays["types"][node]), int(arrays["node_created"][node]))
+        if count:
+            self._matrix = np.array(embeddings, dtype=np.float32)
+            self._rows = count
+        for name in arrays["relationships"]:
+            self._intern_relationship(str(name))
+        for source, destination, relationship, created, last_seen, mentions in zip(
+            arrays["edge_src"],
+            arrays["edge_dst"],
+            arrays["edge_type"],
+            arrays["edge_created"],
+            # Snapshots written before relations tracked reinforcement lack these two columns.
+            arrays.get("edge_last_seen", arrays["edge_created"]),
+            arrays.get("edge_mentions", np.ones(len(arrays["edge_created"]), dtype=np.int64)),
+        ):
+            self._add_edge(
+                int(source), int(destination), int(relationship), int(created), int(last_seen), int(mentions)
+            )
+        self._rebuild_csr()
+
+    def _replay(self, entry):
+        op = entry["op"]
+        if op == "node":
+            embedding = np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32)
+            self._merge_node(tuple(entry["key"]), entry["type"], embedding, entry["created"])
+        elif op == "edge":
+            source = self._node_index.get(tuple(entry["source"]))
+            destination = self._node_index.get(tuple(entry["destination"]))
+            if source is not None and destination is not None:
+                edge_id, _ = self._merge_edge(source, destination, entry["relationship"], entry["created"])
+                self._edge_last_seen[edge_id] = entry["last_seen"]
+                self._edge_mentions[edge_id] = entry["mentions"]
+        elif op == "delete_edge":
+            source = self._node_index.get(tuple(entry["source"]))
+            destination = self._node_index.get(tuple(entry["destination"]))
+            relationship = self._relationship_ids.get(entry["relationship"])
+            edge_id = self._edge_index.get((source, relationship, destination))
+            if edge_id is not None:
+                self._delete_edge(edge_id)
+        elif op == "delete_node":
+            node = self._node_index.get(tuple(entry["key"]))
+            if node is not None:
+                self._delete_node(node)
+        elif op == "delete_scope":
+            self._delete_scope(entry["filters"])
+
+    # Internal structure
+
+    def _add_node(self, key, node_type, created):
+        node_id = len(self._keys)
+        self._keys.append(key)
+        self._types.append(node_type)
+        self._node_created.append(created)
+        self._node_alive.append(1)
+        self._node_index[key] = node_id
+        self._by_name.setdefault(key[0], []).append(node_id)
+        for name, value in zip(SCOPE_KEYS, key[1:]):
+            self._scope_members.setdefault((name, value), set()).add(node_id)
+        return node_id
+
+    def _merge_node(self, key, node_type, embedding, created):
+        node_id = self._node_index.get(key)
+        if node_id is not None:
+            return node_id, False
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._matrix is None:
+            self._matrix = np.zeros((64, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(f"Embedding has {vector.shape[0]} dimensions, the graph stores {self._matrix.shape[1]}")
+        if self._rows == self._matrix.shape[0]:
+            grown = np.zeros((self._rows * 2, self._matrix.shape[1]), dtype=np.float32)
+            grown[: self._rows] = self._matrix[: self._rows]
+            self._matrix = grown
+
+        node_id = self._add_node(key, node_type, created)
+        self._matrix[node_id] = vector / (np.linalg.norm(vector) or 1.0)
+        self._rows += 1
+        return node_id, True
+
+    def _intern_relationship(self, relationship):
+        relationship_id = self._relationship_ids.get(relationship)
+        if relationship_id is None:
+            relationship_id = self._relationship_ids[relationship] = len(self._relationships)
+            self._relationships.append(relationship)
+        return relationship_id
+
+    def _add_edge(self, source, destination, relationship_id, created, last_seen=None, mentions=1):
+        edge_id = len(self._edge_src)
+        self._edge_src.append(source)
+        self._edge_dst.append(destination)
+        self._edge_type.append(relationship_id)
+        self._edge_created.append(created)
+        self._edge_last_seen.append(created if last_seen is None else last_seen)
+        self._edge_mentions.append(mentions)
+        self._edge_alive.append(1)
+        self._edge_index[(source, relationship_id, destination)] = edge_id
+        return edge_id
+
+    def _merge_edge(self, source, destination, relationship, created):
+        relationship_id = self._intern_relationship(relationship)
+        edge_id = self._edge_index.get((source, relationship_id, destination))
+        if edge_id is not None:
+            return edge_id, False
+
+        edge_id = self._add_edge(source, destination, relationship_id, created)
+        self._pending_out.setdefault(source, []).append(edge_id)
+        self._pending_in.setdefault(destination, []).append(edge_id)
+        self._pending += 1
+        return edge_id, True
+
+    def _delete_edge(self, edge_id):
+        self._edge_alive[edge_id] = 0
+        del self._edge_index[(self._edge_src[edge_id], self._edge_type[edge_id], self._edge_dst[edge_id])]
+
+    def _delete_scope(self, filters):
+        nodes = self._scoped_ids(filters)
+        for node in nodes:
+            for outgoing in (True, False):
+                for edge_id in self._incident(node, outgoing=outgoing):
+                    if self._edge_alive[edge_id]:
+                        self._delete_edge(edge_id)
+        for node in nodes:
+            self._delete_node(node)
+        return len(nodes)
+
+    def _delete_node(self, node):
+        """Remove a node that has no live relations left."""
+        key = self._keys[node]
+        self._node_alive[node] = 0
+        del self._node_index[key]
+        for name, value in zip(SCOPE_KEYS, key[1:]):
+            self._scope_members[(name, value)].discard(node)
+
+    def _scoped_ids(self, filters):
+        """Sorted ids of live nodes matching every user_id/agent_id/run_id present in `filters`."""
+        members = None
+        for name in SCOPE_KEYS:
+            if name in filters:
+                scope = self._scope_members.get((name, filters[name]), set())
+                members = set(scope) if members is None else members & scope
+        if members is None:
+            return _live(self._node_alive)
+        return np.fromiter(sorted(members), dtype=np.int64, count=len(members))
+
+    def _scope_mask(self, filters):
+        mask = np.zeros(len(self._keys), dtype=bool)
+        mask[self._scoped_ids(filters)] = True
+        return mask
+
+    def _named(self, name, in_scope):
+        """Live nodes called `name` inside the scope mask."""
+        return [node for node in self._by_name.get(name, ()) if in_scope[node] and self._node_alive[node]]
+
+    def _incident(self, node, outgoing):
+        """Live relation ids leaving (or entering) a node."""
+        if self._pending > max(1024, len(self._edge_index) // 4):
+            self._rebuild_csr()
+        offsets, edges, pending = (
+            (self._out_offsets, self._out_edges, self._pending_out)
+            if outgoing
+            else (self._in_offsets, self._in_edges, self._pending_in)
+        )
+        incident = list(edges[offsets[node] : offsets[node + 1]]) if node < self._csr_nodes else []
+        incident.extend(pending.get(node, ()))
+        return [int(edge_id) for edge_id in incident if self._edge_alive[edge_id]]
+
+    def _rebuild_csr(self):
+        count = len(self._keys)
+        live = _live(self._edge_alive)
+        for column, attribute in ((self._edge_src, "out"), (self._edge_dst, "in")):
+            endpoints = np.array(column, dtype=np.int64)[live]
+            order = live[np.argsort(endpoints, kind="stable")]
+            offsets = np.zeros(count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(endpoints, minlength=count), out=offsets[1:])
+            setattr(self, f"_{attribute}_offsets", offsets)
+            setattr(self, f"_{attribute}_edges", order)
+        self._csr_nodes = count
+        self._pending_out = {}
+        self._pending_in = {}
+        self._pending = 0
+
+    def _relation(self, edge_id):
+        source, destination = self._edge_src[edge_id], self._edge_dst[edge_id]
+        return {
+            "source": self._keys[source][0],
+            "source_id": str(source),
+            "relatationship": self._relationships[self._edge_type[edge_id]],
+            "relation_id": str(edge_id),
+            "destination": self._keys[destination][0],
+            "destination_id": str(destination),
+            "created": self._edge_created[edge_id],
+        }
@@ -0,0 +1,222 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from mem0.graphs.schema import SCOPE_KEYS
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_SELF_REFERENCES = {"i", "me", "my", "mine", "myself"}
+
+# Single words that are never worth looking up as an entity on their own.
+_STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "did", "do", "does", "for", "from", "has", "have", "how",
+    "in", "is", "it", "of", "on", "or", "so", "that", "the", "their", "there", "this", "to", "was", "were",
+    "what", "when", "where", "which", "who", "why", "with", "you", "your",
+}
+
+
+def normalize_name(name):
+    """Lowercase, drop possessives and punctuation, and join the remaining words with "_"."""
+    return "_".join(_TOKEN.findall(name.lower().replace("'s", "")))
+
+
+class _ScopeEntry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.names = []
+        self.created = []
+        self.exact = {}
+        self.normalized = {}
+        self.matrix = None
+        self.max_created = 0
+        self.refreshed_at = None
+        self.loaded_at = None
+
+    def clear(self):
+        self.names, self.created, self.exact, self.normalized = [], [], {}, {}
+        self.matrix = None
+        self.max_created = 0
+
+    def add(self, rows, max_entities=None):
+        vectors = []
+        now_ms = int(time.time() * 1000)
+        for row in rows:
+            name = row["name"]
+            created = row.get("created") or now_ms
+            self.max_created = max(self.max_created, row.get("created") or 0)
+            if name in self.exact:
+                continue
+            embedding = np.asarray(row["embedding"], dtype=np.float32)
+            if self.matrix is not None and embedding.shape[0] != self.matrix.shape[1]:
+                continue
+            self.exact[name] = len(self.names)
+            self.normalized.setdefault(normalize_name(name), len(self.names))
+            self.names.append(name)
+            self.created.append(created)
+            vectors.append(embedding / (np.linalg.norm(embedding) or 1.0))
+        if vectors:
+            block = np.vstack(vectors)
+            self.matrix = block if self.matrix is None else np.vstack([self.matrix, block])
+        if max_entities and len(self.names) > max_entities:
+            self._keep_newest(max_entities)
+
+    def _keep_newest(self, count):
+        keep = sorted(np.argsort(np.asarray(self.created), kind="stable")[-count:].tolist())
+        self.names = [self.names[position] for position in keep]
+        self.created = [self.created[position] for position in keep]
+        self.matrix = self.matrix[keep]
+        self.exact, self.normalized = {}, {}
+        for position, name in enumerate(self.names):
+            self.exact[name] = position
+            self.normalized.setdefault(normalize_name(name), position)
+
+
+class EntityNameIndex:
+    def __init__(
+        self,
+        loader,
+        max_ngram=4,
+        similarity_threshold=0.5,
+        top_k=5,
+        refresh_interval=30.0,
+        reload_interval=600.0,
+        max_scopes=1000,
+        max_entities=100000,
+    ):
+        """
+        In-process index of the entity names known in each scope, so graph search can find the entities a query
+        refers to without an LLM call.
+
+        A scope is loaded on first use and afterwards only pulls nodes created since its last refresh (at most
+        every `refresh_interval` seconds, to pick up writes from other processes). Writes made through this
+        process are applied immediately with `add`, and `invalidate` drops scopes it deletes from. Entities
+        deleted or merged by other processes cannot be seen incrementally, so each scope is rebuilt from scratch
+        every `reload_interval` seconds; until then lookups may return names that no longer exist, which graph
+        queries simply do not find.
+
+        Memory is bounded: at most `max_scopes` scopes are kept, evicting the least recently used, and each keeps
+        its `max_entities` most recently created entities.
+
+        Args:
+            loader (callable): `loader(filters, since) -> iterable of {"name", "embedding", "created"}` returning
+                the scope's entities created after `since` (ms since epoch).
+            max_ngram (int): Longest run of query words matched against entity names.
+            similarity_threshold (float): Minimum cosine similarity for an embedding match.
+            top_k (int): Maximum embedding matches per query.
+            refresh_interval (float): Seconds between incremental refreshes of a scope.
+            reload_interval (float, optional): Seconds between full reloads of a scope; never if None.
+            max_scopes (int, optional): Scopes kept in memory; unbounded if None.
+            max_entities (int, optional): Entities kept per scope; unbounded if None.
+        """
+        self.loader = loader
+        self.max_ngram = max_ngram
+        self.similarity_threshold = similarity_threshold
+        self.top_k = top_k
+        self.refresh_interval = refresh_interval
+        self.reload_interval = reload_interval
+        self.max_scopes = max_scopes
+        self.max_entities = max_entities
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, query, filters, query_embedding=None):
+        """
+        Find the known entities a query refers to: exact and normalised name matches on query n-grams, self
+        references to the user, then nearest neighbours of the query embedding.
+
+        Returns:
+            dict: Entity name -> stored (unit-normalised) embedding, best matches first.
+        """
+        entry = self._entry(filters)
+        with entry.lock:
+            positions = {}
+            words = _TOKEN.findall(query.lower().replace("'s", ""))
+            for n in range(min(self.max_ngram, len(words)), 0, -1):
+                for start in range(len(words) - n + 1):
+                    gram = words[start : start + n]
+                    if n == 1 and gram[0] in _STOP_WORDS:
+                        continue
+                    key = "_".join(gram)
+                    position = entry.exact.get(key, entry.normalized.get(key))
+                    if position is not None:
+                        positions.setdefault(position, None)
+
+            user_id = filters.get("user_id")
+            if user_id and _SELF_REFERENCES.intersection(words):
+                position = entry.exact.get(user_id, entry.normalized.get(normalize_name(user_id)))
+                if position is not None:
+                    positions.setdefault(position, None)
+
+            if query_embedding is not None and entry.matrix is not None and len(entry.names):
+                query_vector = np.asarray(query_embedding, dtype=np.float32)
+                if query_vector.shape[0] == entry.matrix.shape[1]:
+                    similarities = entry.matrix @ (query_vector / (np.linalg.norm(query_vector) or 1.0))
+                    k = min(self.top_k, len(similarities))
+                    nearest = np.argpartition(-similarities, k - 1)[:k]
+                    for position in nearest[np.argsort(-similarities[nearest])]:
+                        if similarities[position] >= self.similarity_threshold:
+                            positions.setdefault(int(position), None)
+
+            return {entry.names[position]: entry.matrix[position].tolist() for position in positions}
+
+    def add(self, scope, rows):
+        """
+        Record entities written with the given scope in every loaded index entry that can see them.
+
+        Args:
+            scope (dict): user_id/agent_id/run_id the entities were written with.
+            rows (list): Dicts with "name" and "embedding".
+        """
+        with self._lock:
+            entries = [
+                entry
+                for key, entry in self._entries.items()
+                if all((scope.get(name) or "") == value for name, value in key)
+            ]
+        for entry in entries:
+            with entry.lock:
+                entry.add(rows, self.max_entities)
+
+    def invalidate(self, filters):
+        """Drop every loaded entry that may contain entities matching `filters` (e.g. after delete_all)."""
+        with self._lock:
+            for key in list(self._entries):
+                if all(not filters.get(name) or filters[name] == value for name, value in key):
+                    del self._entries[key]
+
+    def _entry(self, filters):
+        key = tuple((name, filters[name]) for name in SCOPE_KEYS if filters.get(name))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _ScopeEntry()
+                if self.max_scopes and len(self._entries) > self.max_scopes:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+
+        with entry.lock:
+            now = time.monotonic()
+            reload = entry.loaded_at is None or (
+                self.reload_interval is not None and now - entry.loaded_at >= self.reload_interval
+            )
+            if reload or now - entry.refreshed_at >= self.refresh_interval:
+                started = time.perf_counter()
+                rows = list(self.loader(filters, 0 if reload else entry.max_created))
+                if reload:
+                    entry.clear()
+                    entry.loaded_at = now
+                entry.add(rows, self.max_entities)
+                entry.refreshed_at = now
+                logger.debug(
+                    f"{'Reloaded' if reload else 'Refreshed'} entity index for {dict(key)}: +{len(rows)} entities, "
+                    f"{len(entry.names)} total in {time.perf_counter() - started:.3f}s"
+                )
+        return entry
@@ -0,0 +1,99 @@
+try:
+    from neo4j import READ_ACCESS, WRITE_ACCESS, GraphDatabase
+except ImportError:
+    raise ImportError("The 'neo4j' library is required. Please install it using 'pip install neo4j'.")
+
+
+class Neo4jClient:
+    def __init__(
+        self,
+        url,
+        username,
+        password,
+        database=None,
+        max_connection_pool_size=100,
+        connection_acquisition_timeout=60.0,
+        max_connection_lifetime=3600,
+        fetch_size=1000,
+    ):
+        """
+        Thin wrapper over the official neo4j driver with a shared connection pool and managed transactions.
+
+        Args:
+            url (str): Bolt or neo4j:// URL. Use neo4j:// on clusters so reads are routed to followers.
+            username (str): Database user.
+            password (str): Database password.
+            database (str, optional): Database name. Defaults to the server's default database.
+            max_connection_pool_size (int): Maximum pooled connections per server.
+            connection_acquisition_timeout (float): Seconds to wait for a free pooled connection.
+            max_connection_lifetime (int): Seconds before a pooled connection is recycled.
+            fetch_size (int): Records pulled per batch when streaming results.
+        """
+        self.database = database
+        self.fetch_size = fetch_size
+        self.driver = GraphDatabase.driver(
+            url,
+            auth=(username, password),
+            max_connection_pool_size=max_connection_pool_size,
+            connection_acquisition_timeout=connection_acquisition_timeout,
+            max_connection_lifetime=max_connection_lifetime,
+        )
+        self.driver.verify_connectivity()
+
+    def query(self, cypher, params=None, read=False):
+        """
+        Run one query in a managed transaction, retried on transient errors (leader switches, deadlocks).
+
+        Args:
+            cypher (str): The query.
+            params (dict, optional): Query parameters, passed through as-is.
+            read (bool): Run as a read transaction, which a cluster may serve from a follower.
+
+        Returns:
+            list: One dict per record.
+        """
+        with self.driver.session(database=self.database) as session:
+            execute = session.execute_read if read else session.execute_write
+            return execute(self._run, cypher, params)
+
+    def transaction(self, work, read=False):
+        """
+        Run several queries in one managed transaction. `work(run)` is called with `run(cypher, params=None)`,
+        which returns one dict per record; if any query fails nothing is committed, and on transient errors the
+        whole of `work` is retried.
+
+        Returns:
+            The return value of `work`.
+        """
+
+        def unit(tx):
+            return work(lambda cypher, params=None: self._run(tx, cypher, params))
+
+        with self.driver.session(database=self.database) as session:
+            execute = session.execute_read if read else session.execute_write
+            return execute(unit)
+
+    def stream(self, cypher, params=None, read=True):
+        """
+        Run one query and yield records as dicts while they arrive, `fetch_size` at a time, instead of
+        materialising the whole result.
+
+        The transaction stays open until the generator is exhausted or closed.
+        """
+        with self.driver.session(
+            database=self.database,
+            default_access_mode=READ_ACCESS if read else WRITE_ACCESS,
+            fetch_size=self.fetch_size,
+        ) as session:
+            with session.begin_transaction() as tx:
+                for record in tx.run(cypher, params):
+                    yield record.data()
+                tx.commit()
+
+    def close(self):
+        """Close every pooled connection."""
+        self.driver.close()
+
+    @staticmethod
+    def _run(tx, cypher, params):
+        return [record.data() for record in tx.run(cypher, params)]
@@ -0,0 +1,166 @@
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from mem0.graphs.entity_index import _STOP_WORDS, _TOKEN
+
+
+def tokenize(text):
+    """
+    Lowercase word tokens with possessives, punctuation and stop words removed and plural/third-person "s"
+    stripped. Entity and relationship names are stored snake_cased, so "alice_smith" and "Alice Smith's" both
+    become ["alice", "smith"], and "works_with" matches "work".
+    """
+    tokens = []
+    for token in _TOKEN.findall(str(text).lower().replace("'s", "")):
+        if token in _STOP_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _relation_tokens(candidate):
+    return tokenize(f"{candidate['source']} {candidate['relatationship']} {candidate['destination']}")
+
+
+class GraphRerankerBase(ABC):
+    """
+    Orders graph search candidates for a query.
+
+    Candidates are the relation dicts returned by MemoryGraph._search_graph_db: "source", "relatationship",
+    "destination", "similarity" (best cosine similarity of an endpoint to a query entity) and "created"
+    (ms since epoch, may be None).
+    """
+
+    @abstractmethod
+    def score(self, query, candidates):
+        """
+        Score every candidate for the query.
+
+        Returns:
+            np.ndarray: One score per candidate, higher is better.
+        """
+        pass
+
+    def rerank(self, query, candidates, limit, min_score=None):
+        """
+        Return the best `limit` candidates as {"source", "relationship", "target", "score"}, best first, dropping
+        any scored below `min_score`.
+        """
+        if not candidates or limit <= 0:
+            return []
+
+        scores = np.asarray(self.score(query, candidates), dtype=np.float64)
+        k = min(limit, len(candidates))
+        order = np.argpartition(-scores, k - 1)[:k]
+        order = order[np.argsort(-scores[order], kind="stable")]
+
+        results = []
+        for position in order:
+            if min_score is not None and scores[position] < min_score:
+                break
+            candidate = candidates[position]
+            results.append(
+                {
+                    "source": candidate["source"],
+                    "relationship": candidate["relatationship"],
+                    "target": candidate["destination"],
+                    "score": round(float(scores[position]), 4),
+                }
+            )
+        return results
+
+
+class FusionReranker(GraphRerankerBase):
+    def __init__(
+        self,
+        similarity_weight=0.5,
+        lexical_weight=0.5,
+        recency_weight=0.0,
+        recency_half_life_days=30.0,
+        k1=1.2,
+        b=0.75,
+    ):
+        """
+        Weighted sum of the similarity Neo4j already computed, BM25 overlap between the query and the relation's
+        words, and (optionally) relation recency. Each signal is in [0, 1] and the weights are normalised, so the
+        fused score is too.
+
+        The lexical term is BM25 with idf taken over the candidate set, computed as one term-frequency matrix
+        over the query's terms instead of building a BM25 index per query.
+
+        Args:
+            similarity_weight (float): Weight of the endpoint-to-query-entity cosine similarity.
+            lexical_weight (float): Weight of the BM25 score, relative to a full match and capped at 1.
+            recency_weight (float): Weight of 0.5 ^ (age_days / recency_half_life_days).
+            recency_half_life_days (float): Relation age in days at which recency halves.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 length normalisation.
+        """
+        total = similarity_weight + lexical_weight + recency_weight
+        if total <= 0:
+            raise ValueError("At least one reranker weight must be positive")
+        self.weights = np.array([similarity_weight, lexical_weight, recency_weight]) / total
+        self.recency_half_life_days = recency_half_life_days
+        self.k1 = k1
+        self.b = b
+
+    def score(self, query, candidates):
+        signals = np.zeros((3, len(candidates)))
+        signals[0] = [candidate.get("similarity") or 0.0 for candidate in candidates]
+        if self.weights[1]:
+            signals[1] = self._lexical(tokenize(query), candidates)
+        if self.weights[2]:
+            signals[2] = self._recency(candidates)
+        return self.weights @ signals
+
+    def _lexical(self, query_terms, candidates):
+        terms = list(dict.fromkeys(query_terms))
+        if not terms:
+            return np.zeros(len(candidates))
+
+        column = {term: position for position, term in enumerate(terms)}
+        frequencies = np.zeros((len(candidates), len(terms)))
+        lengths = np.empty(len(candidates))
+        for row, candidate in enumerate(candidates):
+            tokens = _relation_tokens(candidate)
+            lengths[row] = len(tokens)
+            for token in tokens:
+                position = column.get(token)
+                if position is not None:
+                    frequencies[row, position] += 1
+
+        document_frequency = np.count_nonzero(frequencies, axis=0)
+        idf = np.log((len(candidates) - document_frequency + 0.5) / (document_frequency + 0.5) + 1.0)
+        length_norm = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1.0))
+        bm25 = (frequencies * (self.k1 + 1) / (frequencies + length_norm[:, None])) @ idf
+        # A candidate of average length containing every query term once scores idf.sum().
+        return np.clip(bm25 / idf.sum(), 0.0, 1.0)
+
+    def _recency(self, candidates):
+        now_ms = time.time() * 1000
+        ages = np.array([now_ms - (candidate.get("created") or 0) for candidate in candidates])
+        return np.power(0.5, np.maximum(ages, 0) / 86400000.0 / self.recency_half_life_days)
+
+
+class BM25Reranker(GraphRerankerBase):
+    def __init__(self):
+        """
+        BM25 over the candidate triples only, ignoring similarity; the ranking graph search used before scores
+        were fused.
+        """
+        try:
+            from rank_bm25 import BM25Okapi
+        except ImportError:
+            raise ImportError("rank_bm25 is not installed. Please install it using 'pip install rank-bm25'")
+        self._bm25 = BM25Okapi
+
+    def score(self, query, candidates):
+        corpus = [_relation_tokens(candidate) for candidate in candidates]
+        if not any(corpus):
+            return np.zeros(len(candidates))
+        return self._bm25(corpus).get_scores(tokenize(query))
+
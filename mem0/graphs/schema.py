@@ -0,0 +1,218 @@
+"""
+Canonical Neo4j schema for graph memory.
+
+Every entity is a single `:Entity` node keyed by (name, user_id, agent_id, run_id), with its category in the
+`type` property instead of a per-type label. Scope ids that are not set are stored as "" because MERGE cannot
+match on null. Because labels are fixed, every write is one of a small set of parameterised queries that Neo4j
+plans once and caches.
+
+The helpers take a `query(cypher, params=None) -> list[dict]` callable, so they work with MemoryGraph's
+connection as well as a bare driver (see memory_tools/migrateGraph.py).
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+ENTITY_LABEL = "Entity"
+
+SCOPE_KEYS = ("user_id", "agent_id", "run_id")
+
+ENTITY_KEY_CONSTRAINT = """
+CREATE CONSTRAINT entity_key IF NOT EXISTS
+FOR (n:Entity) REQUIRE (n.name, n.user_id, n.agent_id, n.run_id) IS UNIQUE
+"""
+
+# Used instead of the constraint while the graph still holds duplicate keys.
+ENTITY_KEY_INDEX = """
+CREATE INDEX entity_key IF NOT EXISTS FOR (n:Entity) ON (n.name, n.user_id, n.agent_id, n.run_id)
+"""
+
+ENTITY_INDEXES = [
+    "CREATE INDEX entity_name IF NOT EXISTS FOR (n:Entity) ON (n.name)",
+    "CREATE INDEX entity_user_id IF NOT EXISTS FOR (n:Entity) ON (n.user_id)",
+    "CREATE INDEX entity_agent_id IF NOT EXISTS FOR (n:Entity) ON (n.agent_id)",
+    "CREATE INDEX entity_run_id IF NOT EXISTS FOR (n:Entity) ON (n.run_id)",
+    "CREATE INDEX entity_type IF NOT EXISTS FOR (n:Entity) ON (n.type)",
+]
+
+MERGE_ENTITIES = """
+UNWIND $rows AS row
+MERGE (n:Entity {name: row.name, user_id: $user_id, agent_id: $agent_id, run_id: $run_id})
+ON CREATE SET
+    n.created = timestamp(),
+    n.embedding = row.embedding,
+    n.type = row.type
+RETURN row.name AS name, elementId(n) AS node_id
+"""
+
+# Relations carry `created`, `last_seen` (refreshed whenever extraction produces the relation again) and
+# `mentions` (how many times it has been extracted); the pruner in MemoryGraph expires relations by them.
+# `uid` is a creation-time-prefixed id that is never reused, so relations can be paged in creation order.
+# Neo4j only indexes relationship properties per relationship type, and types here come from the LLM, so the
+# key has no index behind it.
+RELATION_UID = "right('000000000000000' + toString(timestamp()), 15) + '-' + randomUUID()"
+
+# Relations written before `uid` existed get a key derived from `created` that sorts the same way.
+RELATION_ID = (
+    "coalesce(r.uid, right('000000000000000' + toString(coalesce(r.created, 0)), 15) + '-' + elementId(r))"
+)
+
+MERGE_RELATIONSHIPS_APOC = """
+UNWIND $rows AS row
+MATCH (source:Entity) WHERE elementId(source) = row.source_id
+MATCH (destination:Entity) WHERE elementId(destination) = row.destination_id
+CALL apoc.merge.relationship(
+    source, row.relationship, {}, {created: timestamp(), mentions: 0, uid: """ + RELATION_UID + """}, destination, {}
+) YIELD rel AS r
+SET r.last_seen = timestamp(), r.mentions = coalesce(r.mentions, 1) + 1
+RETURN row.index AS index, source.name AS source, type(r) AS relationship, destination.name AS destination
+"""
+
+# Relationship types cannot be parameters in plain Cypher; this template is rendered once per type.
+MERGE_RELATIONSHIPS = """
+UNWIND $rows AS row
+MATCH (source:Entity) WHERE elementId(source) = row.source_id
+MATCH (destination:Entity) WHERE elementId(destination) = row.destination_id
+MERGE (source)-[r:{relationship}]->(destination)
+ON CREATE SET r.created = timestamp(), r.mentions = 0, r.uid = """ + RELATION_UID + """
+SET r.last_seen = timestamp(), r.mentions = coalesce(r.mentions, 1) + 1
+RETURN row.index AS index, source.name AS source, type(r) AS relationship, destination.name AS destination
+"""
+
+_LABEL_EMBEDDED_NODES = """
+MATCH (n)
+WHERE n.embedding IS NOT NULL AND NOT n:Entity
+WITH n LIMIT $batch_size
+SET n:Entity
+RETURN count(n) AS migrated
+"""
+
+_MOVE_LABEL_TO_TYPE = """
+MATCH (n:Entity:{label})
+WITH n LIMIT $batch_size
+SET n.type = coalesce(n.type, $label)
+REMOVE n:{label}
+RETURN count(n) AS migrated
+"""
+
+_FILL_SCOPE = """
+MATCH (n:Entity)
+WHERE n.user_id IS NULL OR n.agent_id IS NULL OR n.run_id IS NULL
+WITH n LIMIT $batch_size
+SET n.user_id = coalesce(n.user_id, ''),
+    n.agent_id = coalesce(n.agent_id, ''),
+    n.run_id = coalesce(n.run_id, '')
+RETURN count(n) AS migrated
+"""
+
+_COUNT_DUPLICATE_KEYS = """
+MATCH (n:Entity)
+WITH n.name AS name, n.user_id AS user_id, n.agent_id AS agent_id, n.run_id AS run_id, count(*) AS nodes
+WHERE nodes > 1
+RETURN count(*) AS keys, coalesce(sum(nodes), 0) AS nodes
+"""
+
+
+def quote_name(name):
+    """Backtick-quote a label or relationship type for interpolation into Cypher."""
+    return "`" + name.replace("`", "") + "`"
+
+
+def scope_params(filters):
+    """user_id/agent_id/run_id as MERGE keys; unset ids become ""."""
+    return {key: filters.get(key) or "" for key in SCOPE_KEYS}
+
+
+def legacy_labels(query):
+    """Labels other than :Entity that are still set on entity nodes."""
+    labels = [record["label"] for record in query("CALL db.labels() YIELD label RETURN label")]
+    legacy = []
+    for label in labels:
+        if label == ENTITY_LABEL:
+            continue
+        if query(f"MATCH (n:Entity:{quote_name(label)}) RETURN n LIMIT 1"):
+            legacy.append(label)
+    return legacy
+
+
+def migrate_graph(query, batch_size=10000, dry_run=False):
+    """
+    Bring an existing graph onto the canonical schema, in batches so large graphs don't exhaust
+    transaction memory. Safe to run repeatedly.
+
+    1. Label every embedded node :Entity.
+    2. Move per-type labels (e.g. :person) into the `type` property.
+    3. Store unset user_id/agent_id/run_id as "".
+
+    Args:
+        query (callable): `query(cypher, params=None) -> list[dict]`.
+        batch_size (int): Nodes updated per transaction.
+        dry_run (bool): Only count what would change.
+
+    Returns:
+        dict: Per-step node counts, plus the number of keys (and nodes) still duplicated after migration.
+    """
+    if dry_run:
+        unlabelled = query("MATCH (n) WHERE n.embedding IS NOT NULL AND NOT n:Entity RETURN count(n) AS nodes")
+        retyped = {}
+        for label in legacy_labels(query):
+            retyped[label] = query(f"MATCH (n:Entity:{quote_name(label)}) RETURN count(n) AS nodes")[0]["nodes"]
+        unscoped = query(
+            "MATCH (n:Entity) WHERE n.user_id IS NULL OR n.agent_id IS NULL OR n.run_id IS NULL "
+            "RETURN count(n) AS nodes"
+        )
+        return {
+            "labelled": unlabelled[0]["nodes"],
+            "retyped": retyped,
+            "scoped": unscoped[0]["nodes"],
+            "duplicates": query(_COUNT_DUPLICATE_KEYS)[0],
+        }
+
+    report = {"labelled": _run_batched(query, _LABEL_EMBEDDED_NODES, {}, batch_size), "retyped": {}}
+    for label in legacy_labels(query):
+        report["retyped"][label] = _run_batched(
+            query, _MOVE_LABEL_TO_TYPE.format(label=quote_name(label)), {"label": label}, batch_size
+        )
+    report["scoped"] = _run_batched(query, _FILL_SCOPE, {}, batch_size)
+    report["duplicates"] = query(_COUNT_DUPLICATE_KEYS)[0]
+
+    if report["labelled"] or report["retyped"] or report["scoped"]:
+        logger.info(f"Migrated graph to the canonical schema: {report}")
+    return report
+
+
+def ensure_schema(query):
+    """
+    Create the entity key constraint and lookup indexes if they don't exist.
+
+    The key is a uniqueness constraint when the data allows it; while duplicate keys remain (e.g. the same
+    name under two legacy labels) a plain composite index is created instead.
+
+    Returns:
+        bool: True if the uniqueness constraint is in place.
+    """
+    for statement in ENTITY_INDEXES:
+        query(statement)
+
+    existing = query("SHOW INDEXES YIELD name, owningConstraint WHERE name = 'entity_key' RETURN owningConstraint")
+    if existing:
+        return existing[0]["owningConstraint"] is not None
+
+    try:
+        query(ENTITY_KEY_CONSTRAINT)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not create the entity key constraint, using a composite index instead: {e}")
+        query(ENTITY_KEY_INDEX)
+        return False
+
+
+def _run_batched(query, cypher, params, batch_size):
+    total = 0
+    while True:
+        result = query(cypher, params={**params, "batch_size": batch_size})
+        migrated = result[0]["migrated"] if result else 0
+        total += migrated
+        if migrated < batch_size:
+            return total
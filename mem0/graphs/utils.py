@@ -54,6 +54,12 @@ Strive to construct a coherent and easily understandable knowledge graph by esht
 
 Adhere strictly to these guidelines to ensure high-quality knowledge graph extraction."""
 
+EXTRACT_GRAPH_PROMPT = EXTRACT_RELATIONS_PROMPT.replace(
+    "2. Establish relationships among the entities provided.",
+    "2. Identify every entity in the text along with its type (person, place, organization, object, concept, "
+    "event, ...), then establish relationships among those entities.",
+)
+
 DELETE_RELATIONS_SYSTEM_PROMPT = """
 You are a graph memory manager specializing in identifying, managing, and optimizing relationships within graph-based memories. Your primary task is to analyze a list of existing relationships and determine which ones should be deleted based on the new information provided.
 Input:
@@ -0,0 +1,311 @@
+import base64
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling the background writer to stop.
+_STOP = object()
+
+
+class HistoryStoreBase(ABC):
+    """
+    Base class for memory history stores.
+
+    Subclasses persist rows through `_write_rows`. When `batch_writes` is enabled, rows passed to
+    `add_history`/`add_history_batch` are queued and committed in groups from a background thread.
+    """
+
+    # Attempts per batch before its rows are kept for a later retry, and the cap on rows kept that way.
+    _WRITE_RETRIES = 5
+    _MAX_SPILLED_ROWS = 100000
+    # Seconds between retries of kept rows while no new rows arrive.
+    _RETRY_INTERVAL = 1.0
+
+    def __init__(self, batch_writes=False, batch_size=500, flush_interval=0.05):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = None
+        self._writer = None
+        self._spilled = []
+        self._stats_lock = threading.Lock()
+        self._stats = {"written_rows": 0, "retried_writes": 0, "failed_writes": 0, "dropped_rows": 0}
+        if batch_writes:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._writer_loop, name="mem0-history-writer", daemon=True)
+            self._writer.start()
+
+    @abstractmethod
+    def _write_rows(self, rows):
+        """
+        Persist history rows in a single transaction.
+
+        Args:
+            rows (list): Tuples of (id, memory_id, old_memory, new_memory, event, created_at, updated_at,
+                is_deleted, user_id, agent_id, run_id, recorded_at). recorded_at is None: the store assigns it
+                inside the write transaction.
+        """
+        pass
+
+    @abstractmethod
+    def get_history(self, memory_id):
+        """
+        Get the history of changes for a memory, oldest first.
+
+        Args:
+            memory_id (str): ID of the memory.
+
+        Returns:
+            list: History rows as dicts.
+        """
+        pass
+
+    @abstractmethod
+    def query_history(self, filters=None, since=None, until=None, events=None, cursor=None, limit=100):
+        """
+        Page through history rows, oldest first.
+
+        Rows are ordered so that a row can never become visible behind a cursor that has already passed its
+        position: following `next_cursor` (or polling with the last cursor) sees every committed row exactly
+        once. Stores with a single writer order by a recorded_at assigned under the write lock; stores with
+        concurrent writers order by transaction and withhold rows of transactions that may still commit.
+
+        Args:
+            filters (dict, optional): Exact matches on user_id, agent_id and/or run_id.
+            since (str | datetime, optional): Only rows recorded at or after this time.
+            until (str | datetime, optional): Only rows recorded before this time.
+            events (list, optional): Only these events (ADD, UPDATE, DELETE).
+            cursor (str, optional): `next_cursor` from the previous page.
+            limit (int, optional): Page size. Defaults to 100.
+
+        Returns:
+            dict: {"results": [...], "next_cursor": str or None}.
+        """
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Drop all history."""
+        pass
+
+    def add_history(
+        self,
+        memory_id,
+        old_memory,
+        new_memory,
+        event,
+        created_at=None,
+        updated_at=None,
+        is_deleted=0,
+        user_id=None,
+        agent_id=None,
+        run_id=None,
+    ):
+        self.add_history_batch(
+            [
+                {
+                    "memory_id": memory_id,
+                    "old_memory": old_memory,
+                    "new_memory": new_memory,
+                    "event": event,
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                    "is_deleted": is_deleted,
+                    "user_id": user_id,
+                    "agent_id": agent_id,
+                    "run_id": run_id,
+                }
+            ]
+        )
+
+    def add_history_batch(self, records):
+        """
+        Insert several history rows in a single transaction.
+
+        Each record is a dict with the same keys as the `add_history` arguments. With `batch_writes`
+        enabled the rows are handed to the background writer and committed with other pending rows.
+        """
+        if not records:
+            return
+        rows = [
+            (
+                str(uuid.uuid4()),
+                record["memory_id"],
+                record.get("old_memory"),
+                record.get("new_memory"),
+                record["event"],
+                record.get("created_at"),
+                record.get("updated_at"),
+                record.get("is_deleted", 0),
+                record.get("user_id"),
+                record.get("agent_id"),
+                record.get("run_id"),
+                None,
+            )
+            for record in records
+        ]
+        if self._queue is not None:
+            for row in rows:
+                self._queue.put(row)
+            return
+        self._write_rows(rows)
+
+    def _writer_loop(self):
+        while True:
+            try:
+                # Rows that failed to commit are retried even when nothing new arrives.
+                item = self._queue.get(timeout=self._RETRY_INTERVAL if self._spilled else None)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            rows = [] if item is None or stop else [item]
+            received = 0 if item is None else 1
+            deadline = time.monotonic() + self.flush_interval
+            while rows and not stop and len(rows) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                received += 1
+                if item is _STOP:
+                    stop = True
+                    break
+                rows.append(item)
+
+            batch, self._spilled = self._spilled + rows, []
+            try:
+                if batch:
+                    self._write_batch(batch)
+            finally:
+                for _ in range(received):
+                    self._queue.task_done()
+            if stop:
+                if self._spilled:
+                    logger.error(f"Dropping {len(self._spilled)} uncommitted history rows on shutdown")
+                    self._count("dropped_rows", len(self._spilled))
+                    self._spilled = []
+                return
+
+    def _write_batch(self, rows):
+        """
+        Commit rows from the background writer, retrying with backoff. Rows that still fail are kept and retried
+        with the next batch, up to _MAX_SPILLED_ROWS, so a database outage delays the audit log instead of
+        silently losing it.
+        """
+        for attempt in range(self._WRITE_RETRIES + 1):
+            try:
+                self._write_rows(rows)
+                self._count("written_rows", len(rows))
+                return
+            except Exception as e:
+                if attempt == self._WRITE_RETRIES:
+                    logger.error(f"Failed to write {len(rows)} history rows, keeping them for retry: {e}")
+                    self._count("failed_writes")
+                    break
+                self._count("retried_writes")
+                time.sleep(min(0.05 * 2**attempt, 2.0) * (0.5 + random.random()))
+
+        overflow = len(rows) - self._MAX_SPILLED_ROWS
+        if overflow > 0:
+            logger.error(f"Dropping {overflow} oldest uncommitted history rows; the retry buffer is full")
+            self._count("dropped_rows", overflow)
+            rows = rows[overflow:]
+        self._spilled = rows
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def metrics(self):
+        """
+        Background writer counters since startup.
+
+        Returns:
+            dict: written_rows, retried_writes (attempts that were retried), failed_writes (batches that
+                exhausted their retries), pending_rows (uncommitted rows awaiting retry) and dropped_rows.
+        """
+        with self._stats_lock:
+            return {**self._stats, "pending_rows": len(self._spilled)}
+
+    @staticmethod
+    def to_timestamp(value):
+        """
+        Normalise a datetime or ISO string to a UTC ISO string with microseconds, so that
+        lexical and chronological order agree.
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+    @classmethod
+    def _commit_timestamp(cls, latest):
+        """
+        recorded_at for a transaction holding the write lock: now, but strictly after `latest` (the highest
+        recorded_at already stored), so that commit order and cursor order agree even if the clock steps back.
+        """
+        now = datetime.now(timezone.utc)
+        if latest is not None:
+            if isinstance(latest, str):
+                latest = datetime.fromisoformat(latest)
+            now = max(now, latest + timedelta(microseconds=1))
+        return cls.to_timestamp(now)
+
+    @staticmethod
+    def encode_cursor(recorded_at, row_id):
+        payload = json.dumps([recorded_at, row_id]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            recorded_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception:
+            raise ValueError(f"Invalid history cursor: {cursor}")
+        return recorded_at, row_id
+
+    def flush(self):
+        """
+        Block until the background writer has attempted every queued history row.
+
+        Returns:
+            int: Rows that could not be committed and are awaiting retry; 0 when everything is written.
+        """
+        if self._queue is None:
+            return 0
+        self._queue.join()
+        pending = len(self._spilled)
+        if pending:
+            logger.warning(f"{pending} history rows are not committed yet and will be retried")
+        return pending
+
+    def compact(self, vacuum=True):
+        """
+        Apply the store's retention policy and reclaim space.
+
+        Returns:
+            int: Number of pruned history rows.
+        """
+        return 0
+
+    def close(self):
+        """Flush pending rows and stop the background writer."""
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+            self._queue = None
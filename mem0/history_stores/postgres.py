@@ -0,0 +1,286 @@
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+try:
+    from psycopg2.extras import execute_values
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:
+    raise ImportError("The 'psycopg2' library is required. Please install it using 'pip install psycopg2'.")
+
+from mem0.history_stores.base import HistoryStoreBase
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresHistoryStore(HistoryStoreBase):
+    def __init__(
+        self,
+        dsn=None,
+        dbname="postgres",
+        user=None,
+        password=None,
+        host=None,
+        port=None,
+        table_name="mem0_history",
+        min_connections=1,
+        max_connections=10,
+        pool_timeout=30.0,
+        batch_writes=False,
+        batch_size=500,
+        flush_interval=0.05,
+        retention_days=None,
+    ):
+        """
+        Postgres-backed history store shared by every worker and host pointing at the same database.
+
+        Writers never wait on each other: each row records the id of the transaction that wrote it, and
+        `query_history` pages in (txid, id) order, withholding rows newer than the oldest transaction still
+        running in the database. A long-running transaction anywhere in the database therefore delays when new
+        history becomes readable, but no row is ever skipped or returned twice.
+
+        Args:
+            dsn (str, optional): libpq connection string; overrides the individual connection fields.
+            dbname (str): Database name.
+            user (str): Database user.
+            password (str): Database password.
+            host (str): Database host.
+            port (int): Database port.
+            table_name (str): History table name.
+            min_connections (int): Minimum pooled connections.
+            max_connections (int): Maximum pooled connections.
+            pool_timeout (float, optional): Seconds to wait for a free pooled connection before raising
+                TimeoutError. Waits forever if None.
+            batch_writes (bool): Queue history rows and commit them in groups from a background thread.
+            batch_size (int): Maximum rows per group commit.
+            flush_interval (float): Seconds the writer waits to fill a group before committing it.
+            retention_days (int, optional): Prune history rows older than this many days on `compact`.
+        """
+        self.table_name = table_name
+        self.retention_days = retention_days
+        self.pool_timeout = pool_timeout
+        # The pool raises PoolError instead of blocking once every connection is out.
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+        if dsn:
+            self.pool = ThreadedConnectionPool(min_connections, max_connections, dsn=dsn)
+        else:
+            self.pool = ThreadedConnectionPool(
+                min_connections,
+                max_connections,
+                dbname=dbname,
+                user=user,
+                password=password,
+                host=host,
+                port=port,
+            )
+
+        self._create_history_table()
+        super().__init__(batch_writes=batch_writes, batch_size=batch_size, flush_interval=flush_interval)
+
+    @contextmanager
+    def _cursor(self):
+        """Borrow a pooled connection, waiting up to `pool_timeout` for one, and run one transaction on it."""
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            raise TimeoutError(
+                f"No pooled history connection became free within {self.pool_timeout}s; "
+                "raise max_connections or pool_timeout"
+            )
+        try:
+            connection = self.pool.getconn()
+            try:
+                with connection:
+                    with connection.cursor() as cursor:
+                        yield cursor
+            finally:
+                self.pool.putconn(connection)
+        finally:
+            self._slots.release()
+
+    def _create_history_table(self):
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    id TEXT PRIMARY KEY,
+                    memory_id TEXT,
+                    old_memory TEXT,
+                    new_memory TEXT,
+                    event TEXT,
+                    created_at TIMESTAMPTZ,
+                    updated_at TIMESTAMPTZ,
+                    is_deleted INTEGER,
+                    user_id TEXT,
+                    agent_id TEXT,
+                    run_id TEXT,
+                    recorded_at TIMESTAMPTZ DEFAULT now(),
+                    txid BIGINT DEFAULT txid_current()
+                )
+            """
+            )
+            # Rows that predate txid all get the id of the migrating transaction, so they page before new ones.
+            for column, column_type in (
+                ("user_id", "TEXT"),
+                ("agent_id", "TEXT"),
+                ("run_id", "TEXT"),
+                ("recorded_at", "TIMESTAMPTZ DEFAULT now()"),
+                ("txid", "BIGINT DEFAULT txid_current()"),
+            ):
+                cur.execute(f"ALTER TABLE {self.table_name} ADD COLUMN IF NOT EXISTS {column} {column_type}")
+            cur.execute(
+                f"UPDATE {self.table_name} SET recorded_at = COALESCE(updated_at, created_at, 'epoch') "
+                "WHERE recorded_at IS NULL"
+            )
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table_name}_memory_id_idx ON {self.table_name} (memory_id, updated_at)"
+            )
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {self.table_name}_created_at_idx ON {self.table_name} (created_at)")
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {self.table_name}_updated_at_idx ON {self.table_name} (updated_at)")
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table_name}_recorded_at_idx ON {self.table_name} (recorded_at, id)"
+            )
+            # query_history seeks on a scope and walks (txid, id) in key order.
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {self.table_name}_txid_idx ON {self.table_name} (txid, id)")
+            for column in ("user_id", "agent_id", "run_id"):
+                cur.execute(f"DROP INDEX IF EXISTS {self.table_name}_{column}_idx")
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table_name}_{column}_txid_idx "
+                    f"ON {self.table_name} ({column}, txid, id)"
+                )
+
+    def _write_rows(self, rows):
+        # recorded_at and txid come from column defaults: the transaction's start time and id.
+        with self._cursor() as cur:
+            execute_values(
+                cur,
+                f"""
+                INSERT INTO {self.table_name}
+                    (id, memory_id, old_memory, new_memory, event, created_at, updated_at, is_deleted,
+                     user_id, agent_id, run_id)
+                VALUES %s
+                """,
+                [row[:-1] for row in rows],
+                page_size=max(len(rows), 1),
+            )
+
+    def get_history(self, memory_id):
+        self.flush()
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT id, memory_id, old_memory, new_memory, event, created_at, updated_at
+                FROM {self.table_name}
+                WHERE memory_id = %s
+                ORDER BY updated_at ASC NULLS FIRST
+            """,
+                (memory_id,),
+            )
+            rows = cur.fetchall()
+        return [
+            {
+                "id": row[0],
+                "memory_id": row[1],
+                "old_memory": row[2],
+                "new_memory": row[3],
+                "event": row[4],
+                "created_at": row[5].isoformat() if row[5] else None,
+                "updated_at": row[6].isoformat() if row[6] else None,
+            }
+            for row in rows
+        ]
+
+    def query_history(self, filters=None, since=None, until=None, events=None, cursor=None, limit=100):
+        self.flush()
+        conditions, params = [], []
+        for key in ("user_id", "agent_id", "run_id"):
+            if filters and filters.get(key) is not None:
+                conditions.append(f"{key} = %s")
+                params.append(filters[key])
+        if since is not None:
+            conditions.append("recorded_at >= %s")
+            params.append(self.to_timestamp(since))
+        if until is not None:
+            conditions.append("recorded_at < %s")
+            params.append(self.to_timestamp(until))
+        if events:
+            conditions.append("event = ANY(%s)")
+            params.append(list(events))
+        if cursor:
+            txid, row_id = self.decode_cursor(cursor)
+            if not isinstance(txid, int):
+                raise ValueError(f"Invalid history cursor: {cursor}")
+            conditions.append("(txid, id) > (%s, %s)")
+            params.extend((txid, row_id))
+        # Rows of transactions that may still be running are withheld; every transaction that could still
+        # commit has a txid at or above the horizon, so no row can later appear behind a returned cursor.
+        conditions.append("txid < txid_snapshot_xmin(txid_current_snapshot())")
+
+        where = f"WHERE {' AND '.join(conditions)}"
+        with self._cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT id, memory_id, old_memory, new_memory, event, created_at, updated_at,
+                       user_id, agent_id, run_id, recorded_at, txid
+                FROM {self.table_name}
+                {where}
+                ORDER BY txid ASC, id ASC
+                LIMIT %s
+            """,
+                (*params, limit + 1),
+            )
+            rows = cur.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1][11], rows[-1][0])
+        return {
+            "results": [
+                {
+                    "id": row[0],
+                    "memory_id": row[1],
+                    "old_memory": row[2],
+                    "new_memory": row[3],
+                    "event": row[4],
+                    "created_at": row[5].isoformat() if row[5] else None,
+                    "updated_at": row[6].isoformat() if row[6] else None,
+                    "user_id": row[7],
+                    "agent_id": row[8],
+                    "run_id": row[9],
+                    "recorded_at": self.to_timestamp(row[10]),
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    def compact(self, vacuum=True):
+        """
+        Apply the retention policy. Space is reclaimed by Postgres autovacuum.
+
+        Returns:
+            int: Number of pruned history rows.
+        """
+        self.flush()
+        if not self.retention_days:
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        with self._cursor() as cur:
+            cur.execute(
+                f"DELETE FROM {self.table_name} WHERE updated_at < %s OR (updated_at IS NULL AND created_at < %s)",
+                (cutoff, cutoff),
+            )
+            pruned = cur.rowcount
+        logger.info(f"Pruned {pruned} history rows older than {self.retention_days} days")
+        return pruned
+
+    def reset(self):
+        self.flush()
+        with self._cursor() as cur:
+            cur.execute(f"TRUNCATE TABLE {self.table_name}")
+
+    def close(self):
+        """Flush pending rows and close the connection pool."""
+        super().close()
+        self.pool.closeall()
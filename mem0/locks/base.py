@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Broadest first: an add scoped to (user_id, run_id) reads memories that an add scoped to user_id alone may
+# update, so both must take the same lock.
+_SCOPE_ORDER = ("user_id", "agent_id", "run_id")
+
+
+def scope_key(filters):
+    """
+    Lock key for a write scope: the broadest of user_id/agent_id/run_id that is set.
+
+    Adds for the same user always share a key (whatever agent or run they are scoped to), because each one reads
+    memories the others may update. Adds for different users never share a key.
+
+    Only the broadest id is keyed, so scopes that overlap on a narrower id are not serialised against each other:
+    an add scoped to agent_id alone and one scoped to user_id and the same agent_id take different keys, although
+    each reads memories the other may update. Deployments that write the same agent or run both with and without
+    a user_id should scope those writes consistently.
+    """
+    for name in _SCOPE_ORDER:
+        if filters.get(name):
+            return f"{name}={filters[name]}"
+    return "global"
+
+
+class _Stats:
+    def __init__(self):
+        self.acquisitions = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.held = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+
+    def snapshot(self):
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "timeouts": self.timeouts,
+            "waiting": self.waiting,
+            "held": self.held,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_mean": round(self.wait_seconds_total / self.acquisitions, 6) if self.acquisitions else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "hold_seconds_total": round(self.hold_seconds_total, 6),
+            "hold_seconds_max": round(self.hold_seconds_max, 6),
+        }
+
+
+class LockManagerBase(ABC):
+    """
+    Base class for scope-keyed lock managers.
+
+    `hold(namespace, filters)` serialises callers that share a namespace and scope key while callers for other
+    scopes proceed in parallel. Subclasses implement `_acquire`/`_release`; the base class keeps contention and
+    wait-time metrics per namespace (e.g. "vector", "graph").
+    """
+
+    def __init__(self, timeout=None):
+        """
+        Args:
+            timeout (float, optional): Seconds to wait for a lock before raising TimeoutError. Waits forever if None.
+        """
+        self.timeout = timeout
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def _acquire(self, key, timeout):
+        """
+        Block until `key` is held by the caller.
+
+        Args:
+            key (str): Lock key.
+            timeout (float, optional): Seconds to wait, or None to wait forever.
+
+        Returns:
+            tuple: (handle passed back to `_release`, whether the lock was already held by someone else).
+
+        Raises:
+            TimeoutError: If the lock could not be taken within `timeout`.
+        """
+        pass
+
+    @abstractmethod
+    def _release(self, key, handle):
+        """Release a lock taken with `_acquire`."""
+        pass
+
+    @contextmanager
+    def hold(self, namespace, filters):
+        """
+        Hold the lock for `namespace` and the scope in `filters` for the duration of the block.
+
+        Yields:
+            float: Seconds spent waiting for the lock.
+        """
+        key = f"{namespace}:{scope_key(filters)}"
+        with self._stats_lock:
+            stats = self._stats.setdefault(namespace, _Stats())
+            stats.waiting += 1
+
+        started = time.perf_counter()
+        try:
+            handle, contended = self._acquire(key, self.timeout)
+        except TimeoutError:
+            with self._stats_lock:
+                stats.waiting -= 1
+                stats.timeouts += 1
+            logger.warning(f"Timed out after {self.timeout}s waiting for lock {key}")
+            raise
+        except Exception:
+            with self._stats_lock:
+                stats.waiting -= 1
+            raise
+
+        acquired = time.perf_counter()
+        waited = acquired - started
+        with self._stats_lock:
+            stats.waiting -= 1
+            stats.held += 1
+            stats.acquisitions += 1
+            stats.contended += int(contended)
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+        if contended:
+            logger.debug(f"Waited {waited:.3f}s for lock {key}")
+
+        try:
+            yield waited
+        finally:
+            self._release(key, handle)
+            held = time.perf_counter() - acquired
+            with self._stats_lock:
+                stats.held -= 1
+                stats.hold_seconds_total += held
+                stats.hold_seconds_max = max(stats.hold_seconds_max, held)
+
+    def metrics(self):
+        """
+        Contention and wait-time counters since startup.
+
+        Returns:
+            dict: Per namespace, the number of acquisitions, how many found the lock taken (`contended`), timeouts,
+                callers currently waiting and holding, and wait/hold seconds (total, mean, max).
+        """
+        with self._stats_lock:
+            return {namespace: stats.snapshot() for namespace, stats in self._stats.items()}
+
+    def close(self):
+        """Release any resources held by the manager."""
+        pass
@@ -0,0 +1,45 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class LockConfig(BaseModel):
+    provider: str = Field(
+        description="Provider of the scope lock manager ('none', 'local', 'file', 'postgres')",
+        default="none",
+    )
+    config: Optional[Dict] = Field(description="Configuration for the specific lock manager", default=None)
+
+    _provider_configs: Dict[str, str] = {
+        "local": "LocalLockConfig",
+        "file": "FileLockConfig",
+        "postgres": "PostgresLockConfig",
+    }
+
+    @model_validator(mode="after")
+    def validate_and_create_config(self) -> "LockConfig":
+        provider = self.provider
+        config = self.config
+
+        if provider == "none":
+            return self
+
+        if provider not in self._provider_configs:
+            raise ValueError(f"Unsupported lock provider: {provider}")
+
+        module = __import__(
+            f"mem0.configs.locks.{provider}",
+            fromlist=[self._provider_configs[provider]],
+        )
+        config_class = getattr(module, self._provider_configs[provider])
+
+        if config is None:
+            config = {}
+
+        if not isinstance(config, dict):
+            if not isinstance(config, config_class):
+                raise ValueError(f"Invalid config type for provider {provider}")
+            return self
+
+        self.config = config_class(**config)
+        return self
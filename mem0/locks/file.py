@@ -0,0 +1,61 @@
+import hashlib
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    raise ImportError("The 'file' lock provider needs fcntl, which is only available on POSIX systems.")
+
+from mem0.locks.base import LockManagerBase
+
+
+class FileLockManager(LockManagerBase):
+    def __init__(self, lock_dir, timeout=None, poll_interval=0.01):
+        """
+        Per-key flock(2) locks, shared by every process on the host that uses the same `lock_dir` (e.g. several
+        uvicorn workers). Each key maps to one small file that is kept for reuse.
+
+        Args:
+            lock_dir (str): Directory holding the lock files. Created if missing.
+            timeout (float, optional): Seconds to wait for a lock before raising TimeoutError.
+            poll_interval (float): Seconds between attempts while waiting with a timeout.
+        """
+        super().__init__(timeout=timeout)
+        self.lock_dir = lock_dir
+        self.poll_interval = poll_interval
+        os.makedirs(lock_dir, exist_ok=True)
+
+    def _acquire(self, key, timeout):
+        path = os.path.join(self.lock_dir, hashlib.sha1(key.encode()).hexdigest() + ".lock")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if self._try_lock(fd):
+                return fd, False
+            if timeout is None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                return fd, True
+
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                if self._try_lock(fd):
+                    return fd, True
+            raise TimeoutError(f"Could not acquire lock {key} within {timeout}s")
+        except BaseException:
+            os.close(fd)
+            raise
+
+    def _release(self, key, fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _try_lock(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
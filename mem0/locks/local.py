@@ -0,0 +1,50 @@
+import threading
+
+from mem0.locks.base import LockManagerBase
+
+
+class _Entry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.refs = 0
+
+
+class LocalLockManager(LockManagerBase):
+    def __init__(self, timeout=None):
+        """
+        Per-key locks shared by the threads of one process. Entries are dropped when no thread holds or waits
+        for them, so memory stays proportional to the number of scopes being written at once.
+
+        Use the "file" or "postgres" provider when several worker processes write the same scopes.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a lock before raising TimeoutError.
+        """
+        super().__init__(timeout=timeout)
+        self._entries = {}
+        self._mutex = threading.Lock()
+
+    def _acquire(self, key, timeout):
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            entry.refs += 1
+
+        if entry.lock.acquire(blocking=False):
+            return entry, False
+        if entry.lock.acquire(timeout=-1 if timeout is None else timeout):
+            return entry, True
+
+        self._drop(key, entry)
+        raise TimeoutError(f"Could not acquire lock {key} within {timeout}s")
+
+    def _release(self, key, entry):
+        entry.lock.release()
+        self._drop(key, entry)
+
+    def _drop(self, key, entry):
+        with self._mutex:
+            entry.refs -= 1
+            if entry.refs == 0:
+                del self._entries[key]
@@ -0,0 +1,115 @@
+import hashlib
+import threading
+import time
+
+try:
+    from psycopg2 import errors
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:
+    raise ImportError("The 'psycopg2' library is required. Please install it using 'pip install psycopg2'.")
+
+from mem0.locks.base import LockManagerBase
+
+
+def _advisory_key(key):
+    """Map a lock key onto the signed 64-bit id space of pg_advisory_lock."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class PostgresLockManager(LockManagerBase):
+    def __init__(
+        self,
+        dsn=None,
+        dbname="postgres",
+        user=None,
+        password=None,
+        host=None,
+        port=None,
+        min_connections=1,
+        max_connections=20,
+        timeout=None,
+    ):
+        """
+        Session-level Postgres advisory locks, shared by every worker and host connected to the same database.
+
+        A held lock occupies one pooled connection until it is released, so `max_connections` bounds the number
+        of scopes that can be written at once by this process. Further callers wait for a free connection, and
+        that wait counts against `timeout`.
+
+        Args:
+            dsn (str, optional): libpq connection string; overrides the individual connection fields.
+            dbname (str): Database name.
+            user (str): Database user.
+            password (str): Database password.
+            host (str): Database host.
+            port (int): Database port.
+            min_connections (int): Minimum pooled connections.
+            max_connections (int): Maximum pooled connections.
+            timeout (float, optional): Seconds to wait for a lock before raising TimeoutError.
+        """
+        super().__init__(timeout=timeout)
+        if dsn:
+            self.pool = ThreadedConnectionPool(min_connections, max_connections, dsn=dsn)
+        else:
+            self.pool = ThreadedConnectionPool(
+                min_connections,
+                max_connections,
+                dbname=dbname,
+                user=user,
+                password=password,
+                host=host,
+                port=port,
+            )
+        # The pool raises PoolError instead of blocking once every connection is out.
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _acquire(self, key, timeout):
+        lock_id = _advisory_key(key)
+        started = time.monotonic()
+        contended = not self._slots.acquire(blocking=False)
+        if contended and not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No connection free for lock {key} within {timeout}s")
+        try:
+            connection = self.pool.getconn()
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (lock_id,))
+                if cur.fetchone()[0]:
+                    return connection, contended
+
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Could not acquire lock {key} within {timeout}s")
+                # lock_timeout also bounds advisory lock waits; 0 disables it.
+                lock_timeout = f"{max(int(remaining * 1000), 1)}ms" if remaining is not None else "0"
+                cur.execute("SELECT set_config('lock_timeout', %s, false)", (lock_timeout,))
+                try:
+                    cur.execute("SELECT pg_advisory_lock(%s)", (lock_id,))
+                except errors.LockNotAvailable:
+                    raise TimeoutError(f"Could not acquire lock {key} within {timeout}s")
+                finally:
+                    cur.execute("RESET lock_timeout")
+                return connection, True
+        except BaseException:
+            self._release_connection(connection)
+            raise
+
+    def _release(self, key, connection):
+        try:
+            with connection.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (_advisory_key(key),))
+        finally:
+            self._release_connection(connection)
+
+    def _release_connection(self, connection):
+        try:
+            self.pool.putconn(connection)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        self.pool.closeall()
@@ -0,0 +1,135 @@
+import logging
+
+from mem0.graphs.embedded_store import EmbeddedGraphStore
+from mem0.memory.graph_memory import MemoryGraph
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddedMemoryGraph(MemoryGraph):
+    """
+    MemoryGraph backed by an in-process EmbeddedGraphStore instead of Neo4j.
+
+    Extraction, contradiction handling, reranking and locking are inherited unchanged; only the storage
+    primitives are replaced. Suited to single-node deployments and to benchmarks that should not depend on a
+    database server. The store is owned by one process: workers sharing a path would overwrite each other.
+    """
+
+    def _connect(self):
+        graph_config = self.config.graph_store.config
+        self.graph = EmbeddedGraphStore(
+            graph_config.path, snapshot_every=graph_config.snapshot_every, fsync=graph_config.fsync
+        )
+
+    def delete_all(self, filters, batch_size=1000):
+        """
+        Delete all nodes (and relationships) matching user_id/agent_id/run_id. Returns the number of deleted
+        nodes; batch_size is accepted for compatibility and ignored.
+        """
+        if not any(key in filters for key in ("user_id", "agent_id", "run_id")):
+            raise ValueError(
+                "Refusing to delete all nodes in graph without any filter. Provide user_id/agent_id/run_id."
+            )
+
+        total_deleted = self.graph.delete_scope(filters)
+        self.entity_index.invalidate(filters)
+        logger.info(f"Deleted {total_deleted} graph nodes")
+        return total_deleted
+
+    def get_relations(self, filters, cursor=None, limit=100):
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        try:
+            after = int(cursor) if cursor is not None else -1
+        except ValueError:
+            raise ValueError(f"Invalid relation cursor: {cursor}")
+
+        results = self.graph.relations(filters, limit + 1, after=after)
+        return self._relations_page(results, limit)
+
+    def iter_relations(self, filters, batch_size=1000, cursor=None):
+        # Edge ids are positions in the store's edge arrays, so each page starts where the previous one ended.
+        while True:
+            page = self.get_relations(filters, cursor=cursor, limit=batch_size)
+            if page["results"]:
+                yield page["results"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    def graph_stats(self):
+        return self.graph.stats()
+
+    def _prune_relations(self, filters, ttl_ms, min_score, half_life_days, batch_size):
+        return self.graph.prune_edges(filters, ttl_ms, min_score, half_life_days, batch_size)
+
+    def _prune_entities(self, filters, grace_ms, batch_size):
+        return self.graph.prune_nodes(filters, grace_ms, batch_size)
+
+    def _search_graph_db(self, node_list, filters, limit=100, embeddings=None):
+        if not node_list:
+            return []
+
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_batch(node_list)
+        return self.graph.search_relations(embeddings, filters, self.threshold, limit)
+
+    def _search_graph_paths(self, node_list, filters, max_hops, limit=10, embeddings=None):
+        if not node_list:
+            return []
+
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_batch(node_list)
+        graph_config = self.config.graph_store
+        return self.graph.search_paths(
+            embeddings,
+            filters,
+            self.threshold,
+            max_hops=max_hops,
+            fanout=graph_config.hop_fanout,
+            limit=limit,
+            recency_weight=graph_config.recency_weight,
+            half_life_days=graph_config.recency_half_life_days,
+            hop_decay=graph_config.hop_decay,
+        )
+
+    def _delete_entities(self, to_be_deleted, filters):
+        if not to_be_deleted:
+            return []
+
+        rows = [
+            {
+                "index": index,
+                "source": item["source"],
+                "destination": item["destination"],
+                "relationship": item["relationship"],
+            }
+            for index, item in enumerate(to_be_deleted)
+        ]
+        results = [[] for _ in to_be_deleted]
+        for record in self.graph.delete_edges(rows, filters):
+            index = record.pop("index")
+            results[index].append(record)
+        return results
+
+    def _resolve_nodes(self, embeddings, filters, threshold=0.9):
+        names = list(embeddings.keys())
+        matches = self.graph.similar_nodes([embeddings[name] for name in names], filters, threshold, top_k=1)
+        return {name: match[0][0] for name, match in zip(names, matches) if match}
+
+    def _create_nodes(self, node_types, embeddings, filters):
+        if not node_types:
+            return {}
+
+        rows = [
+            {"name": name, "type": node_type, "embedding": embeddings[name]} for name, node_type in node_types.items()
+        ]
+        node_ids = self.graph.merge_nodes(rows, filters)
+        self.entity_index.add(filters, rows)
+        return node_ids
+
+    def _load_entities(self, filters, since):
+        return self.graph.entities(filters, since)
+
+    def _merge_relationships(self, rows):
+        return self.graph.merge_edges(rows)
@@ -1,39 +1,54 @@
+import concurrent.futures
 import logging
-
-from mem0.memory.utils import format_entities
-
-try:
-    from langchain_community.graphs import Neo4jGraph
-except ImportError:
-    raise ImportError("langchain_community is not installed. Please install it using pip install langchain-community")
-
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using 'pip install rank-bm25'")
-
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from mem0.graphs.entity_index import EntityNameIndex
+from mem0.graphs.schema import (
+    MERGE_ENTITIES,
+    MERGE_RELATIONSHIPS,
+    MERGE_RELATIONSHIPS_APOC,
+    RELATION_ID,
+    ensure_schema,
+    migrate_graph,
+    quote_name,
+    scope_params,
+)
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
     EXTRACT_ENTITIES_STRUCT_TOOL,
     EXTRACT_ENTITIES_TOOL,
+    EXTRACT_GRAPH_STRUCT_TOOL,
+    EXTRACT_GRAPH_TOOL,
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
-from mem0.utils.factory import EmbedderFactory, LlmFactory
+from mem0.graphs.utils import EXTRACT_GRAPH_PROMPT, EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.memory.utils import format_entities
+from mem0.utils.factory import EmbedderFactory, GraphRerankerFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
 
+# Relationless entities younger than this are kept by the pruner: add creates nodes before linking them.
+_ORPHAN_GRACE_MS = 3600000
+
+
+@contextmanager
+def _timed(timings, stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.perf_counter() - started, 4)
+
 
 class MemoryGraph:
-    def __init__(self, config):
+    def __init__(self, config, lock_manager=None):
         self.config = config
-        self.graph = Neo4jGraph(
-            self.config.graph_store.config.url,
-            self.config.graph_store.config.username,
-            self.config.graph_store.config.password,
-        )
+        self.lock_manager = lock_manager
         self.embedding_model = EmbedderFactory.create(self.config.embedder.provider, self.config.embedder.config)
 
         self.llm_provider = "openai_structured"
@@ -44,98 +59,535 @@ class MemoryGraph:
 
         self.llm = LlmFactory.create(self.llm_provider, self.config.llm.config)
 
-        # We'll store these IDs and use them in queries
-        self.user_id = None
-        self.agent_id = None
-        self.run_id = None
+        # Scope (user_id/agent_id/run_id) is passed as `filters` to every call; a MemoryGraph holds no
+        # per-request state, so one instance can serve concurrent requests for different scopes.
         self.threshold = 0.7
 
+        self._connect()
+
+        self.search_mode = self.config.graph_store.search_mode
+        self.extraction_mode = self.config.graph_store.extraction_mode
+        self.max_hops = self.config.graph_store.max_hops
+        reranker_config = self.config.graph_store.reranker
+        self.reranker = GraphRerankerFactory.create(reranker_config.provider, reranker_config.config)
+        index_config = self.config.graph_store.entity_index
+        self.entity_index = EntityNameIndex(
+            self._load_entities,
+            refresh_interval=index_config.refresh_interval,
+            reload_interval=index_config.reload_interval,
+            max_scopes=index_config.max_scopes,
+            max_entities=index_config.max_entities,
+        )
+
+        self._prune_samples = deque(maxlen=self.config.graph_store.prune.history)
+        self._prune_totals = {"runs": 0, "pruned_relations": 0, "pruned_entities": 0}
+        self._prune_stop = threading.Event()
+        self._pruner = None
+        if self.config.graph_store.prune.interval:
+            self._pruner = threading.Thread(target=self._prune_loop, name="mem0-graph-pruner", daemon=True)
+            self._pruner.start()
+
+    def _connect(self):
+        """Open the Neo4j driver and prepare the schema; graph providers override this to open their store."""
+        from mem0.graphs.neo4j_client import Neo4jClient
+
+        graph_config = self.config.graph_store.config
+        self.graph = Neo4jClient(
+            graph_config.url,
+            graph_config.username,
+            graph_config.password,
+            database=graph_config.database,
+            max_connection_pool_size=graph_config.max_connection_pool_size,
+            connection_acquisition_timeout=graph_config.connection_acquisition_timeout,
+            max_connection_lifetime=graph_config.max_connection_lifetime,
+            fetch_size=graph_config.fetch_size,
+        )
+        self.vector_index = False
+        self._setup_entity_index()
+        self.apoc = self._has_apoc()
+
     def add(self, data, filters):
         """
         Adds data to the graph with user_id, agent_id, run_id if provided in filters.
-        """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
-        to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
-        deleted_entities = self._delete_entities(to_be_deleted, filters)
-        added_entities = self._add_entities(to_be_added, filters, entity_type_map)
-
-        return {"deleted_entities": deleted_entities, "added_entities": added_entities}
-
-    def search(self, query, filters, limit=100):
+        In "single_call" extraction mode entities and relations come from one LLM call, while the contradiction
+        candidates are found from embedding matches against known entities and judged concurrently. The result
+        includes per-stage timings in seconds.
+        """
+        timings = {}
+        with _timed(timings, "total"):
+            # Extraction, the candidate search and the delete decision only read the graph, so they run before the
+            # scope lock is taken; the lock covers just the resolve, delete and merge writes. Deletes match by name
+            # and relationship type, so a relation a concurrent writer already removed is simply skipped.
+            if self.extraction_mode == "single_call":
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    future_extraction = executor.submit(self._extract_graph_from_data, data, filters, timings)
+                    to_be_deleted = self._find_contradictions(data, filters, timings)
+                    entity_type_map, to_be_added = future_extraction.result()
+            else:
+                with _timed(timings, "extract_entities"):
+                    entity_type_map = self._retrieve_nodes_from_data(data, filters)
+                with _timed(timings, "extract_relations"):
+                    to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+                with _timed(timings, "candidate_search"):
+                    search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+                with _timed(timings, "delete_decision"):
+                    to_be_deleted = (
+                        self._get_delete_entities_from_search_output(search_output, data, filters)
+                        if search_output
+                        else []
+                    )
+            with self._scope_lock(filters, timings):
+                deleted_entities, added_entities = self._apply_changes(
+                    to_be_deleted, to_be_added, filters, entity_type_map, timings
+                )
+
+        logger.info(f"Graph add ({self.extraction_mode}) timings: {timings}")
+        return {"deleted_entities": deleted_entities, "added_entities": added_entities, "timings": timings}
+
+    @contextmanager
+    def _scope_lock(self, filters, timings):
+        """Hold the scope's graph write lock (if configured) and record the wait as timings["lock_wait"]."""
+        lock = self.lock_manager.hold("graph", filters) if self.lock_manager else nullcontext(0.0)
+        with lock as waited:
+            timings["lock_wait"] = round(waited, 4)
+            yield
+
+    def _apply_changes(self, to_be_deleted, to_be_added, filters, entity_type_map, timings):
+        with _timed(timings, "delete"):
+            deleted_entities = self._delete_entities(to_be_deleted, filters)
+        with _timed(timings, "write"):
+            added_entities = self._add_entities(to_be_added, filters, entity_type_map)
+        return deleted_entities, added_entities
+
+    def search(self, query, filters, limit=100, search_mode=None, max_hops=None):
         """
         Search for related info in the graph by matching node embeddings
         and also factoring in user_id, agent_id, run_id if present.
-        """
-        entity_type_map = self._retrieve_nodes_from_data(query, filters)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters, limit=limit)
 
-        if not search_output:
-            return []
+        search_mode overrides graph_store.search_mode for this call: "llm" extracts the query's entities with
+        the LLM, "fast" looks them up in the in-process entity name index (no LLM call).
 
-        search_outputs_sequence = [[item["source"], item["relatationship"], item["destination"]] for item in search_output]
-        bm25 = BM25Okapi(search_outputs_sequence)
+        max_hops overrides graph_store.max_hops. Above 1 the result is the top scored paths (see
+        `_search_graph_paths`) as {"path": [{"source", "relationship", "target"}, ...], "score", "hops"}.
+        """
+        max_hops = max_hops or self.max_hops
+        if not 1 <= max_hops <= 4:
+            raise ValueError(f"max_hops must be between 1 and 4, got {max_hops}")
 
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
+        if (search_mode or self.search_mode) == "fast":
+            entities = self.entity_index.lookup(query, filters, query_embedding=self.embedding_model.embed(query))
+            node_list, embeddings = list(entities.keys()), list(entities.values())
+        else:
+            node_list, embeddings = list(self._retrieve_nodes_from_data(query, filters).keys()), None
+
+        if max_hops > 1:
+            paths = self._search_graph_paths(
+                node_list,
+                filters,
+                max_hops=max_hops,
+                limit=min(limit, self.config.graph_store.max_paths),
+                embeddings=embeddings,
+            )
+            logger.info(f"Returned {len(paths)} paths of up to {max_hops} hops")
+            return paths
 
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "target": item[2]})
+        reranker_config = self.config.graph_store.reranker
+        search_output = self._search_graph_db(
+            node_list=node_list, filters=filters, limit=max(limit, reranker_config.candidates), embeddings=embeddings
+        )
+        search_results = self.reranker.rerank(query, search_output, limit, min_score=reranker_config.min_score)
 
         logger.info(f"Returned {len(search_results)} search results")
         return search_results
 
-    def delete_all(self, filters):
+    def delete_all(self, filters, batch_size=1000):
         """
         Delete all nodes (and relationships) matching user_id/agent_id/run_id as needed.
+
+        Nodes are deleted in chunks of `batch_size`, each in its own transaction, so large scopes
+        don't exhaust Neo4j's transaction memory. Returns the number of deleted nodes.
         """
-        delete_clause = self._make_filter_clause(filters)
-        if delete_clause:
-            cypher = f"""
-            MATCH (n) 
-            WHERE {delete_clause}
-            DETACH DELETE n
-            """
-        else:
+        if not any(key in filters for key in ("user_id", "agent_id", "run_id")):
             # If no filters, do nothing or delete everything? Usually we want a filter to avoid meltdown.
             raise ValueError("Refusing to delete all nodes in graph without any filter. Provide user_id/agent_id/run_id.")
+
+        delete_clause = self._make_filter_clause(filters)
+        cypher = f"""
+        MATCH (n:Entity)
+        WHERE {delete_clause}
+        WITH n LIMIT $batch_size
+        DETACH DELETE n
+        RETURN count(*) AS deleted
+        """
         params = self._make_filter_params(filters)
-        self.graph.query(cypher, params=params)
+        params["batch_size"] = batch_size
 
-    def get_all(self, filters, limit=100):
+        total_deleted = 0
+        while True:
+            result = self.graph.query(cypher, params=params)
+            deleted = result[0]["deleted"] if result else 0
+            total_deleted += deleted
+            if deleted < batch_size:
+                break
+
+        self.entity_index.invalidate(filters)
+        logger.info(f"Deleted {total_deleted} graph nodes")
+        return total_deleted
+
+    def prune(self, filters=None):
+        """
+        Expire stale relations and record a graph size sample.
+
+        A relation is deleted when it has not been seen for graph_store.prune.ttl_days, or when its decay score
+
+            log2(1 + mentions) * 0.5 ^ (days_since_last_seen / half_life_days)
+
+        drops below prune.min_score, so relations extracted many times outlive ones mentioned once. Entities
+        left without any relation are deleted afterwards (only if older than an hour, so nodes an in-flight add
+        has created but not yet linked are kept). Deletes run in transactions of prune.batch_size, at most
+        prune.max_batches of each per run.
+
+        Args:
+            filters (dict, optional): Only prune this user_id/agent_id/run_id scope; by default the whole graph.
+
+        Returns:
+            dict: The sample recorded: pruned counts, graph size afterwards, seconds and timestamp.
+        """
+        filters = filters or {}
+        prune_config = self.config.graph_store.prune
+        started = time.perf_counter()
+        pruned_relations = pruned_entities = 0
+
+        if prune_config.ttl_days is not None or prune_config.min_score is not None:
+            ttl_ms = prune_config.ttl_days * 86400000 if prune_config.ttl_days is not None else None
+            for _ in range(prune_config.max_batches):
+                deleted = self._prune_relations(
+                    filters, ttl_ms, prune_config.min_score, prune_config.half_life_days, prune_config.batch_size
+                )
+                pruned_relations += deleted
+                if deleted < prune_config.batch_size:
+                    break
+
+            for _ in range(prune_config.max_batches):
+                deleted = self._prune_entities(filters, _ORPHAN_GRACE_MS, prune_config.batch_size)
+                pruned_entities += deleted
+                if deleted < prune_config.batch_size:
+                    break
+            if pruned_entities:
+                self.entity_index.invalidate(filters)
+
+        sample = {
+            "timestamp": int(time.time() * 1000),
+            "pruned_relations": pruned_relations,
+            "pruned_entities": pruned_entities,
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+        sample.update(self.graph_stats())
+        self._prune_samples.append(sample)
+        self._prune_totals["runs"] += 1
+        self._prune_totals["pruned_relations"] += pruned_relations
+        self._prune_totals["pruned_entities"] += pruned_entities
+        logger.info(f"Graph prune: {sample}")
+        return sample
+
+    def graph_stats(self):
+        """Current number of entities and relations in the whole graph (served from Neo4j's count store)."""
+        nodes = self.graph.query("MATCH (n:Entity) RETURN count(n) AS nodes", read=True)
+        relations = self.graph.query("MATCH ()-[r]->() RETURN count(r) AS relations", read=True)
+        return {
+            "nodes": nodes[0]["nodes"] if nodes else 0,
+            "relations": relations[0]["relations"] if relations else 0,
+        }
+
+    def graph_metrics(self):
         """
-        Retrieves all nodes/relationships matching the filters (user_id, agent_id, run_id).
+        Graph size over time: the samples recorded by each prune run (oldest first), totals across runs, and the
+        current size.
         """
+        return {
+            "current": self.graph_stats(),
+            "totals": dict(self._prune_totals),
+            "samples": list(self._prune_samples),
+        }
+
+    def close(self):
+        """Stop the background pruner and close the graph connection."""
+        self._prune_stop.set()
+        if self._pruner is not None:
+            self._pruner.join()
+            self._pruner = None
+        self.graph.close()
+
+    def _prune_loop(self):
+        while not self._prune_stop.wait(self.config.graph_store.prune.interval):
+            try:
+                self.prune()
+            except Exception as e:
+                logger.error(f"Graph prune failed: {e}", exc_info=True)
+
+    def _prune_relations(self, filters, ttl_ms, min_score, half_life_days, batch_size):
+        """Delete one batch of expired relations between nodes matching `filters`. Returns the number deleted."""
         filter_clause = self._make_filter_clause(filters, alias="n")
         filter_clause_m = self._make_filter_clause(filters, alias="m")
-
         cypher = f"""
-        MATCH (n)-[r]->(m)
+        MATCH (n:Entity)-[r]->(m:Entity)
         WHERE {filter_clause} AND {filter_clause_m}
-        RETURN n.name AS source, type(r) AS relationship, m.name AS target
-        LIMIT $limit
+        WITH r, timestamp() - coalesce(r.last_seen, r.created, 0) AS age
+        WHERE ($ttl_ms IS NOT NULL AND age > $ttl_ms)
+           OR ($min_score IS NOT NULL
+               AND log(1 + coalesce(r.mentions, 1)) / log(2) * 0.5 ^ (age / 86400000.0 / $half_life_days) < $min_score)
+        WITH r LIMIT $batch_size
+        DELETE r
+        RETURN count(*) AS deleted
         """
         params = self._make_filter_params(filters)
-        params["limit"] = limit
+        params.update(
+            {"ttl_ms": ttl_ms, "min_score": min_score, "half_life_days": half_life_days, "batch_size": batch_size}
+        )
+        result = self.graph.query(cypher, params=params)
+        return result[0]["deleted"] if result else 0
 
-        results = self.graph.query(cypher, params=params)
+    def _prune_entities(self, filters, grace_ms, batch_size):
+        """Delete one batch of relationless entities older than `grace_ms`. Returns the number deleted."""
+        filter_clause = self._make_filter_clause(
+            filters, extra="NOT EXISTS { (n)--() } AND coalesce(n.created, 0) < timestamp() - $grace_ms"
+        )
+        cypher = f"""
+        MATCH (n:Entity)
+        WHERE {filter_clause}
+        WITH n LIMIT $batch_size
+        DELETE n
+        RETURN count(*) AS deleted
+        """
+        params = self._make_filter_params(filters)
+        params.update({"grace_ms": grace_ms, "batch_size": batch_size})
+        result = self.graph.query(cypher, params=params)
+        return result[0]["deleted"] if result else 0
 
-        final_results = []
-        for result in results:
-            final_results.append(
-                {
-                    "source": result["source"],
-                    "relationship": result["relationship"],
-                    "target": result["target"],
-                }
+    def _setup_entity_index(self):
+        """
+        Migrate the graph onto the canonical :Entity schema (see mem0.graphs.schema), create its indexes, and
+        build a cosine vector index on Entity.embedding so similarity lookups use `db.index.vector.queryNodes`.
+
+        Servers without vector indexes (before Neo4j 5.11) keep working: similarity is then computed in
+        Cypher, but only over :Entity nodes.
+        """
+        migrate_graph(self.graph.query)
+        ensure_schema(self.graph.query)
+
+        graph_config = self.config.graph_store.config
+        if not graph_config.vector_index:
+            return
+
+        index_name = graph_config.vector_index_name
+        try:
+            existing = self.graph.query(
+                "SHOW INDEXES YIELD name, type WHERE name = $name RETURN type",
+                params={"name": index_name},
+                read=True,
+            )
+        except Exception as e:
+            logger.warning(f"Could not list Neo4j indexes, falling back to Cypher similarity: {e}")
+            return
+
+        if not existing:
+            dims = getattr(self.embedding_model.config, "embedding_dims", None) or len(
+                self.embedding_model.embed("dimension probe")
             )
+            try:
+                self.graph.query(
+                    f"""
+                    CREATE VECTOR INDEX `{index_name}` IF NOT EXISTS
+                    FOR (n:Entity) ON (n.embedding)
+                    OPTIONS {{indexConfig: {{
+                        `vector.dimensions`: {int(dims)},
+                        `vector.similarity_function`: 'cosine'
+                    }}}}
+                    """
+                )
+            except Exception:
+                try:
+                    # Neo4j 5.11-5.12 only expose the procedure form.
+                    self.graph.query(
+                        "CALL db.index.vector.createNodeIndex($name, 'Entity', 'embedding', $dims, 'cosine')",
+                        params={"name": index_name, "dims": int(dims)},
+                    )
+                except Exception as e:
+                    logger.warning(f"Neo4j vector indexes are unavailable, falling back to Cypher similarity: {e}")
+                    return
+            logger.info(f"Created vector index {index_name} on :Entity(embedding) with {dims} dimensions")
+        elif existing[0]["type"] != "VECTOR":
+            logger.warning(f"Index {index_name} exists but is not a vector index, falling back to Cypher similarity")
+            return
+
+        self.graph.query("CALL db.awaitIndex($name, 300)", params={"name": index_name})
+        self.vector_index = True
+
+    def _has_apoc(self):
+        """APOC lets relationship types be passed as parameters, so one query can write any mix of them."""
+        try:
+            self.graph.query("RETURN apoc.version() AS version")
+            return True
+        except Exception:
+            logger.info("APOC is not available, graph writes are grouped by relationship type")
+            return False
+
+    def _similar_nodes_clause(self, alias, embedding, filter_clause, score="similarity", threshold="threshold"):
+        """
+        Cypher that binds `alias` to scoped nodes whose cosine similarity to the `embedding` expression
+        (a parameter or a field of a row variable) is at least `$threshold`, together with that similarity as
+        `score`.
+
+        The vector index ranks nodes of every scope together and returns only the global top `$candidates`, so
+        in a shared graph other scopes' near-identical entities can fill that list. When even its last hit
+        clears the threshold, in-scope matches may lie beyond it and the scope is scanned instead; otherwise
+        every node above the threshold is among the hits and scope filtering loses none. Fallback scans cost
+        what the scan alone costs; a larger vector_index_candidates makes them rarer.
+        """
+        scan = f"""
+            MATCH ({alias}:Entity)
+            WHERE {alias}.embedding IS NOT NULL
+              AND {filter_clause}
+            WITH {alias},
+                round(
+                    reduce(dot = 0.0, i IN range(0, size({alias}.embedding)-1) |
+                        dot + {alias}.embedding[i] * {embedding}[i]) /
+                    (sqrt(reduce(l2 = 0.0, i IN range(0, size({alias}.embedding)-1) |
+                        l2 + {alias}.embedding[i] * {alias}.embedding[i])) *
+                    sqrt(reduce(l2 = 0.0, i IN range(0, size({embedding})-1) |
+                        l2 + {embedding}[i] * {embedding}[i])))
+                , 4) AS {score}
+            WHERE {score} >= ${threshold}
+            """
+        if not self.vector_index:
+            return scan
+
+        # The row variable holding the embedding must survive the aggregation for the fallback scan.
+        carried = "" if embedding.startswith("$") else embedding.split(".", 1)[0] + ", "
+        # Vector index scores are (1 + cosine) / 2; map them back to cosine similarity. Each UNION branch
+        # imports with a plain WITH (subquery imports may not filter) and filters in the next one.
+        return f"""
+            CALL db.index.vector.queryNodes($index_name, $candidates, {embedding})
+            YIELD node AS index_node, score AS index_score
+            WITH {carried}collect({{node: index_node, score: round(2 * index_score - 1, 4)}}) AS hits
+            WITH {carried}hits, size(hits) = $candidates AND hits[-1].score >= ${threshold} AS truncated
+            CALL {{
+                WITH hits, truncated
+                WITH hits, truncated
+                WHERE NOT truncated
+                UNWIND hits AS hit
+                WITH hit.node AS {alias}, hit.score AS {score}
+                WHERE {score} >= ${threshold}
+                  AND {filter_clause}
+                RETURN {alias}, {score}
+
+                UNION
+
+                WITH {carried}truncated
+                WITH {carried}truncated
+                WHERE truncated
+                {scan}
+                RETURN {alias}, {score}
+            }}
+            """
 
+    def _similarity_params(self):
+        return {
+            "index_name": self.config.graph_store.config.vector_index_name,
+            "candidates": self.config.graph_store.config.vector_index_candidates,
+        }
+
+    def get_all(self, filters, limit=100):
+        """
+        Retrieves up to `limit` relationships matching the filters (user_id, agent_id, run_id), in relation id
+        order. Use `get_relations` or `iter_relations` to read past the first page.
+        """
+        page = self.get_relations(filters, limit=limit)
+        if page["next_cursor"]:
+            logger.warning(f"get_all returned the first {limit} relationships; more match {filters}")
+
+        final_results = [
+            {"source": result["source"], "relationship": result["relationship"], "target": result["target"]}
+            for result in page["results"]
+        ]
         logger.info(f"Retrieved {len(final_results)} relationships")
         return final_results
 
+    def get_relations(self, filters, cursor=None, limit=100):
+        """
+        One page of the scope's relationships, ordered by relation id.
+
+        Relation ids start with the relation's creation time and are never reused, so pages are
+        keyset-paginated: each continues after the last id of the previous one, and relations created between
+        pages are neither skipped nor repeated. Neo4j cannot index relationship properties across relationship
+        types, so every page scans the scope's relations and keeps the top `limit`; reading a whole scope this
+        way costs O(N^2 / limit). Use `iter_relations` to read it all.
+
+        Args:
+            filters (dict): user_id/agent_id/run_id both endpoints must match.
+            cursor (str, optional): `next_cursor` from the previous page.
+            limit (int): Page size.
+
+        Returns:
+            dict: {"results": [{"id", "source", "relationship", "target", "created", "last_seen", "mentions"}],
+                "next_cursor": str or None}.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer")
+
+        cypher, params = self._relations_query(filters, cursor)
+        params["limit"] = limit + 1
+        results = self.graph.query(cypher + "\n        LIMIT $limit", params=params, read=True)
+        return self._relations_page(results, limit)
+
+    def iter_relations(self, filters, batch_size=1000, cursor=None):
+        """
+        Yield every relationship in the scope as lists of up to `batch_size`, in relation id order.
+
+        The scope is read by one streamed query (a single scan and sort) rather than page by page, so the cost
+        is linear in the scope's size; only one batch is held in memory at a time. An interrupted export can be
+        resumed by passing the id of the last relation received as `cursor`.
+
+        Args:
+            filters (dict): user_id/agent_id/run_id both endpoints must match.
+            batch_size (int): Relations per batch.
+            cursor (str, optional): Resume after this relation id.
+        """
+        cypher, params = self._relations_query(filters, cursor)
+        batch = []
+        for record in self.graph.stream(cypher, params=params, read=True):
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _relations_query(self, filters, cursor):
+        filter_clause = self._make_filter_clause(filters, alias="n")
+        filter_clause_m = self._make_filter_clause(filters, alias="m")
+        cypher = f"""
+        MATCH (n:Entity)-[r]->(m:Entity)
+        WHERE {filter_clause} AND {filter_clause_m}
+        WITH n, r, m, {RELATION_ID} AS id
+        WHERE $cursor IS NULL OR id > $cursor
+        RETURN id, n.name AS source, type(r) AS relationship, m.name AS target,
+               r.created AS created, coalesce(r.last_seen, r.created) AS last_seen,
+               coalesce(r.mentions, 1) AS mentions
+        ORDER BY id"""
+        params = self._make_filter_params(filters)
+        params["cursor"] = cursor
+        return cypher, params
+
+    @staticmethod
+    def _relations_page(results, limit):
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = results[-1]["id"]
+        return {"results": results, "next_cursor": next_cursor}
+
     def _retrieve_nodes_from_data(self, data, filters):
         _tools = [EXTRACT_ENTITIES_TOOL]
         if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
@@ -201,61 +653,220 @@ class MemoryGraph:
         logger.debug(f"Extracted entities: {extracted_entities}")
         return extracted_entities
 
-    def _search_graph_db(self, node_list, filters, limit=100):
+    def _extract_graph_from_data(self, data, filters, timings):
         """
-        For each node in node_list, embed it and find close matches. Also filter by user_id/agent_id/run_id if present.
+        Extract entities with their types and the relations among them in a single LLM call.
+
+        Returns:
+            tuple: (entity_type_map, relations) in the same shape as the multi-call path.
         """
-        result_relations = []
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
+        with _timed(timings, "extract"):
+            prompt = EXTRACT_GRAPH_PROMPT.replace("USER_ID", filters.get("user_id", "USER"))
+            if self.config.graph_store.custom_prompt:
+                prompt = prompt.replace("CUSTOM_PROMPT", f"4. {self.config.graph_store.custom_prompt}")
+            else:
+                prompt = prompt.replace("CUSTOM_PROMPT", "")
+
+            _tools = [EXTRACT_GRAPH_TOOL]
+            if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+                _tools = [EXTRACT_GRAPH_STRUCT_TOOL]
+
+            response = self.llm.generate_response(
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": data},
+                ],
+                tools=_tools,
+            )
 
-            # Build optional filter match using the same approach
-            filter_clause = self._make_filter_clause(filters, alias="n")
-            filter_clause_other = self._make_filter_clause(filters, alias="m")
+            entity_type_map = {}
+            relations = []
+            try:
+                arguments = response["tool_calls"][0]["arguments"]
+                for item in arguments.get("entities", []):
+                    entity_type_map[item["entity"]] = item["entity_type"]
+                relations = arguments.get("relations", [])
+            except Exception as e:
+                logger.error(f"Error in graph extraction tool: {e}")
+
+            entity_type_map = {
+                k.lower().replace(" ", "_"): v.lower().replace(" ", "_") for k, v in entity_type_map.items()
+            }
+            relations = self._remove_spaces_from_entities(relations)
+            logger.debug(f"Entity type map: {entity_type_map}, extracted relations: {relations}")
+        return entity_type_map, relations
 
-            cypher_query = f"""
-            MATCH (n)
-            WHERE n.embedding IS NOT NULL 
-              AND {filter_clause}
-            WITH n,
-                round(reduce(dot = 0.0, i IN range(0, size(n.embedding)-1) | dot + n.embedding[i] * $n_embedding[i]) /
-                (sqrt(reduce(l2 = 0.0, i IN range(0, size(n.embedding)-1) | l2 + n.embedding[i] * n.embedding[i])) *
-                sqrt(reduce(l2 = 0.0, i IN range(0, size($n_embedding)-1) | l2 + $n_embedding[i] * $n_embedding[i]))), 4) AS similarity
-            WHERE similarity >= $threshold
-            MATCH (n)-[r]->(m)
-            WHERE {filter_clause_other}
-            RETURN n.name AS source, elementId(n) AS source_id, type(r) AS relatationship,
-                   elementId(r) AS relation_id, m.name AS destination, elementId(m) AS destination_id, similarity
+    def _find_contradictions(self, data, filters, timings):
+        """
+        Find existing relations that the new data may contradict without waiting for extraction: candidate nodes
+        come from the entity name index (name and embedding matches on the raw text), then the LLM decides which
+        of their relations to delete.
+        """
+        with _timed(timings, "candidate_search"):
+            candidates = self.entity_index.lookup(data, filters, query_embedding=self.embedding_model.embed(data))
+            search_output = self._search_graph_db(
+                node_list=list(candidates.keys()), filters=filters, embeddings=list(candidates.values())
+            )
+        if not search_output:
+            return []
+        with _timed(timings, "delete_decision"):
+            return self._get_delete_entities_from_search_output(search_output, data, filters)
+
+    def _search_graph_db(self, node_list, filters, limit=100, embeddings=None):
+        """
+        Find nodes close to any entity in node_list and return their incoming and outgoing relations, filtered by
+        user_id/agent_id/run_id if present.
+
+        All entities are embedded in one batch (unless `embeddings` are given) and searched in one query; a
+        relation reached from several entities is returned once, with its best similarity.
+        """
+        if not node_list:
+            return []
+
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_batch(node_list)
+
+        filter_clause = self._make_filter_clause(filters, alias="n")
+        filter_clause_other = self._make_filter_clause(filters, alias="m")
+        similar_nodes = self._similar_nodes_clause("n", "row.embedding", filter_clause)
+
+        cypher_query = f"""
+        UNWIND $rows AS row
+        CALL {{
+            WITH row
+            {similar_nodes}
+            CALL {{
+                WITH n
+                MATCH (n)-[r]->(m:Entity)
+                WHERE {filter_clause_other}
+                RETURN n.name AS source, elementId(n) AS source_id, type(r) AS relatationship,
+                       elementId(r) AS relation_id, m.name AS destination, elementId(m) AS destination_id,
+                       r.created AS created
+
+                UNION
+
+                WITH n
+                MATCH (m:Entity)-[r]->(n)
+                WHERE {filter_clause_other}
+                RETURN m.name AS source, elementId(m) AS source_id, type(r) AS relatationship,
+                       elementId(r) AS relation_id, n.name AS destination, elementId(n) AS destination_id,
+                       r.created AS created
+            }}
+            RETURN source, source_id, relatationship, relation_id, destination, destination_id, created, similarity
+        }}
+        WITH relation_id, source, source_id, relatationship, destination, destination_id, created,
+             max(similarity) AS similarity
+        RETURN source, source_id, relatationship, relation_id, destination, destination_id, created, similarity
+        ORDER BY similarity DESC
+        LIMIT $limit
+        """
+
+        params = {
+            "rows": [{"entity": node, "embedding": embedding} for node, embedding in zip(node_list, embeddings)],
+            "threshold": self.threshold,
+            "limit": limit,
+        }
+        params.update(self._similarity_params())
+        params.update(self._make_filter_params(filters))
+
+        return self.graph.query(cypher_query, params=params, read=True)
+
+    def _search_graph_paths(self, node_list, filters, max_hops, limit=10, embeddings=None):
+        """
+        Walk up to `max_hops` relations out from the nodes closest to the entities in node_list and return the
+        best-scoring paths, in one query.
+
+        Traversal is bounded: it starts from at most `hop_fanout` matched nodes, follows at most `hop_fanout` of
+        each node's most recent relations per hop, and never revisits a node within a path. Every prefix of a
+        walk is itself a candidate path. A path's score is computed server-side as
+
+            ((1 - recency_weight) * similarity + recency_weight * recency) * hop_decay ^ (hops - 1)
+
+        where similarity is the start node's cosine similarity to the query entity and recency is the mean of
+        0.5 ^ (age_days / recency_half_life_days) over the path's relations. A path found from both ends is
+        returned once.
+
+        Returns:
+            list: Up to `limit` dicts with "path" (source/relationship/target steps in traversal order),
+                "score" and "hops", best first.
+        """
+        if not node_list:
+            return []
+
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_batch(node_list)
+
+        graph_config = self.config.graph_store
+        filter_clause = self._make_filter_clause(filters, alias="n")
+        filter_clause_next = self._make_filter_clause(filters, alias="m")
+        similar_nodes = self._similar_nodes_clause("n", "row.embedding", filter_clause)
+
+        # Each hop either extends a live walk by one of the tail's most recent relations or ends it; ended
+        # walks pass through the remaining hops unchanged, so walks of every length reach the end.
+        hop = f"""
+        CALL {{
+            WITH tail, visited, done
+            MATCH (tail)-[r]-(m:Entity)
+            WHERE NOT done AND NOT elementId(m) IN visited AND {filter_clause_next}
+            WITH r, m
+            ORDER BY coalesce(r.created, 0) DESC
+            LIMIT $fanout
+            RETURN r AS step, m AS next
 
             UNION
 
-            MATCH (n)
-            WHERE n.embedding IS NOT NULL
-              AND {filter_clause}
-            WITH n,
-                round(reduce(dot = 0.0, i IN range(0, size(n.embedding)-1) | dot + n.embedding[i] * $n_embedding[i]) /
-                (sqrt(reduce(l2 = 0.0, i IN range(0, size(n.embedding)-1) | l2 + n.embedding[i] * n.embedding[i])) *
-                sqrt(reduce(l2 = 0.0, i IN range(0, size($n_embedding)-1) | l2 + $n_embedding[i] * $n_embedding[i]))), 4) AS similarity
-            WHERE similarity >= $threshold
-            MATCH (m)-[r]->(n)
-            WHERE {filter_clause_other}
-            RETURN m.name AS source, elementId(m) AS source_id, type(r) AS relatationship,
-                   elementId(r) AS relation_id, n.name AS destination, elementId(n) AS destination_id, similarity
-            ORDER BY similarity DESC
-            LIMIT $limit
-            """
+            WITH tail
+            RETURN null AS step, tail AS next
+        }}
+        WITH similarity,
+             CASE WHEN step IS NULL THEN rels ELSE rels + step END AS rels,
+             next AS tail,
+             CASE WHEN step IS NULL THEN visited ELSE visited + elementId(next) END AS visited,
+             done OR step IS NULL AS done
+        """
 
-            params = {
-                "n_embedding": n_embedding,
-                "threshold": self.threshold,
-                "limit": limit,
-            }
-            params.update(self._make_filter_params(filters))
+        cypher = f"""
+        UNWIND $rows AS row
+        CALL {{
+            WITH row
+            {similar_nodes}
+            RETURN n, similarity
+        }}
+        WITH n, max(similarity) AS similarity
+        ORDER BY similarity DESC
+        LIMIT $fanout
+        WITH similarity, n AS tail, [] AS rels, [elementId(n)] AS visited, false AS done
+        {hop * max_hops}
+        WITH similarity, rels
+        WHERE size(rels) > 0
+        WITH rels, [r IN rels | elementId(r)] AS ids,
+             ((1 - $recency_weight) * similarity
+              + $recency_weight * reduce(total = 0.0, r IN rels |
+                    total + 0.5 ^ ((timestamp() - coalesce(r.created, 0)) / 86400000.0 / $half_life_days))
+                / size(rels))
+             * $hop_decay ^ (size(rels) - 1) AS score
+        WITH CASE WHEN ids[0] <= ids[-1] THEN ids ELSE reverse(ids) END AS path_key, rels, score
+        ORDER BY score DESC
+        WITH path_key, head(collect(rels)) AS rels, max(score) AS score
+        ORDER BY score DESC
+        LIMIT $limit
+        RETURN [r IN rels | {{source: startNode(r).name, relationship: type(r), target: endNode(r).name}}] AS path,
+               round(score, 4) AS score, size(rels) AS hops
+        """
 
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        params = {
+            "rows": [{"entity": node, "embedding": embedding} for node, embedding in zip(node_list, embeddings)],
+            "threshold": self.threshold,
+            "fanout": graph_config.hop_fanout,
+            "recency_weight": graph_config.recency_weight,
+            "half_life_days": graph_config.recency_half_life_days,
+            "hop_decay": graph_config.hop_decay,
+            "limit": limit,
+        }
+        params.update(self._similarity_params())
+        params.update(self._make_filter_params(filters))
 
-        return result_relations
+        return self.graph.query(cypher, params=params, read=True)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """
@@ -286,201 +897,176 @@ class MemoryGraph:
         return to_be_deleted
 
     def _delete_entities(self, to_be_deleted, filters):
-        results = []
-        for item in to_be_deleted:
-            source = item["source"]
-            destination = item["destination"]
-            relatationship = item["relationship"]
-
-            # Also require that the user_id/agent_id/run_id match to avoid accidental global deletion
-            filter_clause_source = self._make_filter_clause(filters, alias="n", extra="n.name = $source_name")
-            filter_clause_dest = self._make_filter_clause(filters, alias="m", extra="m.name = $dest_name")
-
-            cypher = f"""
-            MATCH (n)-[r:{relatationship}]->(m)
-            WHERE {filter_clause_source}
-              AND {filter_clause_dest}
-            DELETE r
-            RETURN n.name AS source, m.name AS destination, type(r) AS deleted_relationship
-            """
+        """
+        Delete all contradicted relationships in one UNWIND query. Returns one result list per item.
+        """
+        if not to_be_deleted:
+            return []
 
-            params = {
-                "source_name": source,
-                "dest_name": destination,
-            }
-            params.update(self._make_filter_params(filters))
+        # Also require that the user_id/agent_id/run_id match to avoid accidental global deletion
+        filter_clause_source = self._make_filter_clause(filters, alias="n", extra="n.name = row.source")
+        filter_clause_dest = self._make_filter_clause(filters, alias="m", extra="m.name = row.destination")
 
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
+        cypher = f"""
+        UNWIND $rows AS row
+        MATCH (n:Entity)-[r]->(m:Entity)
+        WHERE {filter_clause_source}
+          AND {filter_clause_dest}
+          AND type(r) = row.relationship
+        DELETE r
+        RETURN row.index AS index, n.name AS source, m.name AS destination, type(r) AS deleted_relationship
+        """
+
+        params = {
+            "rows": [
+                {
+                    "index": index,
+                    "source": item["source"],
+                    "destination": item["destination"],
+                    "relationship": item["relationship"],
+                }
+                for index, item in enumerate(to_be_deleted)
+            ]
+        }
+        params.update(self._make_filter_params(filters))
+
+        results = [[] for _ in to_be_deleted]
+        for record in self.graph.query(cypher, params=params):
+            index = record.pop("index")
+            results[index].append(record)
         return results
 
     def _add_entities(self, to_be_added, filters, entity_type_map):
         """
-        Merge or create new entities, set user_id/agent_id/run_id, then create the relationship.
-        """
-        results = []
-        for item in to_be_added:
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            source_type = entity_type_map.get(source, "unknown")
-            destination_type = entity_type_map.get(destination, "unknown")
-
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            source_node_search_result = self._search_single_node(source_embedding, filters)
-            destination_node_search_result = self._search_single_node(dest_embedding, filters)
-
-            # Build queries to handle each scenario:
-            if not destination_node_search_result and source_node_search_result:
-                # we have source node, but not destination
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                MERGE (destination:{destination_type} {{
-                    name: $destination_name
-                }})
-                ON CREATE SET
-                    destination.created = timestamp(),
-                    destination.embedding = $dest_embedding,
-                    destination.user_id = $user_id,
-                    destination.agent_id = $agent_id,
-                    destination.run_id = $run_id
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET r.created = timestamp()
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS destination
-                """
-
-                params = {
-                    "source_id": source_node_search_result[0]['elementId(node_candidate)'],
-                    "destination_name": destination,
-                    "dest_embedding": dest_embedding,
-                }
-                params.update(self._make_filter_params(filters))
-                resp = self.graph.query(cypher, params=params)
-                results.append(resp)
-
-            elif destination_node_search_result and not source_node_search_result:
-                # we have destination node, but not source
-                cypher = f"""
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                MERGE (source:{source_type} {{
-                    name: $source_name
-                }})
-                ON CREATE SET
-                    source.created = timestamp(),
-                    source.embedding = $source_embedding,
-                    source.user_id = $user_id,
-                    source.agent_id = $agent_id,
-                    source.run_id = $run_id
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET r.created = timestamp()
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS destination
-                """
-
-                params = {
-                    "destination_id": destination_node_search_result[0]['elementId(node_candidate)'],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                }
-                params.update(self._make_filter_params(filters))
-                resp = self.graph.query(cypher, params=params)
-                results.append(resp)
-
-            elif source_node_search_result and destination_node_search_result:
-                # both exist
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
-                    r.created_at = timestamp()
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS destination
-                """
-                # we won't overwrite the user/agent/run in the existing node
-                params = {
-                    "source_id": source_node_search_result[0]['elementId(node_candidate)'],
-                    "destination_id": destination_node_search_result[0]['elementId(node_candidate)'],
-                }
-                resp = self.graph.query(cypher, params=params)
-                results.append(resp)
+        Merge or create new entities, set user_id/agent_id/run_id, then create the relationships.
 
-            else:
-                # neither exist
-                cypher = f"""
-                MERGE (n:{source_type} {{
-                    name: $source_name
-                }})
-                ON CREATE SET
-                    n.created = timestamp(),
-                    n.embedding = $source_embedding,
-                    n.user_id = $user_id,
-                    n.agent_id = $agent_id,
-                    n.run_id = $run_id
-
-                MERGE (m:{destination_type} {{
-                    name: $dest_name
-                }})
-                ON CREATE SET
-                    m.created = timestamp(),
-                    m.embedding = $dest_embedding,
-                    m.user_id = $user_id,
-                    m.agent_id = $agent_id,
-                    m.run_id = $run_id
-
-                MERGE (n)-[rel:{relationship}]->(m)
-                ON CREATE SET rel.created = timestamp()
-                RETURN n.name AS source, type(rel) AS relationship, m.name AS destination
-                """
-
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                }
-                params.update(self._make_filter_params(filters))
-                resp = self.graph.query(cypher, params=params)
-                results.append(resp)
+        All names are embedded in one batch and resolved against existing nodes in one query; the missing
+        nodes and the relationships are then written with UNWIND. Returns one result list per item.
+        """
+        if not to_be_added:
+            return []
+
+        names = list(dict.fromkeys(name for item in to_be_added for name in (item["source"], item["destination"])))
+        embeddings = dict(zip(names, self.embedding_model.embed_batch(names)))
+
+        node_ids = self._resolve_nodes(embeddings, filters)
+        missing = {name: entity_type_map.get(name, "unknown") for name in names if name not in node_ids}
+        # we won't overwrite the user/agent/run in the existing nodes
+        node_ids.update(self._create_nodes(missing, embeddings, filters))
+
+        rows = [
+            {
+                "index": index,
+                "source_id": node_ids[item["source"]],
+                "destination_id": node_ids[item["destination"]],
+                "relationship": item["relationship"],
+            }
+            for index, item in enumerate(to_be_added)
+        ]
+
+        results = [[] for _ in to_be_added]
+        for record in self._merge_relationships(rows):
+            index = record.pop("index")
+            results[index].append(record)
         return results
 
-    def _search_single_node(self, embedding, filters):
+    def _resolve_nodes(self, embeddings, filters, threshold=0.9):
         """
-        Search for a single node by embedding, plus user_id, agent_id, run_id filters if any.
+        Find the closest existing node for every name in one query.
+
+        Args:
+            embeddings (dict): Entity name -> embedding.
+            filters (dict): user_id/agent_id/run_id scope.
+            threshold (float): Minimum cosine similarity for a node to count as the same entity.
+
+        Returns:
+            dict: Entity name -> elementId of the matched node, for the names that matched.
         """
         filter_clause = self._make_filter_clause(filters, alias="node_candidate")
+        similar_nodes = self._similar_nodes_clause(
+            "node_candidate", "row.embedding", filter_clause, score="node_similarity"
+        )
 
         cypher = f"""
-            MATCH (node_candidate)
-            WHERE node_candidate.embedding IS NOT NULL
-              AND {filter_clause}
-            WITH node_candidate,
-                round(
-                    reduce(dot = 0.0, i IN range(0, size(node_candidate.embedding)-1) |
-                        dot + node_candidate.embedding[i] * $embedding[i]) /
-                    (sqrt(reduce(l2 = 0.0, i IN range(0, size(node_candidate.embedding)-1) |
-                        l2 + node_candidate.embedding[i] * node_candidate.embedding[i])) *
-                    sqrt(reduce(l2 = 0.0, i IN range(0, size($embedding)-1) |
-                        l2 + $embedding[i] * $embedding[i])))
-                , 4) AS node_similarity
-            WHERE node_similarity >= $threshold
+        UNWIND $rows AS row
+        CALL {{
+            WITH row
+            {similar_nodes}
+            WITH node_candidate, node_similarity
             ORDER BY node_similarity DESC
             LIMIT 1
-            RETURN elementId(node_candidate)
+            RETURN elementId(node_candidate) AS node_id
+        }}
+        RETURN row.name AS name, node_id
         """
 
         params = {
-            "embedding": embedding,
-            "threshold": 0.9,
+            "rows": [{"name": name, "embedding": embedding} for name, embedding in embeddings.items()],
+            "threshold": threshold,
         }
+        params.update(self._similarity_params())
         params.update(self._make_filter_params(filters))
-        result = self.graph.query(cypher, params=params)
-        return result
+        return {record["name"]: record["node_id"] for record in self.graph.query(cypher, params=params, read=True)}
+
+    def _create_nodes(self, node_types, embeddings, filters):
+        """
+        MERGE the given entities on (name, user_id, agent_id, run_id) in one query.
+
+        Args:
+            node_types (dict): Entity name -> entity type.
+            embeddings (dict): Entity name -> embedding.
+            filters (dict): user_id/agent_id/run_id of the new nodes.
+
+        Returns:
+            dict: Entity name -> elementId of the node.
+        """
+        if not node_types:
+            return {}
+
+        params = {
+            "rows": [
+                {"name": name, "type": node_type, "embedding": embeddings[name]}
+                for name, node_type in node_types.items()
+            ]
+        }
+        params.update(scope_params(filters))
+        node_ids = {record["name"]: record["node_id"] for record in self.graph.query(MERGE_ENTITIES, params=params)}
+        self.entity_index.add(filters, params["rows"])
+        return node_ids
+
+    def _load_entities(self, filters, since):
+        """Stream the scope's entities created after `since` (ms since epoch) for the entity name index."""
+        filter_clause = self._make_filter_clause(filters, extra="coalesce(n.created, 0) > $since")
+        cypher = f"""
+        MATCH (n:Entity)
+        WHERE n.embedding IS NOT NULL
+          AND {filter_clause}
+        RETURN n.name AS name, n.embedding AS embedding, n.created AS created
+        """
+        params = {"since": since}
+        params.update(self._make_filter_params(filters))
+        return self.graph.stream(cypher, params=params)
+
+    def _merge_relationships(self, rows):
+        """
+        MERGE relationships between resolved nodes. Each row carries index, source_id, destination_id and
+        relationship; the returned records carry the row index back.
+        """
+        if self.apoc:
+            queries = [(MERGE_RELATIONSHIPS_APOC, rows)]
+        else:
+            groups = {}
+            for row in rows:
+                groups.setdefault(row["relationship"], []).append(row)
+            queries = [
+                (MERGE_RELATIONSHIPS.format(relationship=quote_name(relationship)), group)
+                for relationship, group in groups.items()
+            ]
+
+        records = []
+        for cypher, group in queries:
+            records.extend(self.graph.query(cypher, params={"rows": group}))
+        return records
 
     def _remove_spaces_from_entities(self, entity_list):
         for item in entity_list:
@@ -2,9 +2,13 @@ import concurrent
 import hashlib
 import json
 import logging
+import os
+import time
 import uuid
 import warnings
+from contextlib import nullcontext
 from datetime import datetime
+from functools import partial
 from typing import Any, Dict
 
 import pytz
@@ -14,10 +18,21 @@ from mem0.configs.base import MemoryConfig, MemoryItem
 from mem0.configs.prompts import get_update_memory_messages
 from mem0.memory.base import MemoryBase
 from mem0.memory.setup import setup_config
-from mem0.memory.storage import SQLiteManager
 from mem0.memory.telemetry import capture_event
 from mem0.memory.utils import get_fact_retrieval_messages, parse_messages
-from mem0.utils.factory import EmbedderFactory, LlmFactory, VectorStoreFactory
+from mem0.search.fusion import matches_filters, reciprocal_rank_fusion
+from mem0.search.lexical import LexicalIndex
+from mem0.search.mmr import maximal_marginal_relevance
+from mem0.search.rerank import CrossEncoderReranker
+from mem0.search.scoring import RecencyScorer
+from mem0.utils.factory import (
+    EmbedderFactory,
+    GraphStoreFactory,
+    HistoryStoreFactory,
+    LlmFactory,
+    LockManagerFactory,
+    VectorStoreFactory,
+)
 
 # Setup user config
 setup_config()
@@ -35,20 +50,128 @@ class Memory(MemoryBase):
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
-        self.db = SQLiteManager(self.config.history_db_path)
+        self.db = self._create_history_store()
+        self.lock_manager = None
+        if self.config.lock.provider != "none":
+            self.lock_manager = LockManagerFactory.create(self.config.lock.provider, self.config.lock.config)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
+        self.lexical_index = self._create_lexical_index() if self.config.search.hybrid.enabled else None
+        self.reranker = self._create_reranker() if self.config.search.rerank.enabled else None
+        self.scorer = self._create_scorer() if self.config.search.scoring.enabled else None
 
         self.enable_graph = False
 
         if self.api_version == "v1.1" and self.config.graph_store.config:
-            from mem0.memory.graph_memory import MemoryGraph
-
-            self.graph = MemoryGraph(self.config)
+            self.graph = GraphStoreFactory.create(
+                self.config.graph_store.provider, self.config, lock_manager=self.lock_manager
+            )
             self.enable_graph = True
 
         capture_event("mem0.init", self)
 
+    def _create_history_store(self):
+        history_config = self.config.history_store.config
+        if self.config.history_store.provider == "sqlite" and not history_config.db_path:
+            history_config = history_config.model_copy(update={"db_path": self.config.history_db_path})
+        return HistoryStoreFactory.create(self.config.history_store.provider, history_config)
+
+    def _create_lexical_index(self):
+        hybrid_config = self.config.search.hybrid
+        os.makedirs(hybrid_config.path, exist_ok=True)
+        return LexicalIndex(
+            os.path.join(hybrid_config.path, f"{self.collection_name}.db"), busy_timeout=hybrid_config.busy_timeout
+        )
+
+    def _create_reranker(self):
+        rerank_config = self.config.search.rerank
+        reranker = CrossEncoderReranker(
+            rerank_config.model,
+            batch_size=rerank_config.batch_size,
+            device=rerank_config.device,
+            max_length=rerank_config.max_length,
+        )
+        if rerank_config.warm_up:
+            reranker.warm_up()
+        return reranker
+
+    def _create_scorer(self):
+        scoring_config = self.config.search.scoring
+        return RecencyScorer(
+            similarity_weight=scoring_config.similarity_weight,
+            recency_weight=scoring_config.recency_weight,
+            importance_weight=scoring_config.importance_weight,
+            importance_key=scoring_config.importance_key,
+            half_life_days=scoring_config.half_life_days,
+            run_id_half_life_days=scoring_config.run_id_half_life_days,
+            candidates=scoring_config.candidates,
+        )
+
+    def rebuild_lexical_index(self, batch_size=1000):
+        """
+        Re-index every memory in the vector store into the lexical index, e.g. after enabling hybrid search on an
+        existing collection.
+
+        :return: number of memories indexed.
+        """
+        if self.lexical_index is None:
+            raise ValueError("Hybrid search is not enabled; set search.hybrid.enabled to build a lexical index.")
+
+        self.lexical_index.reset()
+        indexed = 0
+        for page in self.vector_store.scroll(batch_size=batch_size):
+            self.lexical_index.upsert([(memory.id, memory.payload.get("data"), memory.payload) for memory in page])
+            indexed += len(page)
+        logger.info(f"Indexed {indexed} memories into the lexical index")
+        return indexed
+
+    def _scope_lock(self, namespace, filters):
+        """Serialise read-decide-write sections for one scope, if a lock provider is configured."""
+        if self.lock_manager is None:
+            return nullcontext(0.0)
+        return self.lock_manager.hold(namespace, filters)
+
+    def lock_metrics(self):
+        """
+        Contention and wait-time counters of the scope locks taken by add.
+
+        :return: Per namespace ("vector", "graph") counters, or {} if no lock provider is configured.
+        """
+        return self.lock_manager.metrics() if self.lock_manager else {}
+
+    def history_metrics(self):
+        """
+        Background history writer counters: rows written, retried and failed writes, rows awaiting retry and
+        rows dropped.
+        """
+        return self.db.metrics()
+
+    def graph_metrics(self):
+        """
+        Graph size over time and relation pruning totals (see graph_store.prune).
+
+        :return: dict with "current" size, "totals" across prune runs and the recorded "samples", or {} if the graph
+            store is not enabled.
+        """
+        return self.graph.graph_metrics() if self.enable_graph else {}
+
+    def prune_graph(self, user_id=None, agent_id=None, run_id=None):
+        """
+        Run one graph prune pass now, for the given scope or the whole graph.
+
+        :return: dict with the pruned counts and the graph size afterwards.
+        """
+        if not self.enable_graph:
+            raise ValueError("Graph store is not enabled")
+        filters = {}
+        if user_id:
+            filters["user_id"] = user_id
+        if agent_id:
+            filters["agent_id"] = agent_id
+        if run_id:
+            filters["run_id"] = run_id
+        return self.graph.prune(filters)
+
     @classmethod
     def from_config(cls, config_dict: Dict[str, Any]):
         try:
@@ -176,13 +299,27 @@ class Memory(MemoryBase):
             logging.error(f"Error in new_retrieved_facts: {e}")
             new_retrieved_facts = []
 
-        retrieved_old_memory = []
         new_message_embeddings = {}
         for new_mem in new_retrieved_facts:
-            messages_embeddings = self.embedding_model.embed(new_mem)
-            new_message_embeddings[new_mem] = messages_embeddings
+            new_message_embeddings[new_mem] = self.embedding_model.embed(new_mem)
+
+        # Another add for the same scope must not read the existing memories until this one has written its
+        # decisions, or both would reconcile against the same stale state.
+        with self._scope_lock("vector", filters):
+            returned_memories = self._reconcile_memories(new_retrieved_facts, new_message_embeddings, metadata, filters)
+
+        capture_event("mem0.add", self, {"version": self.api_version, "keys": list(filters.keys())})
+
+        return returned_memories
+
+    def _reconcile_memories(self, new_retrieved_facts, new_message_embeddings, metadata, filters):
+        """
+        Compare new facts with the scope's existing memories and apply the LLM's ADD/UPDATE/DELETE decisions.
+        """
+        retrieved_old_memory = []
+        for new_mem in new_retrieved_facts:
             existing_memories = self.vector_store.search(
-                query=messages_embeddings,
+                query=new_message_embeddings[new_mem],
                 limit=5,
                 filters=filters,
             )
@@ -254,8 +391,6 @@ class Memory(MemoryBase):
         except Exception as e:
             logging.error(f"Error in new_memories_with_actions: {e}")
 
-        capture_event("mem0.add", self, {"version": self.api_version, "keys": list(filters.keys())})
-
         return returned_memories
 
     def _add_raw_to_vector_store(self, messages, metadata, filters):
@@ -285,11 +420,6 @@ class Memory(MemoryBase):
         logger.debug("Entering _add_to_graph. Checking if graph is enabled and performing knowledge graph addition.")
         added_entities = []
         if self.api_version == "v1.1" and self.enable_graph:
-            # Provide all three IDs if present
-            self.graph.user_id = filters.get("user_id", None)
-            self.graph.agent_id = filters.get("agent_id", None)
-            self.graph.run_id = filters.get("run_id", None)
-
             data = "\n".join([msg["content"] for msg in messages if "content" in msg and msg["role"] != "system"])
             added_entities = self.graph.add(data, filters)
             logger.debug(f"Tool usage / function calls in _add_to_graph for knowledge graph: {added_entities}")
@@ -305,6 +435,21 @@ class Memory(MemoryBase):
         if not memory:
             return None
 
+        return self._build_memory_item(memory)
+
+    def get_many(self, memory_ids):
+        """
+        Retrieve several memories by ID with a single vector store round trip.
+
+        Missing IDs are skipped; results follow the order of `memory_ids`.
+        """
+        capture_event("mem0.get_many", self, {"count": len(memory_ids)})
+        memories = {str(memory.id): memory for memory in self.vector_store.get_many(list(memory_ids))}
+        return [
+            self._build_memory_item(memories[str(memory_id)]) for memory_id in memory_ids if str(memory_id) in memories
+        ]
+
+    def _build_memory_item(self, memory):
         filters = {key: memory.payload[key] for key in ["user_id", "agent_id", "run_id"] if memory.payload.get(key)}
 
         # Prepare base memory item
@@ -378,6 +523,32 @@ class Memory(MemoryBase):
             )
             return all_memories
 
+    def export_relations(self, user_id=None, agent_id=None, run_id=None, batch_size=1000, cursor=None):
+        """
+        Stream every graph relation of a scope in relation id order.
+
+        :param user_id/agent_id/run_id: scope to export.
+        :param batch_size: relations read from the graph store per batch.
+        :param cursor: resume after this relation id (the "id" of the last relation received).
+        :return: iterator over lists of {"id", "source", "relationship", "target", "created", "last_seen",
+            "mentions"}.
+        """
+        if not self.enable_graph:
+            raise ValueError("Graph store is not enabled")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+
+        filters = {}
+        if user_id:
+            filters["user_id"] = user_id
+        if agent_id:
+            filters["agent_id"] = agent_id
+        if run_id:
+            filters["run_id"] = run_id
+
+        capture_event("mem0.export_relations", self, {"keys": list(filters.keys()), "batch_size": batch_size})
+        return self.graph.iter_relations(filters, batch_size=batch_size, cursor=cursor)
+
     def _get_all_from_vector_store(self, filters, limit):
         memories = self.vector_store.list(filters=filters, limit=limit)
 
@@ -410,9 +581,29 @@ class Memory(MemoryBase):
         ]
         return all_memories
 
-    def search(self, query, user_id=None, agent_id=None, run_id=None, limit=100, filters=None):
+    def search(
+        self,
+        query,
+        user_id=None,
+        agent_id=None,
+        run_id=None,
+        limit=100,
+        filters=None,
+        graph_search_mode=None,
+        graph_max_hops=None,
+        rerank=None,
+    ):
         """
         Search for memories, can filter by user_id, agent_id, run_id.
+
+        graph_search_mode ("llm" or "fast") overrides graph_store.search_mode for this call.
+        graph_max_hops overrides graph_store.max_hops; above 1, "relations" holds scored multi-hop paths.
+        With search.hybrid enabled, memories are ranked by reciprocal rank fusion of vector and lexical (BM25)
+        search and "score" is the fused score. In v1.1, "timings" holds each retrieval stage's latency in ms.
+        rerank=False skips the search.rerank cross-encoder stage for this call; when it runs, "score" is the
+        cross-encoder score of the best `limit` of search.rerank.candidates memories. With search.scoring enabled,
+        "score" then weighs that score against the memory's recency and importance. With search.diversity
+        enabled, results are picked by maximal marginal relevance and ordered by pick, keeping their scores.
         """
         filters = filters or {}
         if user_id:
@@ -425,16 +616,22 @@ class Memory(MemoryBase):
         if not any(key in filters for key in ("user_id", "agent_id", "run_id")):
             raise ValueError("One of the filters: user_id, agent_id or run_id is required!")
 
+        if rerank is None:
+            rerank = self.reranker is not None
+        elif rerank and self.reranker is None:
+            raise ValueError("Reranking is not enabled; set search.rerank.enabled to load a cross-encoder.")
+
         capture_event(
             "mem0.search",
             self,
             {"limit": limit, "version": self.api_version, "keys": list(filters.keys())},
         )
 
+        timings = {}
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_memories = executor.submit(self._search_vector_store, query, filters, limit)
+            future_memories = executor.submit(self._search_vector_store, query, filters, limit, timings, rerank)
             future_graph_entities = (
-                executor.submit(self.graph.search, query, filters, limit)
+                executor.submit(self.graph.search, query, filters, limit, graph_search_mode, graph_max_hops)
                 if self.api_version == "v1.1" and self.enable_graph
                 else None
             )
@@ -448,9 +645,9 @@ class Memory(MemoryBase):
 
         if self.api_version == "v1.1":
             if self.enable_graph:
-                return {"results": original_memories, "relations": graph_entities}
+                return {"results": original_memories, "relations": graph_entities, "timings": timings}
             else:
-                return {"results": original_memories}
+                return {"results": original_memories, "timings": timings}
         else:
             warnings.warn(
                 "The current get_all API output format is deprecated. "
@@ -461,10 +658,137 @@ class Memory(MemoryBase):
             )
             return original_memories
 
-    def _search_vector_store(self, query, filters, limit):
+    def _search_vector_store(self, query, filters, limit, timings=None, rerank=False):
+        timings = timings if timings is not None else {}
+        diversity_config = self.config.search.diversity
+        vectors = {} if diversity_config.enabled else None
+        stages = []
+        store_scorer = None
+        if rerank:
+            stages.append(("rerank", self.reranker.rerank, self.config.search.rerank.candidates))
+        if self.scorer is not None:
+            # A plain vector search can have the store apply the score over its own candidates instead.
+            if (
+                self.config.search.scoring.push_down
+                and self.vector_store.supports_score_formula
+                and self.lexical_index is None
+                and not rerank
+            ):
+                store_scorer = self.scorer
+            else:
+                # Hybrid, sparse-fusion and cross-encoder scores are not cosines; put them on a [0, 1] scale.
+                normalize = rerank or self.lexical_index is not None or self.vector_store.supports_text_query
+                stages.append(
+                    ("scoring", partial(self.scorer.rescore, normalize=normalize), self.scorer.candidates)
+                )
+        if vectors is not None:
+            stages.append(("diversity", partial(self._diversify, vectors=vectors), diversity_config.candidates))
+
+        if not stages:
+            return self._retrieve(query, filters, limit, timings, scorer=store_scorer)
+
+        candidates = max(limit, *(budget for _, _, budget in stages))
+        memories = self._retrieve(query, filters, candidates, timings, scorer=store_scorer, vectors=vectors)
+        for position, (stage, rescore, _) in enumerate(stages):
+            # Only the last stage cuts down to `limit`; earlier ones rescore every candidate.
+            stage_limit = limit if position == len(stages) - 1 else len(memories)
+            memories = self._timed(timings, stage, rescore, query, memories, stage_limit)
+        return memories
+
+    def _diversify(self, query, memories, limit, vectors):
+        """
+        Pick `limit` of the best search.diversity.candidates memories by maximal marginal relevance.
+
+        Embeddings come from the search hits; any the store did not return (lexical-only hits, stores without
+        with_vectors) are re-embedded in one batch.
+        """
+        memories = memories[: self.config.search.diversity.candidates]
+        missing = [memory for memory in memories if vectors.get(str(memory["id"])) is None]
+        if missing:
+            embeddings = self.embedding_model.embed_batch([memory["memory"] for memory in missing])
+            for memory, embedding in zip(missing, embeddings):
+                vectors[str(memory["id"])] = embedding
+
+        picked = maximal_marginal_relevance(
+            [memory["score"] or 0.0 for memory in memories],
+            [vectors[str(memory["id"])] for memory in memories],
+            limit,
+            lambda_mult=self.config.search.diversity.lambda_mult,
+        )
+        return [memories[position] for position in picked]
+
+    def _retrieve(self, query, filters, limit, timings, scorer=None, vectors=None):
+        """
+        Run the vector (or hybrid) search. When `vectors` is a dict, it receives each hit's embedding by memory id,
+        for the stores that can return them.
+        """
+        with_vectors = vectors is not None and self.vector_store.supports_with_vectors
+        if self.lexical_index is None:
+            memories = self._timed(
+                timings, "vector", self._dense_search, query, filters, limit, scorer, with_vectors
+            )
+            if with_vectors:
+                vectors.update((str(mem.id), mem.vector) for mem in memories)
+            return [self._build_search_result(mem, mem.score) for mem in memories]
+
+        hybrid_config = self.config.search.hybrid
+        candidates = max(limit, hybrid_config.candidates)
+        scope = {key: filters[key] for key in ("user_id", "agent_id", "run_id") if key in filters}
+        # Both legs run at once, so the slower one bounds the search instead of their sum.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            future_dense = executor.submit(
+                self._timed, timings, "vector", self._dense_search, query, filters, candidates, None, with_vectors
+            )
+            future_lexical = executor.submit(
+                self._timed, timings, "lexical", self.lexical_index.search, query, scope, candidates
+            )
+            dense_hits = future_dense.result()
+            lexical_hits = future_lexical.result()
+
+        start = time.perf_counter()
+        memories = {str(mem.id): mem for mem in dense_hits}
+        if with_vectors:
+            vectors.update((memory_id, mem.vector) for memory_id, mem in memories.items())
+        # Lexical-only hits still need their payloads, and must pass any metadata filters the index cannot apply.
+        missing = [memory_id for memory_id, _ in lexical_hits if memory_id not in memories]
+        if missing:
+            for mem in self.vector_store.get_many(missing):
+                if matches_filters(mem.payload, filters):
+                    memories[str(mem.id)] = mem
+        fused = reciprocal_rank_fusion(
+            [
+                [str(mem.id) for mem in dense_hits],
+                [memory_id for memory_id, _ in lexical_hits if memory_id in memories],
+            ],
+            k=hybrid_config.rrf_k,
+            weights=[hybrid_config.vector_weight, hybrid_config.lexical_weight],
+            limit=limit,
+        )
+        results = [self._build_search_result(memories[memory_id], score) for memory_id, score in fused]
+        timings["fusion"] = round((time.perf_counter() - start) * 1000, 2)
+        return results
+
+    def _dense_search(self, query, filters, limit, scorer=None, with_vectors=False):
         embeddings = self.embedding_model.embed(query)
-        memories = self.vector_store.search(query=embeddings, limit=limit, filters=filters)
+        kwargs = {}
+        if self.vector_store.supports_text_query:
+            kwargs["query_text"] = query
+        if scorer is not None:
+            kwargs["scorer"] = scorer
+        if with_vectors:
+            kwargs["with_vectors"] = True
+        return self.vector_store.search(query=embeddings, limit=limit, filters=filters, **kwargs)
+
+    @staticmethod
+    def _timed(timings, stage, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timings[stage] = round((time.perf_counter() - start) * 1000, 2)
 
+    @staticmethod
+    def _build_search_result(mem, score):
         excluded_keys = {
             "user_id",
             "agent_id",
@@ -475,27 +799,22 @@ class Memory(MemoryBase):
             "updated_at",
         }
 
-        original_memories = [
-            {
-                **MemoryItem(
-                    id=mem.id,
-                    memory=mem.payload["data"],
-                    hash=mem.payload.get("hash"),
-                    created_at=mem.payload.get("created_at"),
-                    updated_at=mem.payload.get("updated_at"),
-                    score=mem.score,
-                ).model_dump(),
-                **{key: mem.payload[key] for key in ["user_id", "agent_id", "run_id"] if key in mem.payload},
-                **(
-                    {"metadata": {k: v for k, v in mem.payload.items() if k not in excluded_keys}}
-                    if any(k for k in mem.payload if k not in excluded_keys)
-                    else {}
-                ),
-            }
-            for mem in memories
-        ]
-
-        return original_memories
+        return {
+            **MemoryItem(
+                id=mem.id,
+                memory=mem.payload["data"],
+                hash=mem.payload.get("hash"),
+                created_at=mem.payload.get("created_at"),
+                updated_at=mem.payload.get("updated_at"),
+                score=score,
+            ).model_dump(),
+            **{key: mem.payload[key] for key in ["user_id", "agent_id", "run_id"] if key in mem.payload},
+            **(
+                {"metadata": {k: v for k, v in mem.payload.items() if k not in excluded_keys}}
+                if any(k for k in mem.payload if k not in excluded_keys)
+                else {}
+            ),
+        }
 
     def update(self, memory_id, data):
         """
@@ -508,6 +827,56 @@ class Memory(MemoryBase):
         self._update_memory(memory_id, data, existing_embeddings)
         return {"message": "Memory updated successfully!"}
 
+    def batch_update(self, memories):
+        """
+        Update several memories at once.
+
+        :param memories: list of {"memory_id": ..., "data": ...} dicts.
+        :return: dict with one result per updated memory.
+        """
+        capture_event("mem0.batch_update", self, {"count": len(memories)})
+        memory_ids = [item["memory_id"] for item in memories]
+        existing = {str(memory.id): memory for memory in self.vector_store.get_many(memory_ids)}
+
+        missing = [memory_id for memory_id in memory_ids if str(memory_id) not in existing]
+        if missing:
+            raise ValueError(f"Error getting memories with IDs {missing}. Please provide valid 'memory_id's")
+
+        vectors = self.embedding_model.embed_batch([item["data"] for item in memories])
+        payloads, history_records, results = [], [], []
+        for item in memories:
+            existing_memory = existing[str(item["memory_id"])]
+            new_metadata = self._build_updated_payload(existing_memory, item["data"])
+            payloads.append(new_metadata)
+            history_records.append(
+                {
+                    "memory_id": item["memory_id"],
+                    "old_memory": existing_memory.payload.get("data"),
+                    "new_memory": item["data"],
+                    "event": "UPDATE",
+                    "created_at": new_metadata["created_at"],
+                    "updated_at": new_metadata["updated_at"],
+                    **self._history_scope(new_metadata),
+                }
+            )
+            results.append(
+                {
+                    "id": item["memory_id"],
+                    "memory": item["data"],
+                    "event": "UPDATE",
+                    "previous_memory": existing_memory.payload.get("data"),
+                }
+            )
+
+        self.vector_store.update_many(vector_ids=memory_ids, vectors=vectors, payloads=payloads)
+        if self.lexical_index is not None:
+            self.lexical_index.upsert(
+                [(memory_id, payload["data"], payload) for memory_id, payload in zip(memory_ids, payloads)]
+            )
+        self.db.add_history_batch(history_records)
+        logger.info(f"Updated {len(results)} memories")
+        return {"results": results}
+
     def delete(self, memory_id):
         """
         Delete a memory by ID.
@@ -516,6 +885,42 @@ class Memory(MemoryBase):
         self._delete_memory(memory_id)
         return {"message": "Memory deleted successfully!"}
 
+    def batch_delete(self, memory_ids):
+        """
+        Delete several memories at once. IDs that do not exist are ignored.
+
+        :return: dict with one result per deleted memory.
+        """
+        capture_event("mem0.batch_delete", self, {"count": len(memory_ids)})
+        existing = self.vector_store.get_many(list(memory_ids))
+        if not existing:
+            return {"results": []}
+
+        self.vector_store.delete_many([memory.id for memory in existing])
+        if self.lexical_index is not None:
+            self.lexical_index.delete([memory.id for memory in existing])
+        deleted_at = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        self.db.add_history_batch(
+            [
+                {
+                    "memory_id": str(memory.id),
+                    "old_memory": memory.payload.get("data"),
+                    "new_memory": None,
+                    "event": "DELETE",
+                    "updated_at": deleted_at,
+                    "is_deleted": 1,
+                    **self._history_scope(memory.payload),
+                }
+                for memory in existing
+            ]
+        )
+        logger.info(f"Deleted {len(existing)} memories")
+        return {
+            "results": [
+                {"id": str(memory.id), "memory": memory.payload.get("data"), "event": "DELETE"} for memory in existing
+            ]
+        }
+
     def delete_all(self, user_id=None, agent_id=None, run_id=None):
         """
         Delete all memories for user_id, agent_id, or run_id. Must specify at least one.
@@ -534,16 +939,60 @@ class Memory(MemoryBase):
             )
 
         capture_event("mem0.delete_all", self, {"keys": list(filters.keys())})
-        memories = self.vector_store.list(filters=filters)[0]
-        for memory in memories:
-            self._delete_memory(memory.id)
 
-        logger.info(f"Deleted {len(memories)} memories")
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            future_memories = executor.submit(self._delete_all_from_vector_store, filters)
+            future_graph = (
+                executor.submit(self.graph.delete_all, filters)
+                if self.api_version == "v1.1" and self.enable_graph
+                else None
+            )
 
-        if self.api_version == "v1.1" and self.enable_graph:
-            self.graph.delete_all(filters)
+            concurrent.futures.wait([future_memories, future_graph] if future_graph else [future_memories])
+
+            deleted_memories = future_memories.result()
+            deleted_nodes = future_graph.result() if future_graph else None
+
+        result = {"message": "Memories deleted successfully!", "deleted_memories": deleted_memories}
+        if deleted_nodes is not None:
+            result["deleted_nodes"] = deleted_nodes
+        return result
+
+    def _delete_all_from_vector_store(self, filters, batch_size=1000):
+        """
+        Delete every memory matching the filters by id, one scrolled page at a time, recording one history
+        tombstone per deleted memory in the same batch.
+
+        The scope is scrolled to the end before anything is deleted, so stores that page by offset do not skip
+        rows, and every delete targets ids that were read: memories added meanwhile are left in place rather
+        than removed without a tombstone.
+        """
+        pages = list(self.vector_store.scroll(filters=filters, batch_size=batch_size))
+        deleted = 0
+        deleted_at = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        for page in pages:
+            memory_ids = [memory.id for memory in page]
+            self.vector_store.delete_many(memory_ids)
+            if self.lexical_index is not None:
+                self.lexical_index.delete(memory_ids)
+            self.db.add_history_batch(
+                [
+                    {
+                        "memory_id": str(memory.id),
+                        "old_memory": memory.payload.get("data"),
+                        "new_memory": None,
+                        "event": "DELETE",
+                        "updated_at": deleted_at,
+                        "is_deleted": 1,
+                        **self._history_scope(memory.payload),
+                    }
+                    for memory in page
+                ]
+            )
+            deleted += len(page)
 
-        return {"message": "Memories deleted successfully!"}
+        logger.info(f"Deleted {deleted} memories")
+        return deleted
 
     def history(self, memory_id):
         """
@@ -552,6 +1001,30 @@ class Memory(MemoryBase):
         capture_event("mem0.history", self, {"memory_id": memory_id})
         return self.db.get_history(memory_id)
 
+    def history_query(self, filters=None, since=None, until=None, events=None, cursor=None, limit=100):
+        """
+        Page through the change history of a scope, oldest first.
+
+        :param filters: dict with any of user_id, agent_id, run_id.
+        :param since: only changes recorded at or after this datetime / ISO string.
+        :param until: only changes recorded before this datetime / ISO string.
+        :param events: only these events, e.g. ["ADD", "DELETE"].
+        :param cursor: `next_cursor` returned by the previous page.
+        :param limit: page size.
+        :return: dict with "results" and "next_cursor" (None on the last page).
+        """
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        events = [event.upper() for event in events] if events else None
+        capture_event(
+            "mem0.history_query",
+            self,
+            {"keys": list((filters or {}).keys()), "has_cursor": cursor is not None, "limit": limit},
+        )
+        return self.db.query_history(
+            filters=filters, since=since, until=until, events=events, cursor=cursor, limit=limit
+        )
+
     def _create_memory(self, data, existing_embeddings, metadata=None):
         logging.info(f"Creating memory with {data=}")
         if data in existing_embeddings:
@@ -559,7 +1032,8 @@ class Memory(MemoryBase):
         else:
             embeddings = self.embedding_model.embed(data)
         memory_id = str(uuid.uuid4())
-        metadata = metadata or {}
+        # Copy, so memories created in the same request don't share (and overwrite) one payload dict.
+        metadata = dict(metadata) if metadata else {}
         metadata["data"] = data
         metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
         metadata["created_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
@@ -569,7 +1043,11 @@ class Memory(MemoryBase):
             ids=[memory_id],
             payloads=[metadata],
         )
-        self.db.add_history(memory_id, None, data, "ADD", created_at=metadata["created_at"])
+        if self.lexical_index is not None:
+            self.lexical_index.upsert([(memory_id, data, metadata)])
+        self.db.add_history(
+            memory_id, None, data, "ADD", created_at=metadata["created_at"], **self._history_scope(metadata)
+        )
         capture_event("mem0._create_memory", self, {"memory_id": memory_id})
         return memory_id
 
@@ -581,19 +1059,7 @@ class Memory(MemoryBase):
         except Exception:
             raise ValueError(f"Error getting memory with ID {memory_id}. Please provide a valid 'memory_id'")
         prev_value = existing_memory.payload.get("data")
-
-        new_metadata = metadata or {}
-        new_metadata["data"] = data
-        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        new_metadata["created_at"] = existing_memory.payload.get("created_at")
-        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
-
-        if "user_id" in existing_memory.payload:
-            new_metadata["user_id"] = existing_memory.payload["user_id"]
-        if "agent_id" in existing_memory.payload:
-            new_metadata["agent_id"] = existing_memory.payload["agent_id"]
-        if "run_id" in existing_memory.payload:
-            new_metadata["run_id"] = existing_memory.payload["run_id"]
+        new_metadata = self._build_updated_payload(existing_memory, data, metadata)
 
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
@@ -604,6 +1070,8 @@ class Memory(MemoryBase):
             vector=embeddings,
             payload=new_metadata,
         )
+        if self.lexical_index is not None:
+            self.lexical_index.upsert([(memory_id, data, new_metadata)])
         logger.info(f"Updating memory with ID {memory_id=} with {data=}")
         self.db.add_history(
             memory_id,
@@ -612,16 +1080,46 @@ class Memory(MemoryBase):
             "UPDATE",
             created_at=new_metadata["created_at"],
             updated_at=new_metadata["updated_at"],
+            **self._history_scope(new_metadata),
         )
         capture_event("mem0._update_memory", self, {"memory_id": memory_id})
         return memory_id
 
+    def _build_updated_payload(self, existing_memory, data, metadata=None):
+        new_metadata = dict(metadata) if metadata else {}
+        new_metadata["data"] = data
+        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
+        new_metadata["created_at"] = existing_memory.payload.get("created_at")
+        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+
+        if "user_id" in existing_memory.payload:
+            new_metadata["user_id"] = existing_memory.payload["user_id"]
+        if "agent_id" in existing_memory.payload:
+            new_metadata["agent_id"] = existing_memory.payload["agent_id"]
+        if "run_id" in existing_memory.payload:
+            new_metadata["run_id"] = existing_memory.payload["run_id"]
+        return new_metadata
+
+    @staticmethod
+    def _history_scope(payload):
+        return {key: payload[key] for key in ("user_id", "agent_id", "run_id") if payload.get(key) is not None}
+
     def _delete_memory(self, memory_id):
         logging.info(f"Deleting memory with {memory_id=}")
         existing_memory = self.vector_store.get(vector_id=memory_id)
         prev_value = existing_memory.payload["data"]
         self.vector_store.delete(vector_id=memory_id)
-        self.db.add_history(memory_id, prev_value, None, "DELETE", is_deleted=1)
+        if self.lexical_index is not None:
+            self.lexical_index.delete([memory_id])
+        self.db.add_history(
+            memory_id,
+            prev_value,
+            None,
+            "DELETE",
+            updated_at=datetime.now(pytz.timezone("US/Pacific")).isoformat(),
+            is_deleted=1,
+            **self._history_scope(existing_memory.payload),
+        )
         capture_event("mem0._delete_memory", self, {"memory_id": memory_id})
         return memory_id
 
@@ -635,6 +1133,8 @@ class Memory(MemoryBase):
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.db.reset()
+        if self.lexical_index is not None:
+            self.lexical_index.reset()
         capture_event("mem0.reset", self)
 
     def chat(self, query):
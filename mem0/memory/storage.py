@@ -1,16 +1,162 @@
+import logging
+import random
 import sqlite3
-import uuid
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 
+import pytz
+
+from mem0.history_stores.base import HistoryStoreBase
+
+logger = logging.getLogger(__name__)
+
+_INSERT_HISTORY = """
+    INSERT INTO history (
+        id, memory_id, old_memory, new_memory, event, created_at, updated_at, is_deleted,
+        user_id, agent_id, run_id, recorded_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_CREATE_HISTORY = """
+    CREATE TABLE IF NOT EXISTS history (
+        id TEXT PRIMARY KEY,
+        memory_id TEXT,
+        old_memory TEXT,
+        new_memory TEXT,
+        new_value TEXT,
+        event TEXT,
+        created_at DATETIME,
+        updated_at DATETIME,
+        is_deleted INTEGER,
+        user_id TEXT,
+        agent_id TEXT,
+        run_id TEXT,
+        recorded_at TEXT
+    )
+"""
+
+# Columns added after the first release of the current schema, migrated in place with ALTER TABLE.
+_SCOPE_COLUMNS = {"user_id": "TEXT", "agent_id": "TEXT", "run_id": "TEXT", "recorded_at": "TEXT"}
+
+_EPOCH = "1970-01-01T00:00:00.000000+00:00"
+
+
+class SQLiteManager(HistoryStoreBase):
+    def __init__(
+        self,
+        db_path=":memory:",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        busy_timeout=30000,
+        batch_writes=False,
+        batch_size=500,
+        flush_interval=0.05,
+        retention_days=None,
+        vacuum_interval=None,
+    ):
+        """
+        SQLite-backed history store.
+
+        Args:
+            db_path (str): Path to the database file, or ":memory:".
+            journal_mode (str): SQLite journal mode. WAL lets readers run alongside a writer, including
+                readers and writers in other processes (e.g. several uvicorn workers).
+            synchronous (str): SQLite synchronous level. NORMAL is durable across application crashes in WAL mode.
+            busy_timeout (int): Milliseconds to wait on a locked database before retrying.
+            batch_writes (bool): Queue history rows and commit them in groups from a background thread.
+            batch_size (int): Maximum rows per group commit.
+            flush_interval (float): Seconds the writer waits to fill a group before committing it.
+            retention_days (int, optional): Prune history rows older than this many days.
+            vacuum_interval (int, optional): Seconds between maintenance runs (retention, checkpoint, VACUUM).
+        """
+        self.db_path = db_path
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.busy_timeout = busy_timeout
+        self.retention_days = retention_days
+        self.vacuum_interval = vacuum_interval
+
+        # An in-memory database only exists on the connection that created it, so it has to be shared.
+        self._shared = db_path == ":memory:" or db_path.startswith("file::memory:")
+        self._local = threading.local()
+        self._shared_connection = self._connect() if self._shared else None
+        self._shared_lock = threading.RLock()
 
-class SQLiteManager:
-    def __init__(self, db_path=":memory:"):
-        self.connection = sqlite3.connect(db_path, check_same_thread=False)
         self._migrate_history_table()
         self._create_history_table()
 
+        super().__init__(batch_writes=batch_writes, batch_size=batch_size, flush_interval=flush_interval)
+
+        self._stop_maintenance = threading.Event()
+        self._maintenance = None
+        if vacuum_interval:
+            self._maintenance = threading.Thread(
+                target=self._maintenance_loop, name="mem0-history-maintenance", daemon=True
+            )
+            self._maintenance.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=self.busy_timeout / 1000,
+            isolation_level=None,
+            uri=self.db_path.startswith("file:"),
+        )
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if not self._is_memory_path():
+            connection.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        return connection
+
+    def _is_memory_path(self):
+        return self.db_path == ":memory:" or self.db_path.startswith("file::memory:")
+
+    @property
+    def connection(self):
+        """The calling thread's connection (shared for in-memory databases)."""
+        if self._shared:
+            return self._shared_connection
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self, immediate=True, retries=5):
+        """
+        Run a write transaction on the calling thread's connection.
+
+        BEGIN IMMEDIATE takes the write lock up front, so concurrent writers (threads or processes) queue
+        on busy_timeout instead of failing on lock upgrade. Remaining "database is locked" errors are
+        retried with jittered backoff.
+        """
+        lock = self._shared_lock if self._shared else _NullLock()
+        with lock:
+            connection = self.connection
+            for attempt in range(retries + 1):
+                try:
+                    connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+                    break
+                except sqlite3.OperationalError as e:
+                    if ("locked" not in str(e) and "busy" not in str(e)) or attempt == retries:
+                        raise
+                    time.sleep(min(0.05 * 2**attempt, 1.0) * (0.5 + random.random()))
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            else:
+                connection.execute("COMMIT")
+
     def _migrate_history_table(self):
-        with self.connection:
-            cursor = self.connection.cursor()
+        with self._transaction() as connection:
+            cursor = connection.cursor()
 
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='history'")
             table_exists = cursor.fetchone() is not None
@@ -20,41 +166,10 @@ class SQLiteManager:
                 cursor.execute("PRAGMA table_info(history)")
                 current_schema = {row[1]: row[2] for row in cursor.fetchall()}
 
-                # Define the expected schema
-                expected_schema = {
-                    "id": "TEXT",
-                    "memory_id": "TEXT",
-                    "old_memory": "TEXT",
-                    "new_memory": "TEXT",
-                    "new_value": "TEXT",
-                    "event": "TEXT",
-                    "created_at": "DATETIME",
-                    "updated_at": "DATETIME",
-                    "is_deleted": "INTEGER",
-                }
-
-                # Check if the schemas are the same
-                if current_schema != expected_schema:
-                    # Rename the old table
+                if "old_memory" not in current_schema:
+                    # Legacy (prev_value/timestamp) schema: rebuild the table and copy the rows over.
                     cursor.execute("ALTER TABLE history RENAME TO old_history")
-
-                    cursor.execute(
-                        """
-                        CREATE TABLE IF NOT EXISTS history (
-                            id TEXT PRIMARY KEY,
-                            memory_id TEXT,
-                            old_memory TEXT,
-                            new_memory TEXT,
-                            new_value TEXT,
-                            event TEXT,
-                            created_at DATETIME,
-                            updated_at DATETIME,
-                            is_deleted INTEGER
-                        )
-                    """
-                    )
-
-                    # Copy data from the old table to the new table
+                    cursor.execute(_CREATE_HISTORY)
                     cursor.execute(
                         """
                         INSERT INTO history (id, memory_id, old_memory, new_memory, new_value, event, created_at, updated_at, is_deleted)
@@ -62,58 +177,55 @@ class SQLiteManager:
                         FROM old_history
                     """  # noqa: E501
                     )
-
                     cursor.execute("DROP TABLE old_history")
+                else:
+                    for column, column_type in _SCOPE_COLUMNS.items():
+                        if column not in current_schema:
+                            cursor.execute(f"ALTER TABLE history ADD COLUMN {column} {column_type}")
+
+                self._backfill_recorded_at(connection)
 
-                    self.connection.commit()
+    @classmethod
+    def _backfill_recorded_at(cls, connection):
+        """Give rows written before recorded_at existed a UTC timestamp derived from their own timestamps."""
+        rows = connection.execute(
+            "SELECT id, COALESCE(updated_at, created_at) FROM history WHERE recorded_at IS NULL"
+        ).fetchall()
+        updates = []
+        for row_id, timestamp in rows:
+            try:
+                recorded_at = cls.to_timestamp(timestamp) if timestamp else _EPOCH
+            except ValueError:
+                recorded_at = _EPOCH
+            updates.append((recorded_at, row_id))
+        if updates:
+            connection.executemany("UPDATE history SET recorded_at = ? WHERE id = ?", updates)
+            logger.info(f"Backfilled recorded_at on {len(updates)} history rows")
 
     def _create_history_table(self):
-        with self.connection:
-            self.connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS history (
-                    id TEXT PRIMARY KEY,
-                    memory_id TEXT,
-                    old_memory TEXT,
-                    new_memory TEXT,
-                    new_value TEXT,
-                    event TEXT,
-                    created_at DATETIME,
-                    updated_at DATETIME,
-                    is_deleted INTEGER
+        with self._transaction() as connection:
+            connection.execute(_CREATE_HISTORY)
+            # get_history filters on memory_id and sorts on updated_at; retention scans by timestamp.
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_history_memory_id ON history (memory_id, updated_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_history_created_at ON history (created_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_history_updated_at ON history (updated_at)")
+            # query_history seeks on a scope and walks (recorded_at, id) in key order.
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_history_recorded_at ON history (recorded_at, id)")
+            for column in ("user_id", "agent_id", "run_id"):
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_history_{column} ON history ({column}, recorded_at, id)"
                 )
-            """
-            )
+            connection.execute("CREATE TABLE IF NOT EXISTS history_meta (key TEXT PRIMARY KEY, value TEXT)")
 
-    def add_history(
-        self,
-        memory_id,
-        old_memory,
-        new_memory,
-        event,
-        created_at=None,
-        updated_at=None,
-        is_deleted=0,
-    ):
-        with self.connection:
-            self.connection.execute(
-                """
-                INSERT INTO history (id, memory_id, old_memory, new_memory, event, created_at, updated_at, is_deleted)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    str(uuid.uuid4()),
-                    memory_id,
-                    old_memory,
-                    new_memory,
-                    event,
-                    created_at,
-                    updated_at,
-                    is_deleted,
-                ),
-            )
+    def _write_rows(self, rows):
+        with self._transaction() as connection:
+            # Stamped under the write lock, after every committed row, so cursors never pass an unseen row.
+            latest = connection.execute("SELECT max(recorded_at) FROM history").fetchone()[0]
+            recorded_at = self._commit_timestamp(latest)
+            connection.executemany(_INSERT_HISTORY, [row[:-1] + (recorded_at,) for row in rows])
 
     def get_history(self, memory_id):
+        self.flush()
         cursor = self.connection.execute(
             """
             SELECT id, memory_id, old_memory, new_memory, event, created_at, updated_at
@@ -137,7 +249,139 @@ class SQLiteManager:
             for row in rows
         ]
 
+    def query_history(self, filters=None, since=None, until=None, events=None, cursor=None, limit=100):
+        self.flush()
+        conditions, params = [], []
+        for key in ("user_id", "agent_id", "run_id"):
+            if filters and filters.get(key) is not None:
+                conditions.append(f"{key} = ?")
+                params.append(filters[key])
+        if since is not None:
+            conditions.append("recorded_at >= ?")
+            params.append(self.to_timestamp(since))
+        if until is not None:
+            conditions.append("recorded_at < ?")
+            params.append(self.to_timestamp(until))
+        if events:
+            conditions.append(f"event IN ({', '.join('?' for _ in events)})")
+            params.extend(events)
+        if cursor:
+            conditions.append("(recorded_at, id) > (?, ?)")
+            params.extend(self.decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            f"""
+            SELECT id, memory_id, old_memory, new_memory, event, created_at, updated_at,
+                   user_id, agent_id, run_id, recorded_at
+            FROM history
+            {where}
+            ORDER BY recorded_at ASC, id ASC
+            LIMIT ?
+        """,
+            (*params, limit + 1),
+        ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1][10], rows[-1][0])
+        return {
+            "results": [
+                {
+                    "id": row[0],
+                    "memory_id": row[1],
+                    "old_memory": row[2],
+                    "new_memory": row[3],
+                    "event": row[4],
+                    "created_at": row[5],
+                    "updated_at": row[6],
+                    "user_id": row[7],
+                    "agent_id": row[8],
+                    "run_id": row[9],
+                    "recorded_at": row[10],
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
+
+    def compact(self, vacuum=True):
+        """
+        Apply the retention policy, checkpoint the WAL and optionally VACUUM.
+
+        When several processes share the database only one of them vacuums per `vacuum_interval`;
+        the others see the timestamp recorded in history_meta and skip.
+
+        Returns:
+            int: Number of pruned history rows.
+        """
+        self.flush()
+        pruned = 0
+        if self.retention_days:
+            cutoff = (datetime.now(pytz.timezone("US/Pacific")) - timedelta(days=self.retention_days)).isoformat()
+            with self._transaction() as connection:
+                cursor = connection.execute(
+                    "DELETE FROM history WHERE updated_at < ? OR (updated_at IS NULL AND created_at < ?)",
+                    (cutoff, cutoff),
+                )
+                pruned = cursor.rowcount
+            logger.info(f"Pruned {pruned} history rows older than {self.retention_days} days")
+
+        if self._is_memory_path():
+            return pruned
+
+        if vacuum and self._claim_vacuum():
+            lock = self._shared_lock if self._shared else _NullLock()
+            with lock:
+                try:
+                    self.connection.execute("VACUUM")
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"Skipping history VACUUM: {e}")
+        try:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Skipping WAL checkpoint: {e}")
+        return pruned
+
+    def _claim_vacuum(self):
+        now = time.time()
+        interval = self.vacuum_interval or 0
+        with self._transaction() as connection:
+            row = connection.execute("SELECT value FROM history_meta WHERE key = 'last_vacuum'").fetchone()
+            if row and now - float(row[0]) < interval:
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO history_meta (key, value) VALUES ('last_vacuum', ?)",
+                (str(now),),
+            )
+        return True
+
+    def _maintenance_loop(self):
+        while not self._stop_maintenance.wait(self.vacuum_interval):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"History maintenance failed: {e}")
+
     def reset(self):
-        with self.connection:
-            self.connection.execute("DROP TABLE IF EXISTS history")
-            self._create_history_table()
+        self.flush()
+        with self._transaction() as connection:
+            connection.execute("DROP TABLE IF EXISTS history")
+        self._create_history_table()
+
+    def close(self):
+        """Flush pending rows and stop the background threads."""
+        super().close()
+        if self._maintenance is not None:
+            self._stop_maintenance.set()
+            self._maintenance.join()
+            self._maintenance = None
+
+
+class _NullLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
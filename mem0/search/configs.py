@@ -0,0 +1,84 @@
+import os
+from typing import Dict
+
+from pydantic import BaseModel, Field
+
+from mem0.memory.setup import mem0_dir
+
+
+class HybridSearchConfig(BaseModel):
+    enabled: bool = Field(
+        description="Fuse dense vector search with a lexical (BM25) index of the memories' text", default=False
+    )
+    path: str = Field(
+        description="Directory holding one lexical index database per collection",
+        default=os.path.join(mem0_dir, "lexical"),
+    )
+    candidates: int = Field(description="Results fetched from each leg before fusion", default=50, ge=1)
+    rrf_k: int = Field(
+        description="Reciprocal rank fusion constant; larger values flatten the advantage of top ranks",
+        default=60,
+        ge=1,
+    )
+    vector_weight: float = Field(description="Weight of the dense ranking in the fusion", default=1.0, ge=0.0)
+    lexical_weight: float = Field(description="Weight of the lexical ranking in the fusion", default=1.0, ge=0.0)
+    busy_timeout: int = Field(
+        description="Milliseconds to wait on a lexical index locked by another process", default=30000
+    )
+
+
+class RerankConfig(BaseModel):
+    enabled: bool = Field(description="Rescore retrieved memories with a local cross-encoder", default=False)
+    model: str = Field(description="CrossEncoder model name or path", default="cross-encoder/ms-marco-MiniLM-L-6-v2")
+    candidates: int = Field(description="Memories retrieved for the cross-encoder to rescore", default=30, ge=1)
+    batch_size: int = Field(description="Query-memory pairs per inference batch", default=32, ge=1)
+    device: str = Field(description="Torch device for inference", default="cpu")
+    max_length: int = Field(description="Token limit of a query-memory pair", default=512)
+    warm_up: bool = Field(description="Run one inference when Memory is created", default=True)
+
+
+class ScoringConfig(BaseModel):
+    enabled: bool = Field(description="Re-rank memories by similarity, recency and importance", default=False)
+    similarity_weight: float = Field(
+        description="Weight of the retrieval score: cosine similarity, or the hybrid/rerank score min-max scaled "
+        "to [0, 1] over the candidates",
+        default=1.0,
+    )
+    recency_weight: float = Field(description="Weight of the exponential decay on updated_at/created_at", default=0.2)
+    importance_weight: float = Field(description="Weight of the memory's importance metadata (0-1)", default=0.1)
+    importance_key: str = Field(description="Metadata key holding a memory's importance", default="importance")
+    half_life_days: float = Field(description="Age in days at which recency halves", default=30.0, gt=0)
+    run_id_half_life_days: Dict[str, float] = Field(
+        description="Half-life in days per run_id, overriding half_life_days", default_factory=dict
+    )
+    candidates: int = Field(description="Memories retrieved for re-ranking", default=50, ge=1)
+    push_down: bool = Field(
+        description="Compute the score in the vector store with a formula query where supported (Qdrant)",
+        default=True,
+    )
+
+
+class DiversityConfig(BaseModel):
+    enabled: bool = Field(
+        description="Diversify results with maximal marginal relevance, so near-paraphrases do not crowd them out",
+        default=False,
+    )
+    lambda_mult: float = Field(
+        description="Trade-off between relevance (1.0) and diversity (0.0)", default=0.5, ge=0.0, le=1.0
+    )
+    candidates: int = Field(description="Memories considered for selection; bounds the cost", default=30, ge=1)
+
+
+class SearchConfig(BaseModel):
+    hybrid: HybridSearchConfig = Field(
+        description="Lexical + vector retrieval for Memory.search", default_factory=HybridSearchConfig
+    )
+    rerank: RerankConfig = Field(
+        description="Cross-encoder rerank stage for Memory.search", default_factory=RerankConfig
+    )
+    scoring: ScoringConfig = Field(
+        description="Recency- and importance-weighted scoring for Memory.search", default_factory=ScoringConfig
+    )
+    diversity: DiversityConfig = Field(
+        description="MMR diversification of Memory.search results", default_factory=DiversityConfig
+    )
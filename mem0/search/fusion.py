@@ -0,0 +1,41 @@
+def reciprocal_rank_fusion(rankings, k=60, weights=None, limit=None):
+    """
+    Merge ranked id lists with reciprocal rank fusion: an id scores sum(weight / (k + rank)) over the rankings
+    it appears in, ranks starting at 1. Only positions are used, so BM25 and cosine scores never need to be put
+    on a common scale.
+
+    Args:
+        rankings (list): Lists of ids, best first.
+        k (int): Smoothing constant; larger values flatten the advantage of top ranks.
+        weights (list, optional): One weight per ranking. Defaults to 1 each.
+        limit (int, optional): Number of fused results to return. Defaults to all.
+
+    Returns:
+        list: (id, fused score) pairs, best first. Ties keep the order in which ids were first seen.
+    """
+    weights = weights if weights is not None else [1.0] * len(rankings)
+    scores = {}
+    for ranking, weight in zip(rankings, weights):
+        if not weight:
+            continue
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return fused[:limit] if limit is not None else fused
+
+
+def matches_filters(payload, filters):
+    """
+    Whether a payload satisfies search filters in the vector store format: equality, or {"gte", "lte"} ranges.
+    Used for hits that come from an index which only knows the user_id/agent_id/run_id scope.
+    """
+    for key, value in (filters or {}).items():
+        if key not in payload:
+            return False
+        if isinstance(value, dict) and "gte" in value and "lte" in value:
+            if not value["gte"] <= payload[key] <= value["lte"]:
+                return False
+        elif payload[key] != value:
+            return False
+    return True
@@ -0,0 +1,182 @@
+import logging
+import re
+import sqlite3
+import threading
+
+from mem0.graphs.schema import SCOPE_KEYS
+
+logger = logging.getLogger(__name__)
+
+# Matches FTS5's unicode61 tokenizer: runs of letters and digits, so ":Boo39FairyBoo:" is the token
+# "boo39fairyboo" and a wallet address is one token.
+_TOKEN = re.compile(r"[^\W_]+")
+
+_CREATE_DOCS = """
+    CREATE TABLE IF NOT EXISTS lexical_docs (
+        rowid INTEGER PRIMARY KEY,
+        memory_id TEXT UNIQUE NOT NULL,
+        user_id TEXT,
+        agent_id TEXT,
+        run_id TEXT
+    )
+"""
+
+_CREATE_FTS = "CREATE VIRTUAL TABLE IF NOT EXISTS lexical_fts USING fts5(data, tokenize = 'unicode61')"
+
+_DOC_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS lexical_docs_user_id ON lexical_docs (user_id)",
+    "CREATE INDEX IF NOT EXISTS lexical_docs_agent_id ON lexical_docs (agent_id)",
+    "CREATE INDEX IF NOT EXISTS lexical_docs_run_id ON lexical_docs (run_id)",
+]
+
+
+class LexicalIndex:
+    def __init__(self, db_path, busy_timeout=30000):
+        """
+        BM25 inverted index over memory texts, kept in an SQLite FTS5 table next to a document table that maps
+        memory ids and scopes to FTS rows. Writes are incremental (one small transaction per add, update or
+        delete) and the file is shared safely between processes in WAL mode.
+
+        Args:
+            db_path (str): Database file, or ":memory:".
+            busy_timeout (int): Milliseconds to wait on a database locked by another process.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            db_path, check_same_thread=False, timeout=busy_timeout / 1000, isolation_level=None
+        )
+        self.connection.execute(f"PRAGMA busy_timeout = {int(busy_timeout)}")
+        if db_path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        with self._transaction() as connection:
+            connection.execute(_CREATE_DOCS)
+            connection.execute(_CREATE_FTS)
+            for statement in _DOC_INDEXES:
+                connection.execute(statement)
+
+    def _transaction(self):
+        return _Transaction(self._lock, self.connection)
+
+    def upsert(self, items):
+        """
+        Index or re-index memories.
+
+        Args:
+            items (list): (memory_id, text, payload) tuples; the payload supplies user_id/agent_id/run_id.
+        """
+        if not items:
+            return
+        with self._transaction() as connection:
+            for memory_id, text, payload in items:
+                self._remove(connection, str(memory_id))
+                cursor = connection.execute(
+                    "INSERT INTO lexical_docs (memory_id, user_id, agent_id, run_id) VALUES (?, ?, ?, ?)",
+                    (str(memory_id), *(payload.get(key) for key in SCOPE_KEYS)),
+                )
+                connection.execute(
+                    "INSERT INTO lexical_fts (rowid, data) VALUES (?, ?)", (cursor.lastrowid, text or "")
+                )
+
+    def delete(self, memory_ids):
+        """Remove memories from the index; unknown ids are ignored."""
+        if not memory_ids:
+            return
+        with self._transaction() as connection:
+            for memory_id in memory_ids:
+                self._remove(connection, str(memory_id))
+
+    def delete_by_filter(self, filters):
+        """Remove every memory whose user_id/agent_id/run_id match `filters`. Returns the number removed."""
+        conditions, params = self._scope_conditions(filters)
+        if not conditions:
+            raise ValueError("Refusing to delete from the lexical index without any filter.")
+        where = " AND ".join(conditions)
+        with self._transaction() as connection:
+            connection.execute(
+                f"DELETE FROM lexical_fts WHERE rowid IN (SELECT rowid FROM lexical_docs WHERE {where})", params
+            )
+            return connection.execute(f"DELETE FROM lexical_docs WHERE {where}", params).rowcount
+
+    def search(self, query, filters, limit):
+        """
+        Rank the scope's memories against the query terms with BM25.
+
+        Terms are OR-ed, so a memory containing any one rare token (a name, an id) is found.
+
+        Returns:
+            list: (memory_id, score) pairs, best first; higher scores are better.
+        """
+        terms = list(dict.fromkeys(_TOKEN.findall(query.lower())))
+        if not terms:
+            return []
+        match = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        conditions, params = self._scope_conditions(filters, alias="d")
+        where = "".join(f" AND {condition}" for condition in conditions)
+
+        with self._lock:
+            rows = self.connection.execute(
+                f"""
+                SELECT d.memory_id, bm25(lexical_fts) AS rank
+                FROM lexical_fts JOIN lexical_docs d ON d.rowid = lexical_fts.rowid
+                WHERE lexical_fts MATCH ?{where}
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, *params, limit),
+            ).fetchall()
+        # FTS5's bm25() is negated so that ascending order is best first.
+        return [(memory_id, -rank) for memory_id, rank in rows]
+
+    def count(self):
+        with self._lock:
+            return self.connection.execute("SELECT count(*) FROM lexical_docs").fetchone()[0]
+
+    def reset(self):
+        """Remove every memory from the index."""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM lexical_fts")
+            connection.execute("DELETE FROM lexical_docs")
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    @staticmethod
+    def _remove(connection, memory_id):
+        row = connection.execute("SELECT rowid FROM lexical_docs WHERE memory_id = ?", (memory_id,)).fetchone()
+        if row:
+            connection.execute("DELETE FROM lexical_fts WHERE rowid = ?", row)
+            connection.execute("DELETE FROM lexical_docs WHERE rowid = ?", row)
+
+    @staticmethod
+    def _scope_conditions(filters, alias=None):
+        prefix = f"{alias}." if alias else ""
+        conditions, params = [], []
+        for key in SCOPE_KEYS:
+            if filters and filters.get(key) is not None:
+                conditions.append(f"{prefix}{key} = ?")
+                params.append(filters[key])
+        return conditions, params
+
+
+class _Transaction:
+    def __init__(self, lock, connection):
+        self.lock = lock
+        self.connection = connection
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+def maximal_marginal_relevance(relevance, vectors, k, lambda_mult=0.5):
+    """
+    Pick `k` candidates that are relevant but not redundant: each step takes the candidate maximising
+
+        lambda_mult * relevance - (1 - lambda_mult) * max cosine similarity to the candidates already picked
+
+    The pairwise similarities are one matrix product over the candidates, and each step updates a running
+    maximum instead of rescanning the selection, so the cost is O(n^2 d + k n) for n candidates.
+
+    Args:
+        relevance (list): One relevance score per candidate, any scale; min-max normalised to [0, 1].
+        vectors (list): One embedding per candidate.
+        k (int): Number of candidates to pick.
+        lambda_mult (float): 1 ranks by relevance alone, 0 by diversity alone.
+
+    Returns:
+        list: Positions of the picked candidates, in pick order.
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    count = len(relevance)
+    k = min(k, count)
+    if k <= 0:
+        return []
+
+    spread = relevance.max() - relevance.min()
+    relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones(count, dtype=np.float32)
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1.0)
+    similarity = vectors @ vectors.T
+
+    picked = [int(np.argmax(relevance))]
+    max_similarity = similarity[picked[0]].copy()
+    available = np.ones(count, dtype=bool)
+    available[picked[0]] = False
+    for _ in range(1, k):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        position = int(np.argmax(scores))
+        picked.append(position)
+        available[position] = False
+        np.maximum(max_similarity, similarity[position], out=max_similarity)
+    return picked
@@ -0,0 +1,57 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    def __init__(self, model, batch_size=32, device="cpu", max_length=512):
+        """
+        Rescores search candidates with a local sentence_transformers CrossEncoder, which reads the query and the
+        memory together and so ranks far more precisely than the embedding similarity that fetched them.
+
+        Args:
+            model (str): Hugging Face model name or local path.
+            batch_size (int): Query-memory pairs per forward pass.
+            device (str): Torch device to run inference on.
+            max_length (int): Token limit of a query-memory pair; longer pairs are truncated.
+        """
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise ImportError(
+                "sentence_transformers is not installed. Please install it using 'pip install sentence-transformers'"
+            )
+        self.model = CrossEncoder(model, device=device, max_length=max_length)
+        self.batch_size = batch_size
+
+    def warm_up(self):
+        """Run one inference, so the first search does not pay for lazy initialisation."""
+        self.model.predict([("warm up", "warm up")], batch_size=1, show_progress_bar=False)
+
+    def rerank(self, query, memories, limit):
+        """
+        Return the best `limit` memories, best first, with "score" replaced by the cross-encoder score.
+
+        Args:
+            query (str): Search query.
+            memories (list): Memory dicts with a "memory" text, as built by Memory.search.
+            limit (int): Number of memories to return.
+        """
+        if not memories or limit <= 0:
+            return []
+
+        scores = np.asarray(
+            self.model.predict(
+                [(query, memory["memory"]) for memory in memories],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ),
+            dtype=np.float64,
+        )
+        k = min(limit, len(memories))
+        order = np.argpartition(-scores, k - 1)[:k]
+        order = order[np.argsort(-scores[order], kind="stable")]
+        return [{**memories[position], "score": float(scores[position])} for position in order]
@@ -0,0 +1,100 @@
+import time
+from datetime import datetime
+
+import numpy as np
+
+_DAY_SECONDS = 86400.0
+
+
+def _timestamp(value):
+    if not value:
+        return np.nan
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class RecencyScorer:
+    def __init__(
+        self,
+        similarity_weight=1.0,
+        recency_weight=0.2,
+        importance_weight=0.1,
+        importance_key="importance",
+        half_life_days=30.0,
+        run_id_half_life_days=None,
+        candidates=50,
+    ):
+        """
+        Re-ranks search candidates by
+
+            similarity_weight * score
+            + recency_weight * 0.5 ^ (age_days / half_life_days)
+            + importance_weight * metadata[importance_key]
+
+        where age is measured from updated_at, or created_at for memories never updated, and the half-life can be
+        set per run_id (e.g. short for "session" runs, long for "general_knowledge"). Memories without a
+        timestamp get no recency credit and memories without an importance get none for it.
+
+        Args:
+            similarity_weight (float): Weight of the preceding stage's score (see `rescore`'s `normalize`).
+            recency_weight (float): Weight of the exponential time decay.
+            importance_weight (float): Weight of the importance value, expected in [0, 1].
+            importance_key (str): Metadata key holding the importance.
+            half_life_days (float): Half-life for run_ids without their own.
+            run_id_half_life_days (dict, optional): Half-life in days per run_id.
+            candidates (int): Memories retrieved for the scorer to re-rank.
+        """
+        self.similarity_weight = similarity_weight
+        self.recency_weight = recency_weight
+        self.importance_weight = importance_weight
+        self.importance_key = importance_key
+        self.half_life_days = half_life_days
+        self.run_id_half_life_days = run_id_half_life_days or {}
+        self.candidates = candidates
+
+    def half_life_for(self, run_id):
+        return self.run_id_half_life_days.get(run_id, self.half_life_days)
+
+    def rescore(self, query, memories, limit, normalize=False):
+        """
+        Return the best `limit` memories, best first, with "score" replaced by the weighted score.
+
+        Args:
+            query (str): Search query; unused, the stage works from the candidates' scores.
+            memories (list): Memory dicts as built by Memory.search.
+            limit (int): Number of memories to return.
+            normalize (bool): Min-max scale the scores to [0, 1] over the candidates first. Needed when they are
+                not cosine similarities (fusion scores, cross-encoder logits), whose scale the weights do not fit.
+        """
+        if not memories or limit <= 0:
+            return []
+
+        similarity = np.array([memory.get("score") or 0.0 for memory in memories])
+        if normalize:
+            spread = similarity.max() - similarity.min()
+            similarity = (similarity - similarity.min()) / spread if spread > 0 else np.ones(len(memories))
+        timestamps = np.array([_timestamp(memory.get("updated_at") or memory.get("created_at")) for memory in memories])
+        half_lives = np.array([self.half_life_for(memory.get("run_id")) for memory in memories]) * _DAY_SECONDS
+        importance = np.array(
+            [_number((memory.get("metadata") or {}).get(self.importance_key)) for memory in memories]
+        )
+
+        ages = np.abs(time.time() - timestamps)
+        recency = np.where(np.isnan(ages), 0.0, np.power(0.5, np.nan_to_num(ages) / half_lives))
+        scores = (
+            self.similarity_weight * similarity + self.recency_weight * recency + self.importance_weight * importance
+        )
+
+        k = min(limit, len(memories))
+        order = np.argpartition(-scores, k - 1)[:k]
+        order = order[np.argsort(-scores[order], kind="stable")]
+        return [{**memories[position], "score": float(scores[position])} for position in order]
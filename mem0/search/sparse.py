@@ -0,0 +1,47 @@
+import zlib
+from collections import Counter
+
+from mem0.search.lexical import _TOKEN
+
+
+class SparseEncoder:
+    def __init__(self, k1=1.2, b=0.75, avg_length=16):
+        """
+        BM25 term weights as sparse vectors, computed locally without a model.
+
+        Documents carry the saturated, length-normalised term frequency of each token; queries carry 1 per
+        distinct token. The inverse document frequency is left to the vector store (Qdrant's IDF modifier),
+        which keeps it current as the collection grows. Tokens are hashed to 32-bit indices, so there is no
+        vocabulary to persist.
+
+        Args:
+            k1 (float): Term-frequency saturation.
+            b (float): Length normalisation.
+            avg_length (int): Assumed average document length in tokens; memories are short facts.
+        """
+        self.k1 = k1
+        self.b = b
+        self.avg_length = avg_length
+
+    @staticmethod
+    def _index(token):
+        return zlib.crc32(token.encode())
+
+    def encode_document(self, text):
+        """
+        Returns:
+            tuple: (indices, values) lists for the text's tokens; both empty for text without tokens.
+        """
+        counts = Counter(_TOKEN.findall((text or "").lower()))
+        if not counts:
+            return [], []
+        length_norm = self.k1 * (1 - self.b + self.b * sum(counts.values()) / self.avg_length)
+        weights = {}
+        for token, count in counts.items():
+            index = self._index(token)
+            weights[index] = weights.get(index, 0.0) + count * (self.k1 + 1) / (count + length_norm)
+        return list(weights), list(weights.values())
+
+    def encode_query(self, text):
+        indices = list(dict.fromkeys(self._index(token) for token in _TOKEN.findall((text or "").lower())))
+        return indices, [1.0] * len(indices)
@@ -78,3 +78,72 @@ class VectorStoreFactory:
             return vector_store_instance(**config)
         else:
             raise ValueError(f"Unsupported VectorStore provider: {provider_name}")
+
+
+class HistoryStoreFactory:
+    provider_to_class = {
+        "sqlite": "mem0.memory.storage.SQLiteManager",
+        "postgres": "mem0.history_stores.postgres.PostgresHistoryStore",
+    }
+
+    @classmethod
+    def create(cls, provider_name, config):
+        class_type = cls.provider_to_class.get(provider_name)
+        if class_type:
+            if not isinstance(config, dict):
+                config = config.model_dump()
+            history_store_instance = load_class(class_type)
+            return history_store_instance(**config)
+        else:
+            raise ValueError(f"Unsupported HistoryStore provider: {provider_name}")
+
+
+class LockManagerFactory:
+    provider_to_class = {
+        "local": "mem0.locks.local.LocalLockManager",
+        "file": "mem0.locks.file.FileLockManager",
+        "postgres": "mem0.locks.postgres.PostgresLockManager",
+    }
+
+    @classmethod
+    def create(cls, provider_name, config):
+        class_type = cls.provider_to_class.get(provider_name)
+        if class_type:
+            if not isinstance(config, dict):
+                config = config.model_dump()
+            lock_manager_instance = load_class(class_type)
+            return lock_manager_instance(**config)
+        else:
+            raise ValueError(f"Unsupported LockManager provider: {provider_name}")
+
+
+class GraphRerankerFactory:
+    provider_to_class = {
+        "fusion": "mem0.graphs.rerankers.FusionReranker",
+        "bm25": "mem0.graphs.rerankers.BM25Reranker",
+    }
+
+    @classmethod
+    def create(cls, provider_name, config):
+        class_type = cls.provider_to_class.get(provider_name)
+        if class_type:
+            reranker_instance = load_class(class_type)
+            return reranker_instance(**(config or {}))
+        else:
+            raise ValueError(f"Unsupported GraphReranker provider: {provider_name}")
+
+
+class GraphStoreFactory:
+    provider_to_class = {
+        "neo4j": "mem0.memory.graph_memory.MemoryGraph",
+        "embedded": "mem0.memory.embedded_graph_memory.EmbeddedMemoryGraph",
+    }
+
+    @classmethod
+    def create(cls, provider_name, config, lock_manager=None):
+        class_type = cls.provider_to_class.get(provider_name)
+        if class_type:
+            graph_instance = load_class(class_type)
+            return graph_instance(config, lock_manager=lock_manager)
+        else:
+            raise ValueError(f"Unsupported GraphStore provider: {provider_name}")
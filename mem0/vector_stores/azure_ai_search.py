@@ -174,6 +174,80 @@ class AzureAISearch(VectorStoreBase):
             return None
         return OutputData(id=result["id"], score=None, payload=json.loads(result["payload"]))
 
+    def get_many(self, vector_ids) -> List[OutputData]:
+        """Retrieve several vectors by ID with a single filtered query.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[OutputData]: Retrieved vectors. Missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        id_list = ",".join(vector_ids)
+        search_results = self.search_client.search(
+            search_text="*",
+            filter=f"search.in(id, '{id_list}', ',')",
+            select=["id", "payload"],
+            top=len(vector_ids),
+        )
+        return [
+            OutputData(id=result["id"], score=None, payload=json.loads(result["payload"])) for result in search_results
+        ]
+
+    def update_many(self, vector_ids, vectors=None, payloads=None):
+        """Update several vectors and their payloads in a single batch.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (List[List[float]], optional): Updated vectors.
+            payloads (List[Dict], optional): Updated payloads.
+        """
+        if not vector_ids:
+            return
+        documents = []
+        for idx, vector_id in enumerate(vector_ids):
+            document = {"id": vector_id}
+            if vectors and vectors[idx]:
+                document["vector"] = vectors[idx]
+            if payloads and payloads[idx]:
+                document["payload"] = json.dumps(payloads[idx])
+            documents.append(document)
+        self.search_client.merge_or_upload_documents(documents=documents)
+
+    def delete_many(self, vector_ids):
+        """Delete several vectors by ID in a single batch.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        self.search_client.delete_documents(documents=[{"id": vector_id} for vector_id in vector_ids])
+
+    def delete_by_filter(self, filters) -> int:
+        """Delete every vector whose payload matches the filters.
+
+        The payload is stored as a JSON string, so matching happens client-side while paging through the index.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        if not filters:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        ids = []
+        for result in self.search_client.search(search_text="*", select=["id", "payload"]):
+            payload = json.loads(result["payload"])
+            if all(payload.get(key) == value for key, value in filters.items()):
+                ids.append(result["id"])
+        for start in range(0, len(ids), 1000):
+            self.delete_many(ids[start : start + 1000])
+        return len(ids)
+
     def list_cols(self) -> List[str]:
         """List all collections (indexes).
 
@@ -2,6 +2,13 @@ from abc import ABC, abstractmethod
 
 
 class VectorStoreBase(ABC):
+    # Whether search() also accepts the query text (query_text=...) for lexical matching.
+    supports_text_query = False
+    # Whether search() can apply a RecencyScorer itself (scorer=...) instead of Memory re-ranking candidates.
+    supports_score_formula = False
+    # Whether search() can return each hit's embedding (with_vectors=True).
+    supports_with_vectors = False
+
     @abstractmethod
     def create_col(self, name, vector_size, distance):
         """Create a new collection."""
@@ -51,3 +58,85 @@ class VectorStoreBase(ABC):
     def list(self, filters=None, limit=None):
         """List all memories."""
         pass
+
+    def get_many(self, vector_ids):
+        """
+        Retrieve several vectors by ID.
+
+        Adapters should override this with a single round trip; the default falls back to one `get` per ID.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+
+        Returns:
+            list: Retrieved vectors, in no particular order. Missing IDs are skipped.
+        """
+        results = []
+        for vector_id in vector_ids:
+            try:
+                result = self.get(vector_id=vector_id)
+            except Exception:
+                result = None
+            if result:
+                results.append(result)
+        return results
+
+    def update_many(self, vector_ids, vectors=None, payloads=None):
+        """
+        Update several vectors and their payloads. A missing (None) vector or payload keeps the stored one, so
+        payload-only and vector-only updates are both supported.
+
+        Args:
+            vector_ids (list): IDs of the vectors to update.
+            vectors (list, optional): Updated vectors, aligned with `vector_ids`.
+            payloads (list, optional): Updated payloads, aligned with `vector_ids`.
+        """
+        for idx, vector_id in enumerate(vector_ids):
+            self.update(
+                vector_id=vector_id,
+                vector=vectors[idx] if vectors else None,
+                payload=payloads[idx] if payloads else None,
+            )
+
+    def delete_many(self, vector_ids):
+        """
+        Delete several vectors by ID.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        for vector_id in vector_ids:
+            self.delete(vector_id=vector_id)
+
+    def scroll(self, filters=None, batch_size=1000):
+        """
+        Iterate over every vector matching the filters, one page at a time.
+
+        Adapters should override this with native pagination; the default lists everything in one page.
+
+        Args:
+            filters (dict, optional): Payload filters.
+            batch_size (int, optional): Page size. Defaults to 1000.
+
+        Yields:
+            list: Pages of vectors with their payloads.
+        """
+        memories = self.list(filters=filters, limit=None)[0]
+        if memories:
+            yield memories
+
+    def delete_by_filter(self, filters):
+        """
+        Delete every vector whose payload matches `filters`.
+
+        Args:
+            filters (dict): Payload filters, e.g. user_id/agent_id/run_id.
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        if not filters:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        memories = self.list(filters=filters, limit=None)[0]
+        self.delete_many([memory.id for memory in memories])
+        return len(memories)
@@ -187,6 +187,106 @@ class ChromaDB(VectorStoreBase):
         result = self.collection.get(ids=[vector_id])
         return self._parse_output(result)[0]
 
+    def get_many(self, vector_ids: List[str]) -> List[OutputData]:
+        """
+        Retrieve several vectors by ID in a single request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[OutputData]: Retrieved vectors. Missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        result = self.collection.get(ids=list(vector_ids))
+        return [entry for entry in self._parse_output(result) if entry.id is not None]
+
+    def update_many(
+        self,
+        vector_ids: List[str],
+        vectors: Optional[List[List[float]]] = None,
+        payloads: Optional[List[Dict]] = None,
+    ):
+        """
+        Update several vectors and their payloads in a single request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (Optional[List[List[float]]], optional): Updated vectors. Defaults to None.
+            payloads (Optional[List[Dict]], optional): Updated payloads. Defaults to None.
+        """
+        if not vector_ids:
+            return
+        self.collection.update(ids=list(vector_ids), embeddings=vectors, metadatas=payloads)
+
+    def delete_many(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID in a single request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        self.collection.delete(ids=list(vector_ids))
+
+    def _generate_where_clause(self, filters: Dict) -> Dict:
+        """
+        Build a Chroma `where` clause, combining several keys with `$and`.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            Dict: Chroma where clause.
+        """
+        if len(filters) <= 1:
+            return filters
+        return {"$and": [{key: value} for key, value in filters.items()]}
+
+    def scroll(self, filters: Optional[Dict] = None, batch_size: int = 1000):
+        """
+        Iterate over every vector matching the filters, one page at a time.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply. Defaults to None.
+            batch_size (int, optional): Page size. Defaults to 1000.
+
+        Yields:
+            List[OutputData]: Pages of vectors with their payloads.
+        """
+        where = self._generate_where_clause(filters) if filters else None
+        offset = 0
+        while True:
+            results = self._parse_output(self.collection.get(where=where, limit=batch_size, offset=offset))
+            results = [entry for entry in results if entry.id is not None]
+            if not results:
+                break
+            yield results
+            if len(results) < batch_size:
+                break
+            offset += batch_size
+
+    def delete_by_filter(self, filters: Dict) -> int:
+        """
+        Delete every vector matching the filters.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        if not filters:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        where = self._generate_where_clause(filters)
+        matched = self.collection.get(where=where, include=[])
+        ids = matched.get("ids", [])
+        if ids:
+            self.collection.delete(ids=ids)
+        return len(ids)
+
     def list_cols(self) -> List[chromadb.Collection]:
         """
         List all collections.
@@ -172,11 +172,10 @@ class MilvusDB(VectorStoreBase):
 
         Args:
             vector_id (str): ID of the vector to update.
-            vector (List[float], optional): Updated vector.
-            payload (Dict, optional): Updated payload.
+            vector (List[float], optional): Updated vector. Keeps the stored vector if None.
+            payload (Dict, optional): Updated payload. Keeps the stored payload if None.
         """
-        schema = {"id": vector_id, "vectors": vector, "metadata": payload}
-        self.client.upsert(collection_name=self.collection_name, data=schema)
+        self.update_many([vector_id], [vector], [payload])
 
     def get(self, vector_id):
         """
@@ -196,6 +195,118 @@ class MilvusDB(VectorStoreBase):
         )
         return output
 
+    def get_many(self, vector_ids):
+        """
+        Retrieve several vectors by ID in a single request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[OutputData]: Retrieved vectors. Missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        result = self.client.get(collection_name=self.collection_name, ids=list(vector_ids))
+        return [OutputData(id=data.get("id"), score=None, payload=data.get("metadata")) for data in result]
+
+    def update_many(self, vector_ids, vectors=None, payloads=None):
+        """
+        Update several vectors and their payloads in a single upsert.
+
+        Milvus upserts replace whole entities, so the stored vector or payload of entities given only one of
+        them is fetched first, in one request, and written back unchanged.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (List[List[float]], optional): Updated vectors.
+            payloads (List[Dict], optional): Updated payloads.
+        """
+        if not vector_ids:
+            return
+        data = [
+            {
+                "id": vector_id,
+                "vectors": vectors[idx] if vectors else None,
+                "metadata": payloads[idx] if payloads else None,
+            }
+            for idx, vector_id in enumerate(vector_ids)
+        ]
+        incomplete = [entity["id"] for entity in data if entity["vectors"] is None or entity["metadata"] is None]
+        if incomplete:
+            stored = {
+                entity["id"]: entity
+                for entity in self.client.get(
+                    collection_name=self.collection_name, ids=incomplete, output_fields=["vectors", "metadata"]
+                )
+            }
+            missing = [vector_id for vector_id in incomplete if vector_id not in stored]
+            if missing:
+                raise ValueError(f"Cannot partially update missing vectors {missing}")
+            for entity in data:
+                if entity["id"] in stored:
+                    for field in ("vectors", "metadata"):
+                        if entity[field] is None:
+                            entity[field] = stored[entity["id"]][field]
+        self.client.upsert(collection_name=self.collection_name, data=data)
+
+    def delete_many(self, vector_ids):
+        """
+        Delete several vectors by ID in a single request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        self.client.delete(collection_name=self.collection_name, ids=list(vector_ids))
+
+    def scroll(self, filters: dict = None, batch_size: int = 1000):
+        """
+        Iterate over every vector matching the filters, one page at a time.
+
+        Args:
+            filters (Dict, optional): Filters to apply.
+            batch_size (int, optional): Page size. Defaults to 1000.
+
+        Yields:
+            List[OutputData]: Pages of vectors with their payloads.
+        """
+        query_filter = self._create_filter(filters) if filters else ""
+        offset = 0
+        while True:
+            result = self.client.query(
+                collection_name=self.collection_name,
+                filter=query_filter,
+                output_fields=["id", "metadata"],
+                limit=batch_size,
+                offset=offset,
+            )
+            if not result:
+                break
+            yield [OutputData(id=data.get("id"), score=None, payload=data.get("metadata")) for data in result]
+            if len(result) < batch_size:
+                break
+            offset += batch_size
+
+    def delete_by_filter(self, filters: dict) -> int:
+        """
+        Delete every vector matching the filters with a server-side delete expression.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        query_filter = self._create_filter(filters) if filters else None
+        if not query_filter:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        result = self.client.delete(collection_name=self.collection_name, filter=query_filter)
+        if isinstance(result, dict):
+            return result.get("delete_count", 0)
+        return len(result) if result else 0
+
     def list_cols(self):
         """
         List all collections.
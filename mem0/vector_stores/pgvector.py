@@ -110,17 +110,15 @@ class PGVector(VectorStoreBase):
         )
         self.conn.commit()
 
-    def search(self, query, limit=5, filters=None):
+    def _create_filter(self, filters):
         """
-        Search for similar vectors.
+        Build a WHERE clause over payload keys.
 
         Args:
-            query (List[float]): Query vector.
-            limit (int, optional): Number of results to return. Defaults to 5.
-            filters (Dict, optional): Filters to apply to the search. Defaults to None.
+            filters (Dict, optional): Filters to apply.
 
         Returns:
-            list: Search results.
+            tuple: The WHERE clause (empty if no filters) and its parameters.
         """
         filter_conditions = []
         filter_params = []
@@ -131,6 +129,21 @@ class PGVector(VectorStoreBase):
                 filter_params.extend([k, str(v)])
 
         filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        return filter_clause, filter_params
+
+    def search(self, query, limit=5, filters=None):
+        """
+        Search for similar vectors.
+
+        Args:
+            query (List[float]): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Dict, optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            list: Search results.
+        """
+        filter_clause, filter_params = self._create_filter(filters)
 
         self.cur.execute(
             f"""
@@ -196,6 +209,122 @@ class PGVector(VectorStoreBase):
             return None
         return OutputData(id=str(result[0]), score=None, payload=result[2])
 
+    def get_many(self, vector_ids):
+        """
+        Retrieve several vectors by ID in a single query.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to retrieve.
+
+        Returns:
+            List[OutputData]: Retrieved vectors. Missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        self.cur.execute(
+            f"SELECT id, payload FROM {self.collection_name} WHERE id = ANY(%s::uuid[])",
+            (list(vector_ids),),
+        )
+        return [OutputData(id=str(r[0]), score=None, payload=r[1]) for r in self.cur.fetchall()]
+
+    def update_many(self, vector_ids, vectors=None, payloads=None):
+        """
+        Update several vectors and their payloads in a single statement.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (List[List[float]], optional): Updated vectors. A missing (None) vector keeps the stored one.
+            payloads (List[Dict], optional): Updated payloads. A missing (None) payload keeps the stored one.
+        """
+        if not vector_ids:
+            return
+        data = [
+            (
+                vector_id,
+                str(vectors[idx]) if vectors and vectors[idx] is not None else None,
+                json.dumps(payloads[idx]) if payloads and payloads[idx] is not None else None,
+            )
+            for idx, vector_id in enumerate(vector_ids)
+        ]
+        execute_values(
+            self.cur,
+            f"""
+            UPDATE {self.collection_name} AS t
+            SET vector = COALESCE(v.vector::vector, t.vector),
+                payload = COALESCE(v.payload::jsonb, t.payload)
+            FROM (VALUES %s) AS v (id, vector, payload)
+            WHERE t.id = v.id::uuid
+            """,
+            data,
+        )
+        self.conn.commit()
+
+    def delete_many(self, vector_ids):
+        """
+        Delete several vectors by ID in a single statement.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        self.cur.execute(
+            f"DELETE FROM {self.collection_name} WHERE id = ANY(%s::uuid[])",
+            (list(vector_ids),),
+        )
+        self.conn.commit()
+
+    def scroll(self, filters=None, batch_size=1000):
+        """
+        Iterate over every vector matching the filters with keyset pagination on the primary key.
+
+        Args:
+            filters (Dict, optional): Filters to apply.
+            batch_size (int, optional): Page size. Defaults to 1000.
+
+        Yields:
+            List[OutputData]: Pages of vectors with their payloads.
+        """
+        filter_clause, filter_params = self._create_filter(filters)
+        keyset_clause = "AND id > %s" if filter_clause else "WHERE id > %s"
+        last_id = "00000000-0000-0000-0000-000000000000"
+        while True:
+            self.cur.execute(
+                f"""
+                SELECT id, payload
+                FROM {self.collection_name}
+                {filter_clause} {keyset_clause}
+                ORDER BY id
+                LIMIT %s
+            """,
+                (*filter_params, last_id, batch_size),
+            )
+            rows = self.cur.fetchall()
+            if not rows:
+                break
+            yield [OutputData(id=str(r[0]), score=None, payload=r[1]) for r in rows]
+            if len(rows) < batch_size:
+                break
+            last_id = str(rows[-1][0])
+
+    def delete_by_filter(self, filters):
+        """
+        Delete every vector matching the filters with a single DELETE ... WHERE.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        filter_clause, filter_params = self._create_filter(filters)
+        if not filter_clause:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        self.cur.execute(f"DELETE FROM {self.collection_name} {filter_clause}", filter_params)
+        deleted = self.cur.rowcount
+        self.conn.commit()
+        return deleted
+
     def list_cols(self) -> List[str]:
         """
         List all collections.
@@ -243,15 +372,7 @@ class PGVector(VectorStoreBase):
         Returns:
             List[OutputData]: List of vectors.
         """
-        filter_conditions = []
-        filter_params = []
-
-        if filters:
-            for k, v in filters.items():
-                filter_conditions.append("payload->>%s = %s")
-                filter_params.extend([k, str(v)])
-
-        filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        filter_clause, filter_params = self._create_filter(filters)
 
         query = f"""
             SELECT id, vector, payload
@@ -1,23 +1,51 @@
 import logging
 import os
 import shutil
+from datetime import datetime, timezone
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    DatetimeExpression,
+    DatetimeKeyExpression,
+    DecayParamsExpression,
     Distance,
+    ExpDecayExpression,
     FieldCondition,
     Filter,
+    FilterSelector,
+    FormulaQuery,
+    Fusion,
+    FusionQuery,
+    IsEmptyCondition,
     MatchValue,
+    Modifier,
+    MultExpression,
+    OverwritePayloadOperation,
+    PayloadField,
     PointIdsList,
     PointStruct,
+    PointsList,
+    PointVectors,
+    Prefetch,
     Range,
+    SetPayload,
+    SparseVector,
+    SparseVectorParams,
+    SumExpression,
+    UpdateVectors,
+    UpdateVectorsOperation,
+    UpsertOperation,
     VectorParams,
 )
 
+from mem0.search.sparse import SparseEncoder
 from mem0.vector_stores.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+DENSE_VECTOR = "dense"
+SPARSE_VECTOR = "sparse"
+
 
 class Qdrant(VectorStoreBase):
     def __init__(
@@ -31,6 +59,9 @@ class Qdrant(VectorStoreBase):
         url: str = None,
         api_key: str = None,
         on_disk: bool = False,
+        sparse: bool = False,
+        fusion: str = "rrf",
+        prefetch_limit: int = 50,
     ):
         """
         Initialize the Qdrant vector store.
@@ -45,6 +76,9 @@ class Qdrant(VectorStoreBase):
             url (str, optional): Full URL for Qdrant server. Defaults to None.
             api_key (str, optional): API key for Qdrant server. Defaults to None.
             on_disk (bool, optional): Enables persistent storage. Defaults to False.
+            sparse (bool, optional): Use named dense + BM25 sparse vectors, fused at search time. Defaults to False.
+            fusion (str, optional): "rrf" or "dbsf", how sparse collections fuse the two searches. Defaults to "rrf".
+            prefetch_limit (int, optional): Candidates per vector before fusion. Defaults to 50.
         """
         if client:
             self.client = client
@@ -66,6 +100,13 @@ class Qdrant(VectorStoreBase):
             self.client = QdrantClient(**params)
 
         self.collection_name = collection_name
+        self.sparse_encoder = SparseEncoder() if sparse else None
+        self.supports_text_query = sparse
+        # Sparse collections already fuse in query_points; their fusion scores are not similarities to weight.
+        self.supports_score_formula = not sparse
+        self.supports_with_vectors = True
+        self.fusion = Fusion.DBSF if fusion == "dbsf" else Fusion.RRF
+        self.prefetch_limit = prefetch_limit
         self.create_col(embedding_model_dims, on_disk)
 
     def create_col(self, vector_size: int, on_disk: bool, distance: Distance = Distance.COSINE):
@@ -82,13 +123,37 @@ class Qdrant(VectorStoreBase):
         for collection in response.collections:
             if collection.name == self.collection_name:
                 logging.debug(f"Collection {self.collection_name} already exists. Skipping creation.")
+                self._check_layout()
                 return
 
+        dense_params = VectorParams(size=vector_size, distance=distance, on_disk=on_disk)
+        if self.sparse_encoder is None:
+            self.client.create_collection(collection_name=self.collection_name, vectors_config=dense_params)
+            return
+
         self.client.create_collection(
             collection_name=self.collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=distance, on_disk=on_disk),
+            vectors_config={DENSE_VECTOR: dense_params},
+            # Qdrant applies the IDF half of BM25 from its own collection statistics.
+            sparse_vectors_config={SPARSE_VECTOR: SparseVectorParams(modifier=Modifier.IDF)},
         )
 
+    def _check_layout(self):
+        params = self.client.get_collection(collection_name=self.collection_name).config.params
+        has_sparse = SPARSE_VECTOR in (params.sparse_vectors or {})
+        if has_sparse != (self.sparse_encoder is not None):
+            raise ValueError(
+                f"Collection {self.collection_name} was created {'with' if has_sparse else 'without'} sparse "
+                f"vectors; set sparse={has_sparse} or use a new collection_name."
+            )
+
+    def _point_vector(self, vector, payload):
+        """The point's vector(s): the dense vector, plus a sparse one from payload["data"] in sparse collections."""
+        if self.sparse_encoder is None or vector is None:
+            return vector
+        indices, values = self.sparse_encoder.encode_document((payload or {}).get("data"))
+        return {DENSE_VECTOR: vector, SPARSE_VECTOR: SparseVector(indices=indices, values=values)}
+
     def insert(self, vectors: list, payloads: list = None, ids: list = None):
         """
         Insert vectors into a collection.
@@ -102,7 +167,7 @@ class Qdrant(VectorStoreBase):
         points = [
             PointStruct(
                 id=idx if ids is None else ids[idx],
-                vector=vector,
+                vector=self._point_vector(vector, payloads[idx] if payloads else None),
                 payload=payloads[idx] if payloads else {},
             )
             for idx, vector in enumerate(vectors)
@@ -127,27 +192,154 @@ class Qdrant(VectorStoreBase):
                 conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
         return Filter(must=conditions) if conditions else None
 
-    def search(self, query: list, limit: int = 5, filters: dict = None) -> list:
+    def search(
+        self,
+        query: list,
+        limit: int = 5,
+        filters: dict = None,
+        query_text: str = None,
+        scorer=None,
+        with_vectors: bool = False,
+    ) -> list:
         """
         Search for similar vectors.
 
+        In sparse collections with `query_text`, the dense and BM25 sparse searches run as prefetches of one
+        query_points call and Qdrant fuses them, so scores are fusion scores rather than cosine similarities.
+
         Args:
             query (list): Query vector.
             limit (int, optional): Number of results to return. Defaults to 5.
             filters (dict, optional): Filters to apply to the search. Defaults to None.
+            query_text (str, optional): Query text for the sparse search. Defaults to None.
+            scorer (RecencyScorer, optional): Re-rank scorer.candidates nearest vectors by its weighted score
+                with a formula query. Defaults to None.
+            with_vectors (bool, optional): Return each hit's dense vector as `vector`. Defaults to False.
 
         Returns:
             list: Search results.
         """
         query_filter = self._create_filter(filters) if filters else None
+        if self.sparse_encoder is not None:
+            hits = self._search_named(query, limit, query_filter, query_text, with_vectors)
+            for hit in hits:
+                # Named vectors come back as a dict; callers expect the dense embedding.
+                if isinstance(hit.vector, dict):
+                    hit.vector = hit.vector.get(DENSE_VECTOR)
+            return hits
+        if scorer is not None:
+            return self.client.query_points(
+                collection_name=self.collection_name,
+                prefetch=Prefetch(query=query, filter=query_filter, limit=max(limit, scorer.candidates)),
+                query=self._score_formula(scorer, filters),
+                limit=limit,
+                with_vectors=with_vectors,
+            ).points
+
         hits = self.client.search(
             collection_name=self.collection_name,
             query_vector=query,
             query_filter=query_filter,
             limit=limit,
+            with_vectors=with_vectors,
         )
         return hits
 
+    def _search_named(self, query, limit, query_filter, query_text, with_vectors):
+        vectors = [DENSE_VECTOR] if with_vectors else False
+        indices, values = self.sparse_encoder.encode_query(query_text)
+        if not indices:
+            return self.client.query_points(
+                collection_name=self.collection_name,
+                query=query,
+                using=DENSE_VECTOR,
+                query_filter=query_filter,
+                limit=limit,
+                with_vectors=vectors,
+            ).points
+
+        prefetch_limit = max(limit, self.prefetch_limit)
+        return self.client.query_points(
+            collection_name=self.collection_name,
+            prefetch=[
+                Prefetch(query=query, using=DENSE_VECTOR, filter=query_filter, limit=prefetch_limit),
+                Prefetch(
+                    query=SparseVector(indices=indices, values=values),
+                    using=SPARSE_VECTOR,
+                    filter=query_filter,
+                    limit=prefetch_limit,
+                ),
+            ],
+            query=FusionQuery(fusion=self.fusion),
+            limit=limit,
+            with_vectors=vectors,
+        ).points
+
+    @staticmethod
+    def _score_formula(scorer, filters):
+        """
+        The RecencyScorer's weighted score as a Qdrant formula over the prefetched candidates. $score is the
+        cosine similarity here (only plain dense collections push scoring down), so it needs no rescaling.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        never_updated = IsEmptyCondition(is_empty=PayloadField(key="updated_at"))
+
+        def recency(half_life_days):
+            def decay(key):
+                return ExpDecayExpression(
+                    exp_decay=DecayParamsExpression(
+                        x=DatetimeKeyExpression(datetime_key=key),
+                        target=DatetimeExpression(datetime=now),
+                        scale=half_life_days * 86400,
+                        midpoint=0.5,
+                    )
+                )
+
+            # Age counts from updated_at, or created_at for memories never updated.
+            return SumExpression(
+                sum=[
+                    MultExpression(mult=[never_updated, decay("created_at")]),
+                    MultExpression(mult=[Filter(must_not=[never_updated]), decay("updated_at")]),
+                ]
+            )
+
+        run_id = (filters or {}).get("run_id")
+        if run_id is not None or not scorer.run_id_half_life_days:
+            recency_expression = recency(scorer.half_life_for(run_id))
+        else:
+            # Candidates may span run_ids, so each run_id with its own half-life gets a branch.
+            run_conditions = {
+                name: FieldCondition(key="run_id", match=MatchValue(value=name))
+                for name in scorer.run_id_half_life_days
+            }
+            recency_expression = SumExpression(
+                sum=[
+                    MultExpression(mult=[condition, recency(scorer.run_id_half_life_days[name])])
+                    for name, condition in run_conditions.items()
+                ]
+                + [
+                    MultExpression(
+                        mult=[Filter(must_not=list(run_conditions.values())), recency(scorer.half_life_days)]
+                    )
+                ]
+            )
+
+        return FormulaQuery(
+            formula=SumExpression(
+                sum=[
+                    MultExpression(mult=[scorer.similarity_weight, "$score"]),
+                    MultExpression(mult=[scorer.recency_weight, recency_expression]),
+                    MultExpression(mult=[scorer.importance_weight, scorer.importance_key]),
+                ]
+            ),
+            # Missing timestamps decay to ~0 from the epoch; missing importance counts as 0.
+            defaults={
+                "created_at": "1970-01-01T00:00:00Z",
+                "updated_at": "1970-01-01T00:00:00Z",
+                scorer.importance_key: 0.0,
+            },
+        )
+
     def delete(self, vector_id: int):
         """
         Delete a vector by ID.
@@ -168,11 +360,10 @@ class Qdrant(VectorStoreBase):
 
         Args:
             vector_id (int): ID of the vector to update.
-            vector (list, optional): Updated vector. Defaults to None.
-            payload (dict, optional): Updated payload. Defaults to None.
+            vector (list, optional): Updated vector. Defaults to None, which keeps the stored vector.
+            payload (dict, optional): Updated payload. Defaults to None, which keeps the stored payload.
         """
-        point = PointStruct(id=vector_id, vector=vector, payload=payload)
-        self.client.upsert(collection_name=self.collection_name, points=[point])
+        self.update_many([vector_id], [vector], [payload])
 
     def get(self, vector_id: int) -> dict:
         """
@@ -187,6 +378,131 @@ class Qdrant(VectorStoreBase):
         result = self.client.retrieve(collection_name=self.collection_name, ids=[vector_id], with_payload=True)
         return result[0] if result else None
 
+    def get_many(self, vector_ids: list) -> list:
+        """
+        Retrieve several vectors by ID in a single request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+
+        Returns:
+            list: Retrieved vectors. Missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        return self.client.retrieve(collection_name=self.collection_name, ids=list(vector_ids), with_payload=True)
+
+    def update_many(self, vector_ids: list, vectors: list = None, payloads: list = None):
+        """
+        Update several vectors and their payloads in a single batch request.
+
+        Points given both a vector and a payload are upserted. A missing (None) vector or payload keeps the
+        stored one; in sparse collections the sparse vector is re-encoded whenever the payload changes.
+
+        Args:
+            vector_ids (list): IDs of the vectors to update.
+            vectors (list, optional): Updated vectors, aligned with `vector_ids`. Defaults to None.
+            payloads (list, optional): Updated payloads, aligned with `vector_ids`. Defaults to None.
+        """
+        if not vector_ids:
+            return
+        points, operations = [], []
+        for idx, vector_id in enumerate(vector_ids):
+            vector = vectors[idx] if vectors else None
+            payload = payloads[idx] if payloads else None
+            if vector is not None and payload is not None:
+                points.append(PointStruct(id=vector_id, vector=self._point_vector(vector, payload), payload=payload))
+                continue
+
+            if payload is not None:
+                operations.append(
+                    OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload, points=[vector_id]))
+                )
+            point_vector = {}
+            if vector is not None:
+                point_vector[DENSE_VECTOR] = vector
+            if self.sparse_encoder is not None and payload is not None:
+                indices, values = self.sparse_encoder.encode_document(payload.get("data"))
+                point_vector[SPARSE_VECTOR] = SparseVector(indices=indices, values=values)
+            if point_vector:
+                if self.sparse_encoder is None:
+                    point_vector = point_vector[DENSE_VECTOR]
+                operations.append(
+                    UpdateVectorsOperation(
+                        update_vectors=UpdateVectors(points=[PointVectors(id=vector_id, vector=point_vector)])
+                    )
+                )
+
+        if points:
+            operations.insert(0, UpsertOperation(upsert=PointsList(points=points)))
+        if operations:
+            self.client.batch_update_points(collection_name=self.collection_name, update_operations=operations)
+
+    def delete_many(self, vector_ids: list):
+        """
+        Delete several vectors by ID in a single request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=list(vector_ids)),
+        )
+
+    def scroll(self, filters: dict = None, batch_size: int = 1000):
+        """
+        Iterate over every vector matching the filters using Qdrant's scroll offsets.
+
+        Args:
+            filters (dict, optional): Filters to apply. Defaults to None.
+            batch_size (int, optional): Page size. Defaults to 1000.
+
+        Yields:
+            list: Pages of points with their payloads.
+        """
+        query_filter = self._create_filter(filters) if filters else None
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=query_filter,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            if points:
+                yield points
+            if offset is None:
+                break
+
+    def delete_by_filter(self, filters: dict) -> int:
+        """
+        Delete every vector matching the filters with a server-side FilterSelector.
+
+        Args:
+            filters (dict): Filters to apply.
+
+        Returns:
+            int: Number of deleted vectors.
+        """
+        query_filter = self._create_filter(filters) if filters else None
+        if query_filter is None:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        count = self.client.count(
+            collection_name=self.collection_name,
+            count_filter=query_filter,
+            exact=True,
+        ).count
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=query_filter),
+        )
+        return count
+
     def list_cols(self) -> list:
         """
         List all collections.
@@ -145,21 +145,28 @@ class RedisDB(VectorStoreBase):
         self.index.drop_keys(f"{self.schema['index']['prefix']}:{vector_id}")
 
     def update(self, vector_id=None, vector=None, payload=None):
-        data = {
-            "memory_id": vector_id,
-            "hash": payload["hash"],
-            "memory": payload["data"],
-            "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
-            "updated_at": int(datetime.fromisoformat(payload["updated_at"]).timestamp()),
-            "embedding": np.array(vector, dtype=np.float32).tobytes(),
-        }
-
-        for field in ["agent_id", "run_id", "user_id"]:
-            if field in payload:
-                data[field] = payload[field]
-
-        data["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
-        self.index.load(data=[data], keys=[f"{self.schema['index']['prefix']}:{vector_id}"], id_field="memory_id")
+        self.update_many([vector_id], [vector], [payload])
+
+    @staticmethod
+    def _update_entry(vector_id, vector, payload):
+        """Hash fields to write for an update; fields of a missing (None) vector or payload are left as stored."""
+        entry = {"memory_id": vector_id}
+        if payload is not None:
+            entry.update(
+                {
+                    "hash": payload["hash"],
+                    "memory": payload["data"],
+                    "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
+                    "updated_at": int(datetime.fromisoformat(payload["updated_at"]).timestamp()),
+                }
+            )
+            for field in ["agent_id", "run_id", "user_id"]:
+                if field in payload:
+                    entry[field] = payload[field]
+            entry["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
+        if vector is not None:
+            entry["embedding"] = np.array(vector, dtype=np.float32).tobytes()
+        return entry
 
     def get(self, vector_id):
         result = self.index.fetch(vector_id)
@@ -184,6 +191,115 @@ class RedisDB(VectorStoreBase):
 
         return MemoryResult(id=result["memory_id"], payload=payload)
 
+    def get_many(self, vector_ids):
+        """
+        Retrieve several memories by ID with one pipelined round trip.
+        """
+        if not vector_ids:
+            return []
+        fields = [
+            "memory_id",
+            "hash",
+            "memory",
+            "created_at",
+            "updated_at",
+            "agent_id",
+            "run_id",
+            "user_id",
+            "metadata",
+        ]
+        pipe = self.client.pipeline(transaction=False)
+        for vector_id in vector_ids:
+            pipe.hmget(f"{self.schema['index']['prefix']}:{vector_id}", fields)
+
+        results = []
+        for values in pipe.execute():
+            result = {
+                field: value.decode() if isinstance(value, bytes) else value
+                for field, value in zip(fields, values)
+                if value is not None
+            }
+            if "memory_id" not in result:
+                continue
+            payload = {
+                "hash": result["hash"],
+                "data": result["memory"],
+                "created_at": datetime.fromtimestamp(
+                    int(result["created_at"]), tz=pytz.timezone("US/Pacific")
+                ).isoformat(timespec="microseconds"),
+                **(
+                    {
+                        "updated_at": datetime.fromtimestamp(
+                            int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
+                        ).isoformat(timespec="microseconds")
+                    }
+                    if "updated_at" in result
+                    else {}
+                ),
+                **{field: result[field] for field in ["agent_id", "run_id", "user_id"] if field in result},
+                **{k: v for k, v in json.loads(result.get("metadata") or "{}").items()},
+            }
+            results.append(MemoryResult(id=result["memory_id"], payload=payload))
+        return results
+
+    def update_many(self, vector_ids, vectors=None, payloads=None):
+        """
+        Update several memories with a single bulk load. Hash fields are written in place, so a missing (None)
+        vector or payload keeps the stored one.
+        """
+        if not vector_ids:
+            return
+        data = [
+            self._update_entry(vector_id, vectors[idx] if vectors else None, payloads[idx] if payloads else None)
+            for idx, vector_id in enumerate(vector_ids)
+        ]
+        self.index.load(
+            data=data,
+            keys=[f"{self.schema['index']['prefix']}:{vector_id}" for vector_id in vector_ids],
+            id_field="memory_id",
+        )
+
+    def delete_many(self, vector_ids):
+        """
+        Delete several memories with a single DEL.
+        """
+        if not vector_ids:
+            return
+        self.index.drop_keys([f"{self.schema['index']['prefix']}:{vector_id}" for vector_id in vector_ids])
+
+    def scroll(self, filters: dict = None, batch_size: int = 1000):
+        """
+        Iterate over every memory matching the tag filters, one page at a time.
+        """
+        offset = 0
+        while True:
+            memories = self._list_page(filters, offset, batch_size)
+            if not memories:
+                break
+            yield memories
+            if len(memories) < batch_size:
+                break
+            offset += batch_size
+
+    def delete_by_filter(self, filters: dict, batch_size: int = 1000) -> int:
+        """
+        Delete every memory matching the tag filters, paging through the index.
+        """
+        conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
+        if not conditions:
+            raise ValueError("Refusing to delete by filter without any filter.")
+        filter = reduce(lambda x, y: x & y, conditions)
+
+        deleted = 0
+        while True:
+            query = Query(str(filter)).no_content().paging(0, batch_size)
+            keys = [doc.id for doc in self.index.search(query).docs]
+            if not keys:
+                break
+            self.index.drop_keys(keys)
+            deleted += len(keys)
+        return deleted
+
     def list_cols(self):
         return self.index.listall()
 
@@ -197,40 +313,41 @@ class RedisDB(VectorStoreBase):
         """
         List all recent created memories from the vector store.
         """
+        return [self._list_page(filters, 0, limit)]
+
+    def _list_page(self, filters: dict, offset: int, limit: int = None) -> list:
         conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
         filter = reduce(lambda x, y: x & y, conditions)
         query = Query(str(filter)).sort_by("created_at", asc=False)
         if limit is not None:
-            query = Query(str(filter)).sort_by("created_at", asc=False).paging(0, limit)
+            query = Query(str(filter)).sort_by("created_at", asc=False).paging(offset, limit)
 
         results = self.index.search(query)
         return [
-            [
-                MemoryResult(
-                    id=result["memory_id"],
-                    payload={
-                        "hash": result["hash"],
-                        "data": result["memory"],
-                        "created_at": datetime.fromtimestamp(
-                            int(result["created_at"]), tz=pytz.timezone("US/Pacific")
-                        ).isoformat(timespec="microseconds"),
-                        **(
-                            {
-                                "updated_at": datetime.fromtimestamp(
-                                    int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
-                                ).isoformat(timespec="microseconds")
-                            }
-                            if result.__dict__.get("updated_at")
-                            else {}
-                        ),
-                        **{
-                            field: result[field]
-                            for field in ["agent_id", "run_id", "user_id"]
-                            if field in result.__dict__
-                        },
-                        **{k: v for k, v in json.loads(result["metadata"]).items()},
+            MemoryResult(
+                id=result["memory_id"],
+                payload={
+                    "hash": result["hash"],
+                    "data": result["memory"],
+                    "created_at": datetime.fromtimestamp(
+                        int(result["created_at"]), tz=pytz.timezone("US/Pacific")
+                    ).isoformat(timespec="microseconds"),
+                    **(
+                        {
+                            "updated_at": datetime.fromtimestamp(
+                                int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
+                            ).isoformat(timespec="microseconds")
+                        }
+                        if result.__dict__.get("updated_at")
+                        else {}
+                    ),
+                    **{
+                        field: result[field]
+                        for field in ["agent_id", "run_id", "user_id"]
+                        if field in result.__dict__
                     },
-                )
-                for result in results.docs
-            ]
+                    **{k: v for k, v in json.loads(result["metadata"]).items()},
+                },
+            )
+            for result in results.docs
         ]
@@ -13,6 +13,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from mem0 import Memory
+from mem0.graphs.schema import ensure_schema, migrate_graph
 
 load_dotenv()
 
@@ -121,14 +122,18 @@ def init_neo4j_database():
         driver.verify_connectivity()
         logger.info("Successfully connected to Neo4j database")
 
+        def query(cypher, params=None):
+            records, _, _ = driver.execute_query(cypher, params or {})
+            return [record.data() for record in records]
+
         def check_schema_exists(tx):
             """
-            Check if the 'Schema' node with version='v1' exists.
+            Check if the 'Schema' node with version='v2' exists.
             Returns True if it exists, else False.
             """
             logger.debug("Checking if schema exists")
             result = tx.run("""
-                MATCH (schema:Schema {version: 'v1'})
+                MATCH (schema:Schema {version: 'v2'})
                 RETURN COUNT(schema) > 0 AS exists
             """)
             record = result.single()
@@ -136,23 +141,16 @@ def init_neo4j_database():
             logger.debug(f"Schema exists: {exists}")
             return exists
 
-        def init_constraints(tx):
+        def init_constraints():
             """
-            Create constraints and indexes if they don't already exist.
-            Must be run in a separate transaction from data operations.
+            Migrate existing entities onto the canonical :Entity schema, then create its key constraint and
+            indexes. Schema changes run in their own transactions, separate from data operations.
             """
             logger.info("Initializing Neo4j constraints and indexes")
-            # Constraints for Memory Nodes
-            tx.run("CREATE CONSTRAINT memory_id IF NOT EXISTS FOR (m:Memory) REQUIRE m.id IS UNIQUE")
-            tx.run("CREATE CONSTRAINT memory_user_id IF NOT EXISTS FOR (m:Memory) REQUIRE m.user_id IS NOT NULL")
-            tx.run("CREATE INDEX memory_embedding_idx IF NOT EXISTS FOR (n:Memory) ON (n.embedding)")
-            tx.run("CREATE INDEX memory_user_id_idx IF NOT EXISTS FOR (n:Memory) ON (n.user_id)")
-
-            # Constraints for Graph Nodes (Entity, Relationship, etc.)
-            tx.run("CREATE CONSTRAINT entity_name IF NOT EXISTS FOR (e:entity) REQUIRE e.name IS UNIQUE")
-            tx.run("CREATE CONSTRAINT entity_user_id IF NOT EXISTS FOR (e:entity) REQUIRE e.user_id IS NOT NULL")
-            tx.run("CREATE INDEX entity_name_idx IF NOT EXISTS FOR (n:entity) ON (n.name)")
-            tx.run("CREATE INDEX entity_user_id_idx IF NOT EXISTS FOR (n:entity) ON (n.user_id)")
+            report = migrate_graph(query)
+            logger.info(f"Graph migration: {report}")
+            if not ensure_schema(query):
+                logger.warning("Duplicate entity keys remain; run memory_tools/migrateGraph.py --dry-run for details")
 
         def create_schema_node(tx):
             """
@@ -161,9 +159,9 @@ def init_neo4j_database():
             logger.info("Creating Schema node")
             tx.run("""
                 CREATE (schema:Schema {
-                    version: 'v1',
+                    version: 'v2',
                     created_at: datetime(),
-                    properties: ['embedding', 'user_id', 'content']
+                    properties: ['name', 'type', 'embedding', 'user_id', 'agent_id', 'run_id']
                 })
             """)
 
@@ -173,7 +171,7 @@ def init_neo4j_database():
             if not schema_exists:
                 logger.info("Initializing Neo4j schema for first time setup...")
                 # Execute schema modifications first
-                session.execute_write(init_constraints)
+                init_constraints()
                 # Then create the schema node in a separate transaction
                 session.execute_write(create_schema_node)
                 logger.info("Neo4j schema initialized successfully")
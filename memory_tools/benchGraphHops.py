@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import uuid
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mem0.configs.base import MemoryConfig
+from mem0.utils.factory import GraphStoreFactory
+
+# Measures multi-hop graph search latency against hop count on a synthetic graph: --nodes random entities in a
+# throwaway user scope, each with --degree random relations of random age. Queries start from a perturbed copy of
+# a random entity's embedding, so no LLM or embedding calls are made. The scope is deleted afterwards.
+#
+# --provider embedded runs the same benchmark against the in-process graph store in a temporary directory, which
+# needs no Neo4j server.
+#
+#   python memory_tools/benchGraphHops.py --nodes 5000 --degree 4 --max-hops 3 --fanout 10
+#   python memory_tools/benchGraphHops.py --provider embedded --nodes 50000
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(description="Benchmark multi-hop graph search latency against hop count")
+parser.add_argument("--provider", choices=["neo4j", "embedded"], default="neo4j", help="Graph store to benchmark")
+parser.add_argument("--nodes", type=int, default=5000, help="Synthetic entities")
+parser.add_argument("--degree", type=int, default=4, help="Outgoing relations per entity")
+parser.add_argument("--max-hops", type=int, default=3, help="Benchmark 1..max-hops")
+parser.add_argument("--fanout", type=int, default=10, help="hop_fanout for the traversal")
+parser.add_argument("--queries", type=int, default=50, help="Queries per hop count")
+parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per transaction while seeding")
+parser.add_argument("--seed", type=int, default=0, help="Random seed")
+args = parser.parse_args()
+
+if args.provider == "embedded":
+    store_config = {"path": tempfile.mkdtemp(prefix="bench_hops_")}
+else:
+    store_config = {
+        "url": os.getenv("NEO4J_URI"),
+        "username": os.getenv("NEO4J_USERNAME"),
+        "password": os.getenv("NEO4J_PASSWORD"),
+    }
+config = MemoryConfig(
+    graph_store={"provider": args.provider, "config": store_config, "hop_fanout": args.fanout},
+    version="v1.1",
+)
+graph = GraphStoreFactory.create(args.provider, config)
+
+rng = np.random.default_rng(args.seed)
+dims = getattr(graph.embedding_model.config, "embedding_dims", None) or 1536
+filters = {"user_id": f"bench_hops_{uuid.uuid4().hex[:8]}"}
+scope = {"user_id": filters["user_id"], "agent_id": "", "run_id": ""}
+
+embeddings = rng.normal(size=(args.nodes, dims)).astype(np.float32)
+embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+names = [f"entity_{i}" for i in range(args.nodes)]
+
+def seed_embedded(edges):
+    node_ids = graph.graph.merge_nodes(
+        [{"name": name, "type": "synthetic", "embedding": embeddings[i]} for i, name in enumerate(names)], filters
+    )
+    now = int(time.time() * 1000)
+    graph.graph.merge_edges(
+        [
+            {
+                "index": 0,
+                "source_id": node_ids[edge["source"]],
+                "destination_id": node_ids[edge["destination"]],
+                "relationship": "related_to",
+                "created": now - edge["age"],
+            }
+            for edge in edges
+        ]
+    )
+
+def seed_graph():
+    started = time.perf_counter()
+    day = 86400000
+    edges = [
+        {"source": names[i], "destination": names[j], "age": int(rng.integers(0, 365 * day))}
+        for i in range(args.nodes)
+        for j in rng.choice(args.nodes, size=args.degree, replace=False)
+        if j != i
+    ]
+    if args.provider == "embedded":
+        seed_embedded(edges)
+        logger.info(f"Seeded {args.nodes} entities and {len(edges)} relations in {time.perf_counter() - started:.1f}s")
+        return
+
+    for start in range(0, args.nodes, args.batch_size):
+        rows = [
+            {"name": names[i], "embedding": embeddings[i].tolist()}
+            for i in range(start, min(start + args.batch_size, args.nodes))
+        ]
+        graph.graph.query(
+            """
+            UNWIND $rows AS row
+            CREATE (:Entity {name: row.name, embedding: row.embedding, type: 'synthetic', created: timestamp(),
+                             user_id: $user_id, agent_id: $agent_id, run_id: $run_id})
+            """,
+            params={"rows": rows, **scope},
+        )
+
+    for start in range(0, len(edges), args.batch_size):
+        graph.graph.query(
+            """
+            UNWIND $rows AS row
+            MATCH (a:Entity {name: row.source, user_id: $user_id, agent_id: $agent_id, run_id: $run_id})
+            MATCH (b:Entity {name: row.destination, user_id: $user_id, agent_id: $agent_id, run_id: $run_id})
+            CREATE (a)-[:related_to {created: timestamp() - row.age}]->(b)
+            """,
+            params={"rows": edges[start : start + args.batch_size], **scope},
+        )
+    logger.info(f"Seeded {args.nodes} entities and {len(edges)} relations in {time.perf_counter() - started:.1f}s")
+
+try:
+    seed_graph()
+    starts = rng.choice(args.nodes, size=args.queries)
+    for hops in range(1, args.max_hops + 1):
+        latencies, path_counts = [], []
+        for i in starts:
+            query_embedding = embeddings[i] + rng.normal(scale=0.01, size=dims).astype(np.float32)
+            started = time.perf_counter()
+            paths = graph._search_graph_paths(
+                [names[i]], filters, max_hops=hops, limit=10, embeddings=[query_embedding.tolist()]
+            )
+            latencies.append(time.perf_counter() - started)
+            path_counts.append(len(paths))
+        latencies = np.array(latencies) * 1000
+        logger.info(
+            f"hops={hops} fanout={args.fanout}: p50 {np.percentile(latencies, 50):.1f}ms, "
+            f"p95 {np.percentile(latencies, 95):.1f}ms, max {latencies.max():.1f}ms, "
+            f"mean paths {np.mean(path_counts):.1f}"
+        )
+finally:
+    graph.delete_all(filters)
+    graph.graph.close()
+    if args.provider == "embedded":
+        shutil.rmtree(store_config["path"])
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mem0.graphs.consolidate import consolidate_entities
+from mem0.graphs.neo4j_client import Neo4jClient
+
+# Merges near-duplicate entity nodes (same scope, embeddings above --threshold or names that normalise the
+# same) into one node per cluster, rewiring their relations. Safe to re-run after an interruption.
+#
+#   python memory_tools/consolidateGraph.py --dry-run --report clusters.json   # review what would merge
+#   python memory_tools/consolidateGraph.py --threshold 0.95 --user-id 123    # merge one user's entities
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(description="Merge near-duplicate entities in the Neo4j memory graph")
+parser.add_argument("--dry-run", action="store_true", help="Only report the clusters that would be merged")
+parser.add_argument("--threshold", type=float, default=0.93, help="Minimum cosine similarity to merge")
+parser.add_argument("--block-size", type=int, default=1024, help="Similarity tile edge length")
+parser.add_argument("--batch-size", type=int, default=500, help="Clusters merged per transaction")
+parser.add_argument("--user-id", help="Only consolidate this user's scopes")
+parser.add_argument("--agent-id", help="Only consolidate this agent's scopes")
+parser.add_argument("--run-id", help="Only consolidate this run's scopes")
+parser.add_argument("--report", help="Write the full report, including every cluster, to this JSON file")
+args = parser.parse_args()
+
+client = Neo4jClient(os.getenv("NEO4J_URI"), os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+
+try:
+    report = consolidate_entities(
+        client.query,
+        stream=client.stream,
+        transaction=client.transaction,
+        filters={"user_id": args.user_id, "agent_id": args.agent_id, "run_id": args.run_id},
+        threshold=args.threshold,
+        block_size=args.block_size,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    details = report.pop("details")
+    for cluster in details[:20]:
+        logger.info(f"{cluster['scope']}: {cluster['merge']} -> {cluster['keep']} (min similarity {cluster['min_similarity']})")
+    if len(details) > 20:
+        logger.info(f"... and {len(details) - 20} more clusters")
+    logger.info(f"{'Would consolidate' if args.dry_run else 'Consolidated'}: {json.dumps(report, indent=2)}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({**report, "details": details}, f, indent=2)
+        logger.info(f"Report written to {args.report}")
+finally:
+    client.close()
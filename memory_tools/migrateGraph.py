@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+from neo4j import GraphDatabase
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mem0.graphs.schema import ensure_schema, migrate_graph
+
+# Moves an existing graph onto the canonical schema: every entity a single :Entity node with a `type`
+# property, keyed by (name, user_id, agent_id, run_id). Safe to run repeatedly.
+#
+#   python memory_tools/migrateGraph.py --dry-run      # report what would change
+#   python memory_tools/migrateGraph.py                # migrate and create the constraint/indexes
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(description="Migrate the Neo4j memory graph to the canonical :Entity schema")
+parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+parser.add_argument("--batch-size", type=int, default=10000, help="Nodes updated per transaction")
+args = parser.parse_args()
+
+driver = GraphDatabase.driver(os.getenv("NEO4J_URI"), auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD")))
+driver.verify_connectivity()
+
+def query(cypher, params=None):
+    records, _, _ = driver.execute_query(cypher, params or {})
+    return [record.data() for record in records]
+
+try:
+    report = migrate_graph(query, batch_size=args.batch_size, dry_run=args.dry_run)
+    logger.info(f"{'Would migrate' if args.dry_run else 'Migrated'}: {json.dumps(report, indent=2)}")
+
+    if not args.dry_run:
+        if ensure_schema(query):
+            logger.info("Entity key constraint is in place")
+        else:
+            logger.warning(
+                f"{report['duplicates']['keys']} entity keys are duplicated; "
+                "using a composite index until they are merged"
+            )
+finally:
+    driver.close()
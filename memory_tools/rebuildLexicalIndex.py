@@ -0,0 +1,22 @@
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Rebuilds the lexical (BM25) index used by hybrid search from the memories in the vector store. Run it once
+# after setting HYBRID_SEARCH=true on a collection that already holds memories; later writes keep it current.
+#
+#   HYBRID_SEARCH=true python memory_tools/rebuildLexicalIndex.py
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+from main import memory_instance  # noqa: E402
+
+indexed = memory_instance.rebuild_lexical_index()
+logger.info(f"Lexical index rebuilt with {indexed} memories")
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import uuid
+import argparse
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Add the project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mem0 import Memory
+
+# Hammers one shared Memory instance with concurrent add/search calls from many threads, each in its own
+# user scope, and checks that no scope ever sees another scope's memories or graph relations.
+# Uses (and cleans up) throwaway user_ids in the configured Neo4j/Qdrant.
+#
+#   python memory_tools/stressConcurrency.py --threads 16 --rounds 3
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser(description="Concurrent add/search scope-isolation stress test")
+parser.add_argument("--threads", type=int, default=16, help="Concurrent workers, one scope each")
+parser.add_argument("--rounds", type=int, default=3, help="add + search rounds per worker")
+parser.add_argument("--no-graph", action="store_true", help="Only exercise the vector store")
+args = parser.parse_args()
+
+config = {
+    "vector_store": {
+        "provider": "qdrant",
+            "config": {
+                "collection_name": "stress_memory",
+                "url": os.getenv("QDRANT_URL"),
+                "api_key": os.getenv("QDRANT_API_KEY"),
+            },
+    },
+    "llm": {
+        "provider": "openai",
+        "config": {
+            "model": "gpt-4o-mini",
+            "temperature": .1,
+            "api_key": os.getenv("OPENAI_API_KEY"),
+        },
+    },
+    "lock": {
+        "provider": "local",
+    },
+    "version": "v1.1"
+}
+if not args.no_graph:
+    config["graph_store"] = {
+        "provider": "neo4j",
+        "config": {
+            "url": os.getenv("NEO4J_URI"),
+            "username": os.getenv("NEO4J_USERNAME"),
+            "password": os.getenv("NEO4J_PASSWORD"),
+        },
+    }
+
+m = Memory.from_config(config_dict=config)
+
+run = uuid.uuid4().hex[:8]
+scopes = [f"stress_{run}_{i}" for i in range(args.threads)]
+# A made-up word per scope, so any appearance in another scope's results is a leak.
+markers = {scope: f"zorblax{run}{i}" for i, scope in enumerate(scopes)}
+
+def relation_text(relation):
+    return " ".join(str(relation.get(key, "")) for key in ("source", "relationship", "target", "destination"))
+
+def check(scope, memories, relations):
+    foreign = [other for other in scopes if other != scope]
+    leaks = []
+    for memory in memories:
+        if memory.get("user_id") != scope:
+            leaks.append(f"memory {memory['id']} belongs to {memory.get('user_id')}")
+        leaks.extend(
+            f"memory {memory['id']} mentions {markers[other]}" for other in foreign if markers[other] in memory["memory"]
+        )
+    for relation in relations or []:
+        text = relation_text(relation)
+        leaks.extend(f"relation '{text}' mentions {markers[other]}" for other in foreign if markers[other] in text)
+    return leaks
+
+def worker(scope):
+    marker = markers[scope]
+    leaks, timings = [], []
+    for round_number in range(args.rounds):
+        started = time.perf_counter()
+        m.add(f"{scope} owns a pet dragon named {marker}{round_number} who loves {marker}_berries", user_id=scope)
+        result = m.search(f"What is the name of my dragon {marker}?", user_id=scope, limit=20)
+        timings.append(time.perf_counter() - started)
+        leaks.extend(check(scope, result["results"], result.get("relations")))
+
+    everything = m.get_all(user_id=scope, limit=1000)
+    leaks.extend(check(scope, everything["results"], everything.get("relations")))
+    return scope, leaks, timings
+
+started = time.perf_counter()
+failures = 0
+try:
+    with ThreadPoolExecutor(max_workers=args.threads, thread_name_prefix="stress") as executor:
+        for scope, leaks, timings in executor.map(worker, scopes):
+            if leaks:
+                failures += 1
+                logger.error(f"{scope} saw data from other scopes: {leaks}")
+            else:
+                logger.info(f"{scope} isolated; mean add+search {sum(timings) / len(timings):.2f}s")
+finally:
+    for scope in scopes:
+        m.delete_all(user_id=scope)
+
+logger.info(
+    f"{args.threads} threads x {args.rounds} rounds in {time.perf_counter() - started:.1f}s, "
+    f"{failures} scopes with leaks"
+)
+logger.info(f"Scope lock metrics: {m.lock_metrics()}")
+sys.exit(1 if failures else 0)
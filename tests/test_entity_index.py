@@ -0,0 +1,57 @@
+from mem0.graphs.entity_index import EntityNameIndex
+
+
+class FakeGraph:
+    """Entities per scope, as the loader would read them from the graph store."""
+
+    def __init__(self):
+        self.entities = {}
+        self.loads = []
+
+    def put(self, user_id, name, created, embedding=(1.0, 0.0)):
+        self.entities.setdefault(user_id, {})[name] = {"name": name, "embedding": list(embedding), "created": created}
+
+    def load(self, filters, since):
+        self.loads.append((filters["user_id"], since))
+        return [row for row in self.entities.get(filters["user_id"], {}).values() if row["created"] > since]
+
+
+def test_full_reload_drops_entities_deleted_by_other_processes():
+    graph = FakeGraph()
+    graph.put("alice", "bob", created=1)
+    graph.put("alice", "carol", created=2)
+    index = EntityNameIndex(graph.load, refresh_interval=0.0, reload_interval=None)
+    assert set(index.lookup("bob and carol", {"user_id": "alice"})) == {"bob", "carol"}
+
+    del graph.entities["alice"]["bob"]
+    assert "bob" in index.lookup("bob", {"user_id": "alice"})
+
+    index.reload_interval = 0.0
+    assert index.lookup("bob and carol", {"user_id": "alice"}).keys() == {"carol"}
+    assert graph.loads[-1] == ("alice", 0)
+
+
+def test_least_recently_used_scopes_are_evicted():
+    graph = FakeGraph()
+    for user_id in ("u1", "u2", "u3"):
+        graph.put(user_id, f"{user_id}_friend", created=1)
+    index = EntityNameIndex(graph.load, max_scopes=2)
+
+    index.lookup("x", {"user_id": "u1"})
+    index.lookup("x", {"user_id": "u2"})
+    index.lookup("x", {"user_id": "u1"})
+    index.lookup("x", {"user_id": "u3"})
+
+    assert [dict(key)["user_id"] for key in index._entries] == ["u1", "u3"]
+
+
+def test_each_scope_keeps_its_newest_entities():
+    graph = FakeGraph()
+    for created, name in enumerate(["old", "middle", "new"], start=1):
+        graph.put("alice", name, created=created)
+    index = EntityNameIndex(graph.load, max_entities=2)
+
+    assert index.lookup("old middle new", {"user_id": "alice"}).keys() == {"middle", "new"}
+
+    index.add({"user_id": "alice"}, [{"name": "newest", "embedding": [0.0, 1.0]}])
+    assert index.lookup("old middle new newest", {"user_id": "alice"}).keys() == {"new", "newest"}
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+
+import pytest
+
+from mem0.memory.graph_memory import MemoryGraph
+
+
+class RecordingGraph:
+    """Records every Cypher statement and answers with scripted results."""
+
+    def __init__(self, respond=None):
+        self.statements = []
+        self.respond = respond or (lambda cypher, params: [])
+
+    def query(self, cypher, params=None, read=False):
+        self.statements.append(" ".join(cypher.split()))
+        return self.respond(cypher, params or {})
+
+    def stream(self, cypher, params=None, read=True):
+        yield from self.query(cypher, params, read)
+
+
+class NoopEntityIndex:
+    def invalidate(self, filters):
+        pass
+
+
+@pytest.fixture
+def graph_memory():
+    memory_graph = MemoryGraph.__new__(MemoryGraph)
+    memory_graph.graph = RecordingGraph()
+    memory_graph.entity_index = NoopEntityIndex()
+    return memory_graph
+
+
+def test_delete_all_seeks_entities_by_scope(graph_memory):
+    deleted = iter([2, 1])
+    graph_memory.graph.respond = lambda cypher, params: [{"deleted": next(deleted)}]
+
+    assert graph_memory.delete_all({"user_id": "alice"}, batch_size=2) == 3
+
+    assert len(graph_memory.graph.statements) == 2
+    assert all(statement.startswith("MATCH (n:Entity) WHERE") for statement in graph_memory.graph.statements)
+
+
+def test_relation_paging_and_export_match_entities_only(graph_memory):
+    graph_memory.get_relations({"user_id": "alice"}, limit=10)
+    list(graph_memory.iter_relations({"user_id": "alice"}))
+
+    for statement in graph_memory.graph.statements:
+        assert statement.startswith("MATCH (n:Entity)-[r]->(m:Entity)")
+
+
+class RecordingLockManager:
+    def __init__(self):
+        self.held = False
+
+    @contextmanager
+    def hold(self, namespace, filters):
+        self.held = True
+        try:
+            yield 0.0
+        finally:
+            self.held = False
+
+
+@pytest.mark.parametrize("extraction_mode", ["single_call", "multi_call"])
+def test_add_holds_the_scope_lock_only_for_the_writes(graph_memory, monkeypatch, extraction_mode):
+    lock_manager = RecordingLockManager()
+    graph_memory.lock_manager = lock_manager
+    graph_memory.extraction_mode = extraction_mode
+    held_during = {}
+
+    def record(step, result):
+        def method(*args, **kwargs):
+            held_during[step] = lock_manager.held
+            return result
+
+        return method
+
+    relation = {"source": "alice", "relationship": "likes", "destination": "tea"}
+    monkeypatch.setattr(graph_memory, "_extract_graph_from_data", record("extract", ({}, [relation])))
+    monkeypatch.setattr(graph_memory, "_find_contradictions", record("search", []))
+    monkeypatch.setattr(graph_memory, "_retrieve_nodes_from_data", record("extract", {"alice": "person"}))
+    monkeypatch.setattr(graph_memory, "_establish_nodes_relations_from_data", record("relations", [relation]))
+    monkeypatch.setattr(graph_memory, "_search_graph_db", record("search", []))
+    monkeypatch.setattr(graph_memory, "_delete_entities", record("delete", []))
+    monkeypatch.setattr(graph_memory, "_add_entities", record("write", [[relation]]))
+
+    result = graph_memory.add("alice likes tea", {"user_id": "alice"})
+
+    assert result["added_entities"] == [[relation]]
+    assert held_during.pop("delete") and held_during.pop("write")
+    assert not any(held_during.values())
@@ -0,0 +1,114 @@
+import copy
+import importlib
+import re
+import sys
+import types
+
+import pytest
+
+
+class FakeMilvusClient:
+    """In-memory stand-in for pymilvus.MilvusClient covering the calls MilvusDB makes."""
+
+    def __init__(self, uri=None, token=None):
+        self.entities = {}
+
+    def has_collection(self, collection_name):
+        return True
+
+    @staticmethod
+    def _matches(entity, expression):
+        for key, value in re.findall(r'metadata\["(\w+)"\] == "?([^")]*)"?', expression or ""):
+            if str((entity["metadata"] or {}).get(key)) != value:
+                return False
+        return True
+
+    def upsert(self, collection_name, data):
+        for entity in data if isinstance(data, list) else [data]:
+            if entity["vectors"] is None or entity["metadata"] is None:
+                raise ValueError("upsert requires every field")
+            self.entities[entity["id"]] = copy.deepcopy(entity)
+
+    def insert(self, collection_name, data):
+        self.entities[data["id"]] = copy.deepcopy(data)
+
+    def get(self, collection_name, ids, output_fields=None):
+        ids = ids if isinstance(ids, list) else [ids]
+        return [copy.deepcopy(self.entities[vector_id]) for vector_id in ids if vector_id in self.entities]
+
+    def query(self, collection_name, filter="", output_fields=None, limit=None, offset=0):
+        matches = [entity for entity in self.entities.values() if self._matches(entity, filter)]
+        return copy.deepcopy(matches[offset : offset + limit if limit else None])
+
+    def delete(self, collection_name, ids=None, filter=None):
+        if ids is not None:
+            ids = ids if isinstance(ids, list) else [ids]
+            doomed = [vector_id for vector_id in ids if vector_id in self.entities]
+        else:
+            doomed = [vector_id for vector_id, entity in self.entities.items() if self._matches(entity, filter)]
+        for vector_id in doomed:
+            del self.entities[vector_id]
+        return {"delete_count": len(doomed)}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    pymilvus = types.ModuleType("pymilvus")
+    pymilvus.MilvusClient = FakeMilvusClient
+    pymilvus.CollectionSchema = pymilvus.DataType = pymilvus.FieldSchema = object
+    monkeypatch.setitem(sys.modules, "pymilvus", pymilvus)
+    monkeypatch.delitem(sys.modules, "mem0.vector_stores.milvus", raising=False)
+    milvus = importlib.import_module("mem0.vector_stores.milvus")
+
+    from mem0.configs.vector_stores.milvus import MetricType
+
+    store = milvus.MilvusDB("http://stand-in", None, "memories", 3, MetricType.COSINE)
+    for index in range(5):
+        store.insert(
+            vectors=[[float(index), 0.0, 1.0]],
+            payloads=[{"data": f"memory {index}", "user_id": "alice" if index < 3 else "bob"}],
+            ids=[f"id-{index}"],
+        )
+    return store
+
+
+def test_get_many_skips_missing_ids(store):
+    results = store.get_many(["id-0", "id-4", "missing"])
+    assert sorted(result.id for result in results) == ["id-0", "id-4"]
+    assert store.get_many([]) == []
+
+
+def test_update_many_without_vectors_keeps_the_stored_vectors(store):
+    store.update_many(["id-0", "id-1"], payloads=[{"data": "new 0"}, {"data": "new 1"}])
+
+    assert store.client.entities["id-0"]["metadata"] == {"data": "new 0"}
+    assert store.client.entities["id-0"]["vectors"] == [0.0, 0.0, 1.0]
+    assert store.client.entities["id-1"]["vectors"] == [1.0, 0.0, 1.0]
+
+
+def test_update_many_without_payloads_keeps_the_stored_payloads(store):
+    store.update_many(["id-2"], vectors=[[9.0, 9.0, 9.0]])
+
+    assert store.client.entities["id-2"]["vectors"] == [9.0, 9.0, 9.0]
+    assert store.client.entities["id-2"]["metadata"]["data"] == "memory 2"
+
+
+def test_update_many_rejects_partial_updates_of_missing_ids(store):
+    with pytest.raises(ValueError):
+        store.update_many(["missing"], payloads=[{"data": "x"}])
+
+
+def test_scroll_pages_through_the_filtered_scope(store):
+    pages = list(store.scroll(filters={"user_id": "alice"}, batch_size=2))
+    assert [len(page) for page in pages] == [2, 1]
+    assert sorted(memory.id for page in pages for memory in page) == ["id-0", "id-1", "id-2"]
+
+
+def test_delete_many_and_delete_by_filter(store):
+    store.delete_many(["id-0"])
+    assert "id-0" not in store.client.entities
+
+    assert store.delete_by_filter({"user_id": "alice"}) == 2
+    assert sorted(store.client.entities) == ["id-3", "id-4"]
+    with pytest.raises(ValueError):
+        store.delete_by_filter({})
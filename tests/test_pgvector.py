@@ -0,0 +1,125 @@
+import importlib
+import json
+import sys
+import types
+
+import pytest
+
+
+class FakeCursor:
+    """Records statements and returns scripted result sets in order."""
+
+    def __init__(self):
+        self.statements = []
+        self.results = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return self.results.pop(0) if self.results else []
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursor_instance = FakeCursor()
+        self.commits = 0
+
+    def cursor(self):
+        return self.cursor_instance
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def store(monkeypatch):
+    executed_values = []
+
+    def execute_values(cursor, sql, rows, page_size=100):
+        executed_values.append((" ".join(sql.split()), rows))
+
+    connection = FakeConnection()
+    connection.cursor_instance.results.append([("memories",)])
+    psycopg2 = types.ModuleType("psycopg2")
+    psycopg2.connect = lambda **kwargs: connection
+    extras = types.ModuleType("psycopg2.extras")
+    extras.execute_values = execute_values
+    extras.Json = json.dumps
+    psycopg2.extras = extras
+    monkeypatch.setitem(sys.modules, "psycopg2", psycopg2)
+    monkeypatch.setitem(sys.modules, "psycopg2.extras", extras)
+    monkeypatch.delitem(sys.modules, "mem0.vector_stores.pgvector", raising=False)
+    pgvector = importlib.import_module("mem0.vector_stores.pgvector")
+
+    store = pgvector.PGVector("db", "memories", 3, "user", "password", "localhost", 5432, False)
+    store.executed_values = executed_values
+    connection.cursor_instance.statements.clear()
+    return store
+
+
+def test_get_many_reads_every_id_in_one_query(store):
+    store.cur.results.append([("id-1", {"data": "a"}), ("id-2", {"data": "b"})])
+
+    results = store.get_many(["id-1", "id-2", "missing"])
+
+    assert [(result.id, result.payload) for result in results] == [("id-1", {"data": "a"}), ("id-2", {"data": "b"})]
+    [(sql, params)] = store.cur.statements
+    assert "id = ANY(%s::uuid[])" in sql
+    assert params == (["id-1", "id-2", "missing"],)
+    assert store.get_many([]) == []
+
+
+def test_update_many_leaves_missing_vectors_and_payloads_to_coalesce(store):
+    store.update_many(["id-1", "id-2"], payloads=[{"data": "a"}, None])
+    store.update_many(["id-3"], vectors=[[0.1, 0.2, 0.3]])
+
+    (first_sql, first_rows), (_, second_rows) = store.executed_values
+    assert "COALESCE(v.vector::vector, t.vector)" in first_sql
+    assert "COALESCE(v.payload::jsonb, t.payload)" in first_sql
+    assert first_rows == [("id-1", None, json.dumps({"data": "a"})), ("id-2", None, None)]
+    assert second_rows == [("id-3", "[0.1, 0.2, 0.3]", None)]
+    assert store.conn.commits == 2
+
+
+def test_scroll_continues_after_the_last_id_of_each_page(store):
+    store.cur.results.extend(
+        [
+            [("id-1", {"user_id": "alice"}), ("id-2", {"user_id": "alice"})],
+            [("id-3", {"user_id": "alice"})],
+        ]
+    )
+
+    pages = list(store.scroll(filters={"user_id": "alice"}, batch_size=2))
+
+    assert [[memory.id for memory in page] for page in pages] == [["id-1", "id-2"], ["id-3"]]
+    (first_sql, first_params), (_, second_params) = store.cur.statements
+    assert "WHERE payload->>%s = %s AND id > %s" in first_sql
+    assert first_params == ("user_id", "alice", "00000000-0000-0000-0000-000000000000", 2)
+    assert second_params == ("user_id", "alice", "id-2", 2)
+
+
+def test_delete_many_and_delete_by_filter(store):
+    store.delete_many(["id-1", "id-2"])
+    store.cur.rowcount = 4
+    deleted = store.delete_by_filter({"user_id": "alice"})
+
+    (delete_sql, delete_params), (filter_sql, filter_params) = store.cur.statements
+    assert "DELETE FROM memories WHERE id = ANY(%s::uuid[])" in delete_sql
+    assert delete_params == (["id-1", "id-2"],)
+    assert filter_sql == "DELETE FROM memories WHERE payload->>%s = %s"
+    assert filter_params == ["user_id", "alice"]
+    assert deleted == 4
+    with pytest.raises(ValueError):
+        store.delete_by_filter({})
@@ -0,0 +1,173 @@
+import importlib
+import sys
+import threading
+import time
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+
+class PoolError(Exception):
+    pass
+
+
+class FakeCursor:
+    def __init__(self, database):
+        self.database = database
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        with self.database.lock:
+            self.database.statements.append(sql)
+
+    def fetchone(self):
+        return (datetime.now(timezone.utc),)
+
+    def fetchall(self):
+        return []
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return FakeCursor(self.database)
+
+
+class FakeDatabase:
+    """Stand-in for a Postgres server: records inserted rows and tracks connections in use."""
+
+    def __init__(self, write_seconds=0.0):
+        self.write_seconds = write_seconds
+        self.rows = []
+        self.statements = []
+        self.in_use = 0
+        self.max_in_use = 0
+        self.lock = threading.Lock()
+
+
+def make_psycopg2(database):
+    """A psycopg2 stand-in whose ThreadedConnectionPool, like the real one, raises PoolError when exhausted."""
+
+    class ThreadedConnectionPool:
+        def __init__(self, minconn, maxconn, **kwargs):
+            self.maxconn = maxconn
+
+        def getconn(self):
+            with database.lock:
+                if database.in_use >= self.maxconn:
+                    raise PoolError("connection pool exhausted")
+                database.in_use += 1
+                database.max_in_use = max(database.max_in_use, database.in_use)
+            return FakeConnection(database)
+
+        def putconn(self, connection):
+            with database.lock:
+                database.in_use -= 1
+
+        def closeall(self):
+            pass
+
+    def execute_values(cursor, sql, rows, page_size=100):
+        time.sleep(database.write_seconds)
+        with database.lock:
+            database.rows.extend(rows)
+
+    psycopg2 = types.ModuleType("psycopg2")
+    pool = types.ModuleType("psycopg2.pool")
+    pool.ThreadedConnectionPool = ThreadedConnectionPool
+    pool.PoolError = PoolError
+    extras = types.ModuleType("psycopg2.extras")
+    extras.execute_values = execute_values
+    psycopg2.pool = pool
+    psycopg2.extras = extras
+    return {"psycopg2": psycopg2, "psycopg2.pool": pool, "psycopg2.extras": extras}
+
+
+@pytest.fixture
+def store_factory(monkeypatch):
+    stores = []
+
+    def create(database, **kwargs):
+        for name, module in make_psycopg2(database).items():
+            monkeypatch.setitem(sys.modules, name, module)
+        monkeypatch.delitem(sys.modules, "mem0.history_stores.postgres", raising=False)
+        postgres = importlib.import_module("mem0.history_stores.postgres")
+        store = postgres.PostgresHistoryStore(dsn="postgresql://stand-in", **kwargs)
+        stores.append(store)
+        return store
+
+    yield create
+    for store in stores:
+        store.close()
+
+
+def test_more_writers_than_connections_wait_for_a_free_one(store_factory):
+    database = FakeDatabase(write_seconds=0.01)
+    store = store_factory(database, max_connections=3)
+    errors = []
+
+    def write(thread_index):
+        try:
+            for row_index in range(5):
+                store.add_history(f"m-{thread_index}-{row_index}", None, "text", "ADD", user_id="u")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(database.rows) == 60
+    assert database.max_in_use <= 3
+
+
+def test_waiting_for_a_connection_times_out(store_factory):
+    database = FakeDatabase()
+    store = store_factory(database, max_connections=1, pool_timeout=0.05)
+
+    with store._cursor():
+        with pytest.raises(TimeoutError):
+            store.add_history("m", None, "text", "ADD")
+
+    store.add_history("m", None, "text", "ADD")
+    assert len(database.rows) == 1
+
+
+def test_writes_do_not_serialise_on_a_global_lock(store_factory):
+    database = FakeDatabase()
+    store = store_factory(database)
+    database.statements.clear()
+
+    store.add_history("m", None, "text", "ADD")
+
+    assert not any("advisory" in statement for statement in database.statements)
+    assert len(database.rows[0]) == 11
+
+
+def test_query_history_withholds_uncommitted_transactions_and_rejects_timestamp_cursors(store_factory):
+    database = FakeDatabase()
+    store = store_factory(database)
+
+    store.query_history(filters={"user_id": "u"})
+    assert "txid_snapshot_xmin(txid_current_snapshot())" in database.statements[-1]
+
+    with pytest.raises(ValueError):
+        store.query_history(cursor=store.encode_cursor("2026-01-01T00:00:00.000000+00:00", "row"))
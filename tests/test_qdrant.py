@@ -0,0 +1,56 @@
+import pytest
+from qdrant_client import QdrantClient
+
+from mem0.vector_stores.qdrant import DENSE_VECTOR, SPARSE_VECTOR, Qdrant
+
+
+@pytest.fixture(params=[False, True], ids=["dense", "sparse"])
+def store(request):
+    store = Qdrant("memories", 3, client=QdrantClient(":memory:"), sparse=request.param)
+    store.insert(
+        [[float(index), 0.0, 1.0] for index in range(5)],
+        [{"data": f"memory {index}", "user_id": "alice" if index < 3 else "bob"} for index in range(5)],
+        ids=list(range(5)),
+    )
+    return store
+
+
+def _point(store, point_id):
+    [point] = store.client.retrieve("memories", [point_id], with_payload=True, with_vectors=True)
+    if store.sparse_encoder is None:
+        return point.payload, point.vector, None
+    return point.payload, point.vector[DENSE_VECTOR], point.vector[SPARSE_VECTOR]
+
+
+def test_get_many_skips_missing_ids(store):
+    assert sorted(point.id for point in store.get_many([0, 4, 99])) == [0, 4]
+    assert store.get_many([]) == []
+
+
+def test_update_many_without_vectors_keeps_the_stored_vectors(store):
+    _, dense_before, sparse_before = _point(store, 1)
+
+    store.update_many([1], payloads=[{"data": "rewritten text", "user_id": "alice"}])
+
+    payload, dense, sparse = _point(store, 1)
+    assert payload == {"data": "rewritten text", "user_id": "alice"}
+    assert dense == dense_before
+    if sparse_before is not None:
+        assert sparse != sparse_before
+
+
+def test_update_many_without_payloads_keeps_the_stored_payloads(store):
+    store.update_many([2], vectors=[[0.0, 1.0, 0.0]])
+
+    payload, dense, _ = _point(store, 2)
+    assert payload["data"] == "memory 2"
+    assert dense == pytest.approx([0.0, 1.0, 0.0])
+
+
+def test_scroll_and_delete_by_filter(store):
+    pages = list(store.scroll(filters={"user_id": "alice"}, batch_size=2))
+    assert [len(page) for page in pages] == [2, 1]
+
+    store.delete_many([0])
+    assert store.delete_by_filter({"user_id": "alice"}) == 2
+    assert sorted(point.id for page in store.scroll() for point in page) == [3, 4]
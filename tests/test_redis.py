@@ -0,0 +1,216 @@
+import importlib
+import re
+import sys
+import types
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+
+class FakeRedis:
+    """Hash storage with the pipelined HMGET that RedisDB.get_many uses."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def hmget(self, key, fields):
+        self.commands.append((key, fields))
+
+    def execute(self):
+        results = []
+        for key, fields in self.commands:
+            stored = self.client.hashes.get(key, {})
+            results.append([_encode(stored[field]) if field in stored else None for field in fields])
+        return results
+
+
+def _encode(value):
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeQuery:
+    def __init__(self, query_string):
+        self.query_string = query_string
+        self.offset, self.num = 0, 10
+        self.content = True
+        self.sort_field = None
+
+    def sort_by(self, field, asc=True):
+        self.sort_field = (field, asc)
+        return self
+
+    def paging(self, offset, num):
+        self.offset, self.num = offset, num
+        return self
+
+    def no_content(self):
+        self.content = False
+        return self
+
+
+class FakeTagExpression:
+    def __init__(self, conditions):
+        self.conditions = conditions
+
+    def __and__(self, other):
+        return FakeTagExpression(self.conditions + other.conditions)
+
+    def __str__(self):
+        return " ".join(f"@{key}:{{{value}}}" for key, value in self.conditions)
+
+
+class FakeTag:
+    def __init__(self, field):
+        self.field = field
+
+    def __eq__(self, value):
+        return FakeTagExpression([(self.field, value)])
+
+
+class FakeDocument:
+    def __init__(self, key, fields):
+        self.id = key
+        self.__dict__.update(fields)
+
+    def __getitem__(self, field):
+        return self.__dict__[field]
+
+
+class FakeSearchIndex:
+    """Stand-in for redisvl's SearchIndex over hash storage: load() writes fields in place like HSET."""
+
+    def __init__(self, schema):
+        self.prefix = schema["index"]["prefix"]
+        self.client = None
+
+    @classmethod
+    def from_dict(cls, schema):
+        return cls(schema)
+
+    def set_client(self, client):
+        self.client = client
+
+    def create(self, overwrite=False):
+        pass
+
+    def load(self, data, keys=None, id_field=None):
+        keys = keys or [f"{self.prefix}:{entry[id_field]}" for entry in data]
+        for key, entry in zip(keys, data):
+            self.client.hashes.setdefault(key, {}).update(entry)
+
+    def drop_keys(self, keys):
+        for key in keys if isinstance(keys, list) else [keys]:
+            self.client.hashes.pop(key, None)
+
+    def search(self, query):
+        conditions = re.findall(r"@(\w+):\{([^}]*)\}", query.query_string)
+        matches = [
+            (key, fields)
+            for key, fields in self.client.hashes.items()
+            if all(str(fields.get(field)) == value for field, value in conditions)
+        ]
+        if query.sort_field:
+            field, asc = query.sort_field
+            matches.sort(key=lambda match: match[1][field], reverse=not asc)
+        page = matches[query.offset : query.offset + query.num]
+        return types.SimpleNamespace(
+            docs=[FakeDocument(key, fields if query.content else {}) for key, fields in page]
+        )
+
+
+@pytest.fixture
+def store(monkeypatch):
+    client = FakeRedis()
+    modules = {
+        "redis": types.ModuleType("redis"),
+        "redis.commands": types.ModuleType("redis.commands"),
+        "redis.commands.search": types.ModuleType("redis.commands.search"),
+        "redis.commands.search.query": types.ModuleType("redis.commands.search.query"),
+        "redisvl": types.ModuleType("redisvl"),
+        "redisvl.index": types.ModuleType("redisvl.index"),
+        "redisvl.query": types.ModuleType("redisvl.query"),
+        "redisvl.query.filter": types.ModuleType("redisvl.query.filter"),
+    }
+    modules["redis"].Redis = types.SimpleNamespace(from_url=lambda url: client)
+    modules["redis.commands.search.query"].Query = FakeQuery
+    modules["redisvl.index"].SearchIndex = FakeSearchIndex
+    modules["redisvl.query"].VectorQuery = object
+    modules["redisvl.query.filter"].Tag = FakeTag
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, "mem0.vector_stores.redis", raising=False)
+    redis_store = importlib.import_module("mem0.vector_stores.redis")
+
+    store = redis_store.RedisDB("redis://stand-in", "memories", 3)
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for index in range(5):
+        store.insert(
+            vectors=[[float(index), 0.0, 1.0]],
+            payloads=[
+                {
+                    "hash": f"hash-{index}",
+                    "data": f"memory {index}",
+                    "created_at": created_at.replace(minute=index).isoformat(),
+                    "user_id": "alice" if index < 3 else "bob",
+                }
+            ],
+            ids=[f"id-{index}"],
+        )
+    return store
+
+
+def _payload(data, user_id="alice"):
+    timestamp = datetime(2026, 2, 1, tzinfo=timezone.utc).isoformat()
+    return {"hash": "new-hash", "data": data, "created_at": timestamp, "updated_at": timestamp, "user_id": user_id}
+
+
+def test_get_many_skips_missing_ids(store):
+    results = store.get_many(["id-0", "missing", "id-3"])
+
+    assert [result.id for result in results] == ["id-0", "id-3"]
+    assert results[0].payload["data"] == "memory 0"
+    assert results[1].payload["user_id"] == "bob"
+    assert store.get_many([]) == []
+
+
+def test_update_many_without_vectors_keeps_the_stored_embeddings(store):
+    store.update_many(["id-0", "id-1"], payloads=[_payload("new 0"), _payload("new 1")])
+
+    stored = store.client.hashes["mem0:memories:id-0"]
+    assert stored["memory"] == "new 0"
+    assert stored["embedding"] == np.array([0.0, 0.0, 1.0], dtype=np.float32).tobytes()
+
+
+def test_update_many_without_payloads_keeps_the_stored_fields(store):
+    store.update_many(["id-2"], vectors=[[9.0, 9.0, 9.0]])
+
+    stored = store.client.hashes["mem0:memories:id-2"]
+    assert stored["embedding"] == np.array([9.0, 9.0, 9.0], dtype=np.float32).tobytes()
+    assert stored["memory"] == "memory 2"
+
+
+def test_scroll_pages_through_the_filtered_scope(store):
+    pages = list(store.scroll(filters={"user_id": "alice"}, batch_size=2))
+
+    assert [len(page) for page in pages] == [2, 1]
+    assert sorted(memory.id for page in pages for memory in page) == ["id-0", "id-1", "id-2"]
+
+
+def test_delete_many_and_delete_by_filter(store):
+    store.delete_many(["id-0"])
+    assert "mem0:memories:id-0" not in store.client.hashes
+
+    assert store.delete_by_filter({"user_id": "alice"}, batch_size=1) == 2
+    assert sorted(store.client.hashes) == ["mem0:memories:id-3", "mem0:memories:id-4"]
+    with pytest.raises(ValueError):
+        store.delete_by_filter({})